@@ -1,4 +1,5 @@
 import worksheetGenerator from '../services/worksheetGenerator.js';
+import { loadContent } from '../utils/contentStore.js';
 import { chromium } from 'playwright';
 
 /**
@@ -17,6 +18,11 @@ export const generateWorksheet = async (req, res) => {
       });
     }
     
+    // Search results reference their content instead of carrying it
+    if (!resource.contentText && resource.contentId) {
+      resource.contentText = await loadContent(resource.contentId) || '';
+    }
+    
     // Check for content text
     if (!resource.contentText) {
       console.log('Warning: No contentText provided for worksheet generation');
@@ -91,6 +97,11 @@ export const generateAnswerKey = async (req, res) => {
       });
     }
     
+    // Search results reference their content instead of carrying it
+    if (!resource.contentText && resource.contentId) {
+      resource.contentText = await loadContent(resource.contentId) || '';
+    }
+    
     // Generate worksheet content (which includes answer key data)
     const worksheetContent = worksheetGenerator.generateWorksheetContent(
       resource,
@@ -3,9 +3,16 @@ import { spawn } from "child_process";
 import path from "path";
 import { v4 as uuidv4 } from "uuid";
 import fs from "fs";
+import { isContentId, loadContent } from "../utils/contentStore.js";
 
 const router = express.Router();
 
+// Time limit for one search; the scraper returns partial results when it runs out
+const SEARCH_DEADLINE_SECONDS = Number(process.env.SEARCH_DEADLINE_SECONDS || 20);
+
+// Extra time before a scraper that ignores its deadline is killed (covers browser startup)
+const SEARCH_KILL_GRACE_SECONDS = 30;
+
 router.post("/curriculum-search", async (req, res) => {
   try {
     const { profileId, keywords } = req.body;
@@ -19,10 +26,18 @@ router.post("/curriculum-search", async (req, res) => {
     // Spawn the Python script process
     const pythonProcess = spawn("python", [
       path.join(process.cwd(), "backend/scraper/main.py"),
+      "--deadline",
+      `${SEARCH_DEADLINE_SECONDS}s`,
       searchId,
       ...keywords
     ]);
     
+    // Backstop in case the scraper hangs past its own deadline
+    const killTimer = setTimeout(() => {
+      console.error(`Scraper for search ${searchId} exceeded its deadline, stopping it`);
+      pythonProcess.kill();
+    }, (SEARCH_DEADLINE_SECONDS + SEARCH_KILL_GRACE_SECONDS) * 1000);
+    
     let dataString = "";
     
     // Collect data from script's standard output
@@ -37,6 +52,7 @@ router.post("/curriculum-search", async (req, res) => {
     
     // Process completed
     pythonProcess.on("close", (code) => {
+      clearTimeout(killTimer);
       try {
         if (code !== 0) {
           return res.status(500).json({ error: "Scraper process failed" });
@@ -53,13 +69,15 @@ router.post("/curriculum-search", async (req, res) => {
         // Read and parse the result file
         const resultData = JSON.parse(fs.readFileSync(resultPath, "utf8"));
         
-        // Extract resources from the result - now they're already in the correct format
+        // Extract resources from the result - now they're already in the correct format.
+        // Their content is not included; it is loaded on demand by contentId.
         const resources = resultData.results || [];
         
         // Return the resources
         res.json({
           success: true,
           resources: resources,
+          partial: resultData.partial || false,
           searchId,
           profileId
         });
@@ -74,6 +92,113 @@ router.post("/curriculum-search", async (req, res) => {
   }
 });
 
+// Streaming search: forwards the scraper's NDJSON events as server-sent events, so results
+// show up as they are found instead of after the slowest extraction.
+// Keywords are passed as repeated query parameters: ?keywords=a&keywords=b
+router.get("/curriculum-search/stream", (req, res) => {
+  const { profileId } = req.query;
+  const keywords = [].concat(req.query.keywords || []).filter(Boolean);
+  
+  if (keywords.length === 0) {
+    return res.status(400).json({ error: "Keywords are required" });
+  }
+  
+  const searchId = uuidv4();
+  
+  res.writeHead(200, {
+    "Content-Type": "text/event-stream",
+    "Cache-Control": "no-cache",
+    Connection: "keep-alive"
+  });
+  
+  const sendEvent = (event, data) => {
+    res.write(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`);
+  };
+  
+  sendEvent("search", { searchId, profileId });
+  
+  // Spawn the Python script process in streaming mode; its stdout carries only events
+  const pythonProcess = spawn("python", [
+    path.join(process.cwd(), "backend/scraper/main.py"),
+    "--stream",
+    "--deadline",
+    `${SEARCH_DEADLINE_SECONDS}s`,
+    searchId,
+    ...keywords
+  ]);
+  
+  // Backstop in case the scraper hangs past its own deadline
+  const killTimer = setTimeout(() => {
+    console.error(`Scraper for search ${searchId} exceeded its deadline, stopping it`);
+    pythonProcess.kill();
+  }, (SEARCH_DEADLINE_SECONDS + SEARCH_KILL_GRACE_SECONDS) * 1000);
+  
+  let buffered = "";
+  let finished = false;
+  
+  // Forward each complete line as one event
+  pythonProcess.stdout.on("data", (data) => {
+    buffered += data.toString();
+    const lines = buffered.split("\n");
+    buffered = lines.pop();
+    
+    for (const line of lines) {
+      if (!line.trim()) {
+        continue;
+      }
+      try {
+        const { event, ...fields } = JSON.parse(line);
+        if (event === "done" || event === "error") {
+          finished = true;
+        }
+        sendEvent(event, fields);
+      } catch (error) {
+        console.error("Invalid scraper event:", line);
+      }
+    }
+  });
+  
+  pythonProcess.stderr.on("data", (data) => {
+    console.error(`Python Script Error: ${data}`);
+  });
+  
+  pythonProcess.on("close", (code) => {
+    clearTimeout(killTimer);
+    if (!finished) {
+      sendEvent("error", { message: code === 0 ? "Scraper ended without a result" : "Scraper process failed" });
+    }
+    res.end();
+  });
+  
+  // Stop the scrape if the client goes away
+  req.on("close", () => {
+    if (pythonProcess.exitCode === null) {
+      pythonProcess.kill();
+    }
+  });
+});
+
+// Content text of a search result, stored separately from the results
+router.get("/curriculum-search/content/:contentId", async (req, res) => {
+  try {
+    const { contentId } = req.params;
+    
+    if (!isContentId(contentId)) {
+      return res.status(400).json({ error: "Invalid content id" });
+    }
+    
+    const contentText = await loadContent(contentId);
+    if (contentText === null) {
+      return res.status(404).json({ error: "Content not found" });
+    }
+    
+    res.json({ contentId, contentText });
+  } catch (error) {
+    console.error("Content API error:", error);
+    res.status(500).json({ error: "Internal server error" });
+  }
+});
+
 // Helper function to estimate time based on resource type
 function getEstimatedTime(type) {
   switch (type?.toLowerCase()) {
@@ -0,0 +1,94 @@
+"""
+HomeScraperEdu Batch Scoring
+----------------------------
+Vectorized version of the relevance scoring in main.score_result, for large candidate pools.
+
+Every scoring rule is a weighted count of matches, so the matches of all candidates are put
+into sparse result x term matrices (one for any match, one for title matches) and the rules
+become weight vectors: +3/+2 per specific topic keyword, +1 per keyword, and per interest
+category +2/+1 per terminology match and +1 per related keyword, applied only to the rows
+whose category gate is open. The scores are exactly those of score_result.
+"""
+
+import numpy as np
+from scipy import sparse
+
+
+def _columns(terms):
+    return {term: index for index, term in enumerate(dict.fromkeys(terms))}
+
+
+def _match_matrices(hits, title_lengths, columns):
+    """Build the (match, title match) sparse matrices for one side of the matches."""
+    counts = np.fromiter((len(row_hits) for row_hits in hits), dtype=np.int64, count=len(hits))
+    total = int(counts.sum())
+    rows = np.repeat(np.arange(len(hits)), counts)
+    cols = np.fromiter((columns.get(term, -1) for row_hits in hits for term in row_hits), dtype=np.int64, count=total)
+    ends = np.fromiter((end for row_hits in hits for end in row_hits.values()), dtype=np.int64, count=total)
+
+    # Matches outside the scored vocabulary have no column
+    known = cols >= 0
+    rows, cols, ends = rows[known], cols[known], ends[known]
+    in_title = ends <= title_lengths[rows]
+
+    shape = (len(hits), len(columns))
+    hit = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=shape)
+    title = sparse.csr_matrix((np.ones(int(in_title.sum()), dtype=np.int64), (rows[in_title], cols[in_title])), shape=shape)
+    return hit, title
+
+
+def score_matches(matches, subjects, profile, categories, instruments, lesson_terms):
+    """
+    Score candidates from their matches, as returned by main.match_result.
+    `subjects` holds each candidate's lowercased subject. Returns an int64 array of scores.
+    """
+    keyword_columns = _columns(profile['keywords'])
+    term_columns = _columns(
+        [term for category in categories for term in category['text_terms'] + category['terms']]
+        + list(instruments) + list(lesson_terms)
+    )
+    title_lengths = np.fromiter((title_length for _, _, title_length in matches), dtype=np.int64, count=len(matches))
+    keyword_hit, keyword_title = _match_matrices([match[1] for match in matches], title_lengths, keyword_columns)
+    term_hit, term_title = _match_matrices([match[0] for match in matches], title_lengths, term_columns)
+
+    # Keyword rules, independent of the categories
+    keyword_weights = np.zeros(len(keyword_columns), dtype=np.int64)
+    keyword_title_weights = np.zeros(len(keyword_columns), dtype=np.int64)
+    for keyword in profile['specific_topic_keywords']:
+        keyword_weights[keyword_columns[keyword]] += 3
+        keyword_title_weights[keyword_columns[keyword]] += 2
+    for keyword in profile['keywords']:
+        keyword_weights[keyword_columns[keyword]] += 1
+
+    scores = keyword_hit @ keyword_weights + keyword_title @ keyword_title_weights
+
+    # Category rules: one weight column per category
+    term_weights = np.zeros((len(term_columns), len(categories)), dtype=np.int64)
+    term_title_weights = np.zeros((len(term_columns), len(categories)), dtype=np.int64)
+    gate_weights = np.zeros((len(term_columns), len(categories)), dtype=np.int64)
+    related_weights = np.zeros((len(keyword_columns), len(categories)), dtype=np.int64)
+    for index, category in enumerate(categories):
+        for term, count in category['term_counts'].items():
+            term_weights[term_columns[term], index] = 2 * count
+            term_title_weights[term_columns[term], index] = count
+        for term in category['text_terms']:
+            gate_weights[term_columns[term], index] = 1
+        for keyword in profile['related_keywords'][category['name']]:
+            related_weights[keyword_columns[keyword], index] += 1
+
+    category_scores = term_hit @ term_weights + term_title @ term_title_weights + keyword_hit @ related_weights
+
+    # Instrument tutorials and lessons score within the music category
+    instrument_weights = np.zeros(len(term_columns), dtype=np.int64)
+    instrument_weights[[term_columns[term] for term in instruments]] = 1
+    lesson_weights = np.zeros(len(term_columns), dtype=np.int64)
+    lesson_weights[[term_columns[term] for term in lesson_terms]] = 1
+    names = np.array([category['name'] for category in categories], dtype=object)
+    music = np.flatnonzero(names == 'music')
+    if music.size:
+        category_scores[:, music[0]] += 3 * (term_hit @ instrument_weights) * ((term_hit @ lesson_weights) > 0)
+
+    # A category counts for a result that mentions it or has it as its subject
+    gates = ((term_hit @ gate_weights) > 0) | (np.array(subjects, dtype=object)[:, None] == names[None, :])
+
+    return scores + (category_scores * gates).sum(axis=1)
@@ -0,0 +1,158 @@
+"""
+HomeScraperEdu Link Harvest Benchmark
+-------------------------------------
+Microbenchmark for EduSpider.parse on saved HTML pages: links processed per second with the
+original parse (a Selector per anchor, classified by the original if/elif chains) and with
+the current one (bulk link harvest, batch classification with the taxonomy rule tables),
+and a check that both yield the same items.
+
+Usage: python bench_link_harvest.py [--keywords math art ...] [--repeat N] [page.html ...]
+Without pages, a synthetic link-heavy category page is used. Save real pages with e.g.
+`curl -o math.html https://www.education.com/resources/math/`.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from scrapy.http import HtmlResponse, Request
+
+from edu_spider import EduSpider
+
+
+def determine_subject(url, title):
+    """EduSpider.determine_subject as it was before the rule tables in taxonomy.py."""
+    url_lower = url.lower()
+    title_lower = title.lower()
+
+    if any(term in url_lower or term in title_lower for term in ['art', 'draw', 'paint', 'craft']):
+        return 'art'
+    elif any(term in url_lower or term in title_lower for term in ['music', 'sing', 'instrument', 'song']):
+        return 'music'
+    elif any(term in url_lower or term in title_lower for term in ['read', 'book', 'literacy', 'phonics']):
+        return 'reading'
+    elif any(term in url_lower or term in title_lower for term in ['writ', 'essay', 'journal', 'grammar']):
+        return 'writing'
+    elif any(term in url_lower or term in title_lower for term in ['math', 'number', 'geometry', 'algebra']):
+        return 'math'
+    elif any(term in url_lower or term in title_lower for term in ['science', 'biology', 'chemistry', 'physics']):
+        return 'science'
+    elif any(term in url_lower or term in title_lower for term in ['history', 'geography', 'civil']):
+        return 'history'
+    elif any(term in url_lower or term in title_lower for term in ['cod', 'program', 'computer']):
+        return 'coding'
+
+    return 'educational'
+
+
+def determine_resource_type(url, title):
+    """EduSpider.determine_resource_type as it was before the rule tables in taxonomy.py."""
+    url_lower = url.lower()
+    title_lower = title.lower()
+
+    if 'video' in url_lower or 'video' in title_lower or 'youtube' in url_lower:
+        return 'video'
+    elif 'worksheet' in url_lower or 'worksheet' in title_lower or 'pdf' in url_lower:
+        return 'worksheet'
+    elif 'lesson' in url_lower or 'lesson' in title_lower or 'tutorial' in title_lower:
+        return 'lesson'
+    elif 'game' in url_lower or 'game' in title_lower or 'interactive' in url_lower:
+        return 'interactive'
+    elif 'activity' in url_lower or 'activity' in title_lower or 'project' in title_lower:
+        return 'activity'
+
+    return 'resource'
+
+
+def parse_before(spider, response):
+    """
+    EduSpider.parse as it was before the bulk link harvest and the taxonomy classifiers
+    (links only): a Selector per anchor, and the original if/elif chains per link.
+    """
+    for link in response.css('a'):
+        title = link.css('::text').get()
+        url = link.css('::attr(href)').get()
+
+        if not title or not url:
+            continue
+
+        if not url.startswith('http'):
+            url = response.urljoin(url)
+
+        if any(keyword.lower() in title.lower() for keyword in spider.keywords):
+            yield {
+                'title': title.strip(),
+                'url': url,
+                'description': f"Educational resource: {title}",
+                'subject': determine_subject(url, title),
+                'type': determine_resource_type(url, title)
+            }
+
+
+def parse_after(spider, response):
+    """The current EduSpider.parse, without the next page request."""
+    return [item for item in spider.parse(response) if isinstance(item, dict)]
+
+
+def synthetic_page(links=3000, seed=7):
+    """A category page with many links, some of them to matching resources."""
+    rng = random.Random(seed)
+    words = ['math', 'fractions', 'art', 'drawing', 'reading', 'phonics', 'science', 'planets',
+             'worksheet', 'lesson', 'game', 'activity', 'video', 'kids', 'grade', 'printable',
+             'about', 'contact', 'login', 'shop', 'blog', 'privacy', 'help', 'teachers']
+    anchors = []
+    for index in range(links):
+        title = ' '.join(rng.choice(words).capitalize() for _ in range(rng.randint(1, 6)))
+        href = f"/resources/{'-'.join(title.lower().split())}-{index}/"
+        if rng.random() < 0.2:
+            anchors.append(f'<a href="{href}"><span class="icon"></span>{title}</a>')
+        else:
+            anchors.append(f'<a class="card" href="{href}">{title}</a>')
+    body = '\n'.join(f'<li>{anchor}</li>' for anchor in anchors)
+    return f'<html><head><title>Resources</title></head><body><ul>{body}</ul></body></html>'.encode('utf-8')
+
+
+def load_pages(paths):
+    if not paths:
+        return [('synthetic', 'https://www.education.com/resources/', synthetic_page())]
+    return [(path, 'https://www.education.com/resources/', open(path, 'rb').read()) for path in paths]
+
+
+def bench(parse, spider, response, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        items = list(parse(spider, response))
+    return (time.perf_counter() - start) / repeat, items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark EduSpider link harvesting")
+    parser.add_argument('pages', nargs='*', help="Saved HTML pages")
+    parser.add_argument('--keywords', nargs='+', default=['math', 'art', 'reading', 'science'])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    spider = EduSpider(keywords=args.keywords)
+
+    for name, url, body in load_pages(args.pages):
+        response = HtmlResponse(url=url, body=body, encoding='utf-8', request=Request(url))
+        # Parse the page once up front, which both versions share
+        response.selector
+        links = len(response.selector.root.xpath('//a'))
+
+        before, before_items = bench(parse_before, spider, response, args.repeat)
+        after, after_items = bench(parse_after, spider, response, args.repeat)
+
+        print(f"{name}: {links} links, {len(after_items)} items")
+        print(f"  before: {links / before:12,.0f} links/s ({before * 1000:.2f} ms/page)")
+        print(f"  after:  {links / after:12,.0f} links/s ({after * 1000:.2f} ms/page), {before / after:.1f}x")
+        if before_items != after_items:
+            print("  MISMATCH: the two versions yield different items")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+HomeScraperEdu Startup Benchmark
+--------------------------------
+Cold-start budget for the per-search scraper process, to catch changes that bring heavy
+imports back into startup:
+
+- `python -X importtime -c "import main"`: the cumulative import time of main.py, the
+  slowest modules it pulls in, and a check that Scrapy, Twisted, Playwright, NumPy/SciPy,
+  requests and BeautifulSoup are not among them (they are imported on first use).
+- Wall-clock time from spawning `main.py <search_id> ... --inline` to its first status
+  write, and to its exit, for a search answered from a pre-filled search cache entry whose
+  result content is already stored, so nothing is fetched or extracted.
+- Wall-clock time of a run without a search id, which prints the usage and exits.
+
+Every run happens in a temporary data directory. Exits with status 1 when a measurement is
+over its budget or a heavy module is imported at startup.
+
+Usage: python bench_startup.py [--repeat N] [--import-budget MS] [--status-budget MS] [--exit-budget MS]
+"""
+
+import os
+import re
+import sys
+import time
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+SCRAPER_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN_PATH = os.path.join(SCRAPER_DIR, 'main.py')
+
+# Modules that must not be imported just by starting main.py
+HEAVY_MODULES = ['scrapy', 'twisted', 'playwright', 'numpy', 'scipy', 'requests', 'bs4']
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+BENCH_KEYWORDS = ['3rd grade math', 'math for 3rd grade']
+BENCH_URL = 'https://www.example.com/3rd-grade-math-worksheet'
+
+
+def measure_imports(workdir):
+    """Cumulative import time of main (ms), the slowest top-level imports and the heavy modules loaded."""
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import sys; sys.path.insert(0, {SCRAPER_DIR!r}); import main'],
+        cwd=workdir, capture_output=True, text=True, check=True
+    ).stderr
+
+    # Modules are listed after the modules they import, which are indented one level deeper
+    children = []
+    direct = []
+    total = 0
+    loaded = set()
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)) / 1000, len(match.group(3)), match.group(4)
+        loaded.add(name.split('.')[0])
+        if depth == 3:
+            children.append((cumulative, name))
+        elif depth == 1:
+            if name == 'main':
+                total, direct = cumulative, sorted(children, reverse=True)
+            children = []
+
+    heavy = sorted(loaded & set(HEAVY_MODULES))
+    return total, direct, heavy
+
+
+def seed_search_cache(workdir):
+    """
+    Store a fresh search cache entry for BENCH_KEYWORDS whose result has its content in a
+    stored blob, as after a real search: the cached search serves it without extracting.
+    """
+    sys.path.insert(0, SCRAPER_DIR)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from content_store import store_content
+        from search_cache import store_cached_search
+        content = '3rd grade math worksheet: addition and subtraction within 1000. ' * 40
+        store_cached_search(BENCH_KEYWORDS, [{
+            'title': '3rd Grade Math Worksheet',
+            'url': BENCH_URL,
+            'description': 'Educational resource: 3rd grade math',
+            'subject': 'math',
+            'type': 'worksheet',
+            'contentId': store_content(BENCH_URL, content),
+            'contentLength': len(content)
+        }])
+    finally:
+        os.chdir(cwd)
+
+
+def measure_cached_search(workdir, search_id):
+    """Milliseconds from spawning a cached search to its first status write, and to its exit."""
+    status_file = os.path.join(workdir, 'data', 'searches', f'{search_id}.json')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, MAIN_PATH, search_id, *BENCH_KEYWORDS, '--inline'],
+                               cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    first_status = None
+    while process.poll() is None:
+        if first_status is None and os.path.exists(status_file):
+            first_status = time.perf_counter() - start
+        time.sleep(0.001)
+    exited = time.perf_counter() - start
+
+    if first_status is None and os.path.exists(status_file):
+        first_status = exited
+    with open(status_file, 'r', encoding='utf-8') as f:
+        status = json.load(f)
+    if process.returncode != 0 or status.get('status') != 'success' or not status.get('cache', {}).get('hit'):
+        raise RuntimeError(f"Cached search did not succeed from the cache: {status.get('status')} {status.get('message')}")
+    if status.get('metrics', {}).get('cachedContent') != 1:
+        raise RuntimeError("Cached search extracted its result again instead of using the stored content")
+    return first_status * 1000, exited * 1000
+
+
+def measure_usage_exit(workdir):
+    """Milliseconds for a run without a search id, which prints the usage and exits."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, MAIN_PATH], cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def check(name, value, budget):
+    over = value > budget
+    print(f"  {name:<28} {value:8.1f} ms   (budget {budget:.0f} ms){'   OVER BUDGET' if over else ''}")
+    return not over
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper's cold start")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement (the median is reported)")
+    parser.add_argument('--import-budget', type=float, default=300, help="Budget for importing main, in ms")
+    parser.add_argument('--status-budget', type=float, default=600, help="Budget for the first status write, in ms")
+    parser.add_argument('--exit-budget', type=float, default=1000, help="Budget for a cached search to exit, in ms")
+    parser.add_argument('--top', type=int, default=8, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        seed_search_cache(workdir)
+
+        runs = [measure_imports(workdir) for _ in range(args.repeat)]
+        import_time = statistics.median(total for total, _, _ in runs)
+        direct, heavy = runs[-1][1], runs[-1][2]
+
+        cached = [measure_cached_search(workdir, f'bench-startup-{index}') for index in range(args.repeat)]
+        first_status = statistics.median(first for first, _ in cached)
+        exited = statistics.median(total for _, total in cached)
+
+        usage_exit = statistics.median(measure_usage_exit(workdir) for _ in range(args.repeat))
+
+    print(f"Startup ({args.repeat} runs, median):")
+    ok = check('import main', import_time, args.import_budget)
+    ok &= check('first status write (cached)', first_status, args.status_budget)
+    ok &= check('exit (cached search)', exited, args.exit_budget)
+    print(f"  {'usage exit':<28} {usage_exit:8.1f} ms")
+
+    print("Slowest imports of main:")
+    for cumulative, name in direct[:args.top]:
+        print(f"  {name:<28} {cumulative:8.1f} ms")
+
+    if heavy:
+        print(f"Heavy modules imported at startup: {', '.join(heavy)}")
+        ok = False
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
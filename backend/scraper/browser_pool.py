@@ -0,0 +1,181 @@
+"""
+HomeScraperEdu Browser Pool
+---------------------------
+Owns the Chromium instance(s) used by the Playwright scrapers and extractors, so a search
+launches one browser instead of one per scraper and per resource URL.
+
+Callers lease a page with `async with get_browser_pool().page() as page:`. Every lease gets
+its own browser context, which keeps cookies and storage isolated between concurrent users.
+Contexts are reused between leases and recycled after a number of navigations, or when the
+browser processes use more memory than allowed. A lease can name a request policy
+(see request_policy.py) to drop subresources the caller does not need.
+"""
+
+import os
+import asyncio
+import contextlib
+
+from request_policy import RequestFilter
+
+try:
+    import psutil
+except ImportError:  # Memory based recycling is skipped without psutil
+    psutil = None
+
+# User agent for all browser contexts (headless Chromium's default one is often blocked)
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
+
+
+class LeaseTimeout(Exception):
+    """Raised when no browser page became available within the lease timeout."""
+
+
+class _PooledContext:
+    """A browser context plus the bookkeeping needed to decide when to recycle it."""
+
+    def __init__(self, context):
+        self.context = context
+        self.navigations = 0
+
+
+class BrowserPool:
+    """Shared Chromium browsers handing out isolated contexts and pages."""
+
+    def __init__(self, browsers=None, max_contexts=None, max_navigations=None,
+                 memory_limit_mb=None, lease_timeout=None, max_lease_seconds=None):
+        self.browser_count = browsers or int(os.environ.get('SCRAPER_BROWSERS', '1'))
+        self.max_contexts = max_contexts or int(os.environ.get('SCRAPER_MAX_CONTEXTS', '6'))
+        self.max_navigations = max_navigations or int(os.environ.get('SCRAPER_CONTEXT_NAVIGATIONS', '25'))
+        self.memory_limit_mb = memory_limit_mb or int(os.environ.get('SCRAPER_BROWSER_MEMORY_MB', '1500'))
+        self.lease_timeout = lease_timeout or float(os.environ.get('SCRAPER_LEASE_TIMEOUT', '30'))
+        self.max_lease_seconds = max_lease_seconds or float(os.environ.get('SCRAPER_MAX_LEASE_SECONDS', '90'))
+
+        self._playwright = None
+        self._browsers = []
+        self._next_browser = 0
+        self._idle = []
+        self._start_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.max_contexts)
+        self.launches = 0
+
+    async def _ensure_started(self):
+        """Launch the browsers on first use."""
+        async with self._start_lock:
+            if self._playwright is None:
+                # Imported here so processes that never open a page don't pay for it
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+
+            # Replace browsers that crashed or were closed
+            self._browsers = [browser for browser in self._browsers if browser.is_connected()]
+            while len(self._browsers) < self.browser_count:
+                self._browsers.append(await self._playwright.chromium.launch())
+                self.launches += 1
+
+    async def _checkout(self):
+        """Take an idle context or create a new one on the next browser."""
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.context.browser and pooled.context.browser.is_connected():
+                return pooled
+
+        await self._ensure_started()
+        browser = self._browsers[self._next_browser % len(self._browsers)]
+        self._next_browser += 1
+        context = await browser.new_context(user_agent=USER_AGENT)
+        return _PooledContext(context)
+
+    async def _checkin(self, pooled):
+        """Return a context to the pool, or close it if it is due for recycling."""
+        if pooled.navigations >= self.max_navigations or self._memory_exceeded():
+            with contextlib.suppress(Exception):
+                await pooled.context.close()
+            return
+        self._idle.append(pooled)
+
+    def _memory_exceeded(self):
+        """Check the resident memory of the browser processes against the limit."""
+        if psutil is None or not self.memory_limit_mb:
+            return False
+
+        try:
+            children = psutil.Process().children(recursive=True)
+            rss = sum(child.memory_info().rss for child in children)
+        except psutil.Error:
+            return False
+
+        return rss > self.memory_limit_mb * 1024 * 1024
+
+    @contextlib.asynccontextmanager
+    async def page(self, policy=None):
+        """
+        Lease a page in its own context. The page is closed when the lease ends.
+        If a request policy name is given, requests it does not allow are aborted.
+        """
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.lease_timeout)
+        except asyncio.TimeoutError:
+            raise LeaseTimeout(f"No browser page available after {self.lease_timeout}s")
+
+        try:
+            pooled = await self._checkout()
+            page = await pooled.context.new_page()
+
+            def count_navigation(frame):
+                if frame == page.main_frame:
+                    pooled.navigations += 1
+
+            page.on('framenavigated', count_navigation)
+
+            if policy:
+                await page.route('**/*', RequestFilter(policy, page).handle)
+
+            # Leases are bounded: a holder that hangs gets its page closed under it
+            expiry = asyncio.get_running_loop().call_later(
+                self.max_lease_seconds, lambda: asyncio.ensure_future(page.close())
+            )
+
+            try:
+                yield page
+            finally:
+                expiry.cancel()
+                with contextlib.suppress(Exception):
+                    await page.close()
+                await self._checkin(pooled)
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        """Close all contexts and browsers."""
+        for pooled in self._idle:
+            with contextlib.suppress(Exception):
+                await pooled.context.close()
+        self._idle = []
+
+        for browser in self._browsers:
+            with contextlib.suppress(Exception):
+                await browser.close()
+        self._browsers = []
+
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+
+_pool = None
+
+
+def get_browser_pool():
+    """Return the process-wide browser pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+async def close_browser_pool():
+    """Shut down the process-wide browser pool if it was started."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
@@ -0,0 +1,69 @@
+"""
+HomeScraperEdu Content Store
+----------------------------
+Extracted page content, kept out of the search status file. Each resource's content is
+stored once as a gzip-compressed text blob keyed by a hash of its URL, and the results in
+the status file only carry the blob's id and length. The Node side loads a blob when it is
+actually needed (e.g. to generate a worksheet) instead of parsing every resource's text
+just to list the results.
+"""
+
+import os
+import gzip
+import hashlib
+
+CONTENT_DIR = os.path.join('data', 'content')
+
+
+def content_id(url):
+    """Stable blob id for a resource URL."""
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _blob_path(blob_id):
+    return os.path.join(CONTENT_DIR, f'{blob_id}.txt.gz')
+
+
+def store_content(url, text):
+    """Store the content of a URL and return its blob id."""
+    os.makedirs(CONTENT_DIR, exist_ok=True)
+    blob_id = content_id(url)
+    path = _blob_path(blob_id)
+
+    # Write to a temporary file first so readers never see a partial blob
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+        f.write(text)
+    os.replace(temp_path, path)
+    return blob_id
+
+
+def has_content(blob_id):
+    """Whether a blob is stored for a blob id."""
+    return os.path.exists(_blob_path(blob_id))
+
+
+def load_content(blob_id):
+    """Return the stored content for a blob id, or None if there is none."""
+    try:
+        with gzip.open(_blob_path(blob_id), 'rt', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, EOFError):
+        return None
+
+
+def index_results(results):
+    """
+    Move each result's contentText into a blob, returning results that only reference it
+    with contentId and contentLength. Results without contentText keep the blob they
+    already reference (e.g. from the search cache), if any.
+    """
+    indexed = []
+    for result in results:
+        entry = {key: value for key, value in result.items() if key != 'contentText'}
+        text = result.get('contentText')
+        if text:
+            entry['contentId'] = store_content(result['url'], text)
+            entry['contentLength'] = len(text)
+        indexed.append(entry)
+    return indexed
@@ -0,0 +1,279 @@
+"""
+HomeScraperEdu Edu Spider
+-------------------------
+Scrapy spider for static educational websites. It starts from the search pages of general
+and subject-specific sites picked for the profile keywords, yields a resource for every link
+whose title matches a keyword and follows "next page" links.
+
+Kept out of main.py so that Scrapy is only imported when a search actually crawls
+(see main.crawl_static_sites).
+"""
+
+import scrapy
+
+from link_harvest import harvest_links, KeywordFilter
+from taxonomy import subject_classifier, link_type_classifier, spider_site_classifier
+
+
+class EduSpider(scrapy.Spider):
+    name = 'edu_spider'
+
+    def __init__(self, keywords=None, *args, **kwargs):
+        super(EduSpider, self).__init__(*args, **kwargs)
+        self.keywords = keywords or []
+        self.keyword_filter = KeywordFilter(self.keywords)
+
+        # Dynamically generate allowed domains based on interests
+        self.allowed_domains = []
+        self.start_urls = []
+
+        # General educational domains that might have content for most subjects
+        general_domains = [
+            'education.com',
+            'pbskids.org',
+            'scholastic.com',
+            'brainpop.com',
+            'edutopia.org',
+            'teacherspayteachers.com',
+            'commoncore.org',
+            'readwritethink.org',
+            'outschool.com'
+        ]
+
+        self.allowed_domains.extend(general_domains)
+
+        # Add domain-specific educational sites based on keywords
+        for keyword in self.keywords:
+            interests = spider_site_classifier.labels(keyword)
+
+            # Art-related sites
+            if 'art' in interests:
+                art_domains = [
+                    'artforkidshub.com', 
+                    'deepspacesparkle.com',
+                    'kinderart.com', 
+                    'artfulparent.com', 
+                    'artsonia.com',
+                    'theartofed.com',
+                    'incredibleart.org',
+                    'theartofeducation.edu',
+                    'cassieStephens.com'
+                ]
+                self.allowed_domains.extend(art_domains)
+
+                # Create search URLs for art sites
+                self.start_urls.extend([
+                    f'https://www.artforkidshub.com/?s={keyword}',
+                    f'https://www.deepspacesparkle.com/?s={keyword}',
+                    f'https://kinderart.com/search-results/?q={keyword}',
+                    f'https://artfulparent.com/?s={keyword}'
+                ])
+
+            # Music-related sites
+            if 'music' in interests:
+                music_domains = [
+                    'musicplayhomeschool.com',
+                    'mmb.org',
+                    'musiceducationworks.org',
+                    'nafme.org',
+                    'makingmusicfun.net',
+                    'teachingchildrenmusic.com',
+                    'musicteachersgames.com',
+                    'classicsforkids.com',
+                    'musictechteacher.com'
+                ]
+                self.allowed_domains.extend(music_domains)
+
+                # Create search URLs for music sites
+                self.start_urls.extend([
+                    f'https://makingmusicfun.net/htm/mmf_music_library/index.php?q={keyword}',
+                    f'https://www.classicsforkids.com/search?query={keyword}',
+                    f'https://teachingchildrenmusic.com/?s={keyword}'
+                ])
+
+            # Reading-related sites
+            if 'reading' in interests:
+                reading_domains = [
+                    'readinga-z.com',
+                    'readworks.org',
+                    'readingrockets.org',
+                    'starfall.com',
+                    'storylineonline.net',
+                    'readwritethink.org',
+                    'commonlit.org',
+                    'raz-kids.com',
+                    'literacycenter.net',
+                    'k5learning.com',
+                    'newsela.com',
+                    'scholastic.com',
+                    'readtheory.org',
+                    'kidlit.tv',
+                    'gutenberg.org'
+                ]
+                self.allowed_domains.extend(reading_domains)
+
+                # Create search URLs for reading sites
+                self.start_urls.extend([
+                    f'https://www.readingrockets.org/search/site/{keyword}',
+                    f'https://www.readwritethink.org/search?term={keyword}',
+                    f'https://www.commonlit.org/en/texts?searchQuery={keyword}',
+                    f'https://www.k5learning.com/search/node/{keyword}'
+                ])
+
+            # Writing-related sites
+            if 'writing' in interests:
+                writing_domains = [
+                    'writeshop.com',
+                    'nightzookeeper.com',
+                    'bravewriter.com',
+                    'readwritethink.org',
+                    'nanowrimo.org',
+                    'journalbuddies.com'
+                ]
+                self.allowed_domains.extend(writing_domains)
+
+                # Create search URLs for writing sites
+                self.start_urls.extend([
+                    f'https://writeshop.com/?s={keyword}',
+                    f'https://www.bravewriter.com/search?q={keyword}',
+                    f'https://www.journalbuddies.com/?s={keyword}'
+                ])
+
+            # Math-related sites
+            if 'math' in interests:
+                math_domains = [
+                    'khanacademy.org',
+                    'mathplayground.com',
+                    'prodigygame.com',
+                    'ixl.com',
+                    'coolmath.com',
+                    'mathgames.com',
+                    'illustrativemathematics.org'
+                ]
+                self.allowed_domains.extend(math_domains)
+
+                # Create search URLs for math sites
+                self.start_urls.extend([
+                    f'https://www.khanacademy.org/search?page_search_query={keyword}',
+                    f'https://www.mathplayground.com/search.html?q={keyword}',
+                    f'https://www.coolmath.com/search?q={keyword}'
+                ])
+
+            # Science-related sites
+            if 'science' in interests:
+                science_domains = [
+                    'mysteryscience.com',
+                    'sciencekids.co.nz',
+                    'kids.nationalgeographic.com',
+                    'generationgenius.com',
+                    'sciencebuddies.org',
+                    'exploratorium.edu'
+                ]
+                self.allowed_domains.extend(science_domains)
+
+                # Create search URLs for science sites
+                self.start_urls.extend([
+                    f'https://www.sciencekids.co.nz/search.html?q={keyword}',
+                    f'https://www.sciencebuddies.org/search?v=oli&s={keyword}',
+                    f'https://www.exploratorium.edu/search?keyword={keyword}'
+                ])
+
+            # History-related sites
+            if 'history' in interests:
+                history_domains = [
+                    'bighistoryproject.com',
+                    'historyforkids.net',
+                    'thecrashcourse.com',
+                    'ducksters.com',
+                    'worldhistory.org',
+                    'historyextra.com'
+                ]
+                self.allowed_domains.extend(history_domains)
+
+                # Create search URLs for history sites
+                self.start_urls.extend([
+                    f'https://www.historyforkids.net/search.html?searchword={keyword}',
+                    f'https://www.ducksters.com/search.php?q={keyword}',
+                    f'https://www.worldhistory.org/search/?q={keyword}'
+                ])
+
+            # Coding-related sites
+            if 'coding' in interests:
+                coding_domains = [
+                    'code.org',
+                    'scratch.mit.edu',
+                    'tynker.com',
+                    'codecademy.com',
+                    'codingkids.com.au',
+                    'codeforlife.education',
+                    'codemonkey.com'
+                ]
+                self.allowed_domains.extend(coding_domains)
+
+                # Create search URLs for coding sites
+                self.start_urls.extend([
+                    f'https://code.org/search?q={keyword}',
+                    f'https://scratch.mit.edu/search/projects?q={keyword}',
+                    f'https://www.tynker.com/search/?q={keyword}'
+                ])
+
+        # Remove duplicates
+        self.allowed_domains = list(set(self.allowed_domains))
+        self.start_urls = list(set(self.start_urls))
+
+        # Add general educational search URLs as fallback if no specific URLs were generated
+        if not self.start_urls:
+            self.start_urls = [
+                'https://www.education.com/resources/',
+                'https://www.pbskids.org',
+                'https://www.scholastic.com/teachers/teaching-tools/'
+            ]
+
+    def parse(self, response):
+        # Extract all links with a title and URL from the page in one pass
+        hrefs, titles = harvest_links(response.selector.root)
+
+        # Filter based on keywords, over all titles at once
+        matching = self.keyword_filter.matching(titles)
+
+        # Parse URLs to ensure they're absolute
+        links = []
+        for index in matching:
+            url = hrefs[index]
+            if not url.startswith('http'):
+                url = response.urljoin(url)
+            links.append((url, titles[index]))
+
+        # Determine subject and type based on URL and title, for all links at once
+        subjects = self.determine_subjects(links)
+        types = self.determine_resource_types(links)
+
+        for (url, title), subject, resource_type in zip(links, subjects, types):
+            yield {
+                'title': title.strip(),
+                'url': url,
+                'description': f"Educational resource: {title}",
+                'subject': subject,
+                'type': resource_type
+            }
+
+        # Follow next page links if available
+        next_page = response.css('a.next::attr(href), a.nextpostslink::attr(href), a[rel="next"]::attr(href)').get()
+        if next_page:
+            yield response.follow(next_page, self.parse)
+
+    def determine_subject(self, url, title):
+        """Determine the subject of a resource based on URL and title"""
+        return subject_classifier.classify(url, title) or 'educational'
+
+    def determine_resource_type(self, url, title):
+        """Determine the type of resource based on URL and title"""
+        return link_type_classifier.classify(url, title)
+
+    def determine_subjects(self, links):
+        """determine_subject for many (url, title) pairs at once"""
+        return [subject or 'educational' for subject in subject_classifier.classify_batch(links)]
+
+    def determine_resource_types(self, links):
+        """determine_resource_type for many (url, title) pairs at once"""
+        return link_type_classifier.classify_batch(links)
@@ -5,1033 +5,756 @@ HomeScraperEdu Web Scraper
 This script handles web scraping for educational content based on profile keywords.
 It uses Scrapy for static websites and Playwright for dynamic content, processes and filters results,
 and stores them in a structured JSON format.
+
+Usage:
+    python main.py <search_id> [keywords...]   Run one search (through a worker if one is running)
+    python main.py --worker                    Start a long-lived worker that serves search jobs
 """
 
 import sys
 import os
 import json
 import time
+import argparse
+import functools
+import subprocess
 from datetime import datetime
-import scrapy
-from scrapy.crawler import CrawlerProcess
-from playwright.async_api import async_playwright
 import asyncio
 import re
+from collections import Counter
+
+import worker
+from browser_pool import get_browser_pool, close_browser_pool
+from extraction_queue import ExtractionQueue
+from readiness import wait_until_ready
+from search_metrics import start_search_metrics, increment
+from term_matcher import TermMatcher
+from link_harvest import KeywordFilter
+from taxonomy import (subject_classifier, url_type_classifier, reading_type_classifier, interest_classifier,
+                      youtube_query_classifier)
+from static_extract import extract_static_content, extraction_paths, MIN_STATIC_CONTENT_LENGTH
+from ranking_stream import RankingStream
+from resource_dedupe import DuplicateIndex, canonical_url
+from search_cache import (get_cached_search, store_cached_search, store_cached_content, search_cache_key,
+                          claim_refresh, release_refresh, SEARCH_CACHE_MAX_STALE_SECONDS)
+from search_deadline import SearchDeadline, parse_duration, DEFAULT_DEADLINE_SECONDS
+from status_store import create_status, append_progress, finish_status
+from content_store import index_results, content_id, has_content
+from search_events import start_search_events, streaming, emit_event, ndjson_writer
+
+# Scrapy and Playwright share one asyncio event loop through Twisted's asyncio reactor
+ASYNCIO_REACTOR = 'twisted.internet.asyncioreactor.AsyncioSelectorReactor'
+
+# Basic fallback keywords for educational content
+DEFAULT_KEYWORDS = ["educational", "learning", "homeschool", "student resources"]
+
+# Number of YouTube keyword searches that run at the same time
+YOUTUBE_SEARCH_CONCURRENCY = int(os.environ.get('SCRAPER_YOUTUBE_CONCURRENCY', '4'))
+
+# Number of reading site searches that run at the same time, in total and per site
+READING_SEARCH_CONCURRENCY = int(os.environ.get('SCRAPER_READING_CONCURRENCY', '6'))
+READING_SITE_CONCURRENCY = int(os.environ.get('SCRAPER_READING_SITE_CONCURRENCY', '2'))
+
+# Stale search cache entries are refreshed on the running event loop in worker mode,
+# and by a detached process otherwise (a one-off run exits as soon as its search is done)
+REFRESH_IN_PROCESS = False
+_refresh_tasks = set()
+
+# How many "next page" links deep EduSpider follows from each start page
+CRAWL_DEPTH_LIMIT = int(os.environ.get('SCRAPER_CRAWL_DEPTH', '2'))
+
+# Also write EduSpider items to data/searches/{id}_scrapy.json, for debugging the crawl
+EXPORT_SCRAPY_FEED = os.environ.get('SCRAPER_EXPORT_FEED', '0') == '1'
+
+# Candidate pools at least this large are scored with batch_scoring
+BATCH_SCORING_MIN_RESULTS = int(os.environ.get('SCRAPER_BATCH_SCORING_MIN', '200'))
+
+# Scrapy, Playwright and NumPy/SciPy take most of the startup time, and a search served from
+# the cache needs none of them. They are imported on first use: Scrapy in crawl_static_sites
+# and install_asyncio_reactor, Playwright in browser_pool, batch_scoring in load_batch_scoring.
 
 # Ensure data directories exist
 os.makedirs('data/searches', exist_ok=True)
 
-def update_status(search_id, status, message, progress):
-    """Update the search status in the status file."""
-    status_file = os.path.join('data', 'searches', f'{search_id}.json')
+def update_status(search_id, status, message, progress, **fields):
+    """
+    Update the search status, along with any extra fields, by appending to its progress log.
+    Streaming searches also send it as a progress event.
+    """
+    emit_event('progress', status=status, message=message, progress=progress, **fields)
+    return append_progress(search_id, status, message, progress, **fields)
+
+# Playwright scraper for dynamic content (YouTube)
+def build_youtube_query(keyword):
+    """Build an educational YouTube search query for a profile keyword."""
+    interest = youtube_query_classifier.classify(keyword)
     
-    if os.path.exists(status_file):
-        with open(status_file, 'r') as f:
-            search_status = json.load(f)
-        
-        search_status['status'] = status
-        search_status['message'] = message
-        search_status['progress'] = progress
-        
-        with open(status_file, 'w') as f:
-            json.dump(search_status, f, indent=2)
+    # Create educational search term based on keyword
+    search_terms = [
+        f"{keyword} tutorial",
+        f"{keyword} for kids",
+        f"{keyword} lesson",
+        f"{keyword} homeschool",
+        f"{keyword} educational"
+    ]
+    
+    # Choose which search term to use based on keyword content
+    if interest == 'art':
+        search_query = f"{keyword} art tutorial for kids"
+    elif interest == 'music':
+        search_query = f"{keyword} music lesson"
+    elif interest == 'reading':
+        search_query = f"{keyword} reading activity"
+    elif interest == 'writing':
+        search_query = f"{keyword} writing exercise"
+    elif interest == 'math':
+        search_query = f"{keyword} math tutorial"
+    elif interest == 'science':
+        search_query = f"{keyword} science experiment for kids"
+    elif interest == 'history':
+        search_query = f"{keyword} history lesson"
+    elif interest == 'coding':
+        search_query = f"{keyword} coding tutorial for beginners"
+    else:
+        # Use a general educational search term if no specific category matches
+        search_query = search_terms[0]
         
-        return True
-    return False
+    # Make sure we only search for appropriate content for children
+    if 'kid' not in search_query and 'children' not in search_query:
+        search_query += " for students"
+    
+    return search_query
 
-# Scrapy Spider for static educational websites
-class EduSpider(scrapy.Spider):
-    name = 'edu_spider'
+async def search_youtube_keyword(keyword):
+    """Run one YouTube search for a keyword and return its top videos."""
+    results = []
+    search_query = build_youtube_query(keyword)
     
-    def __init__(self, keywords=None, *args, **kwargs):
-        super(EduSpider, self).__init__(*args, **kwargs)
-        self.keywords = keywords or []
-        
-        # Dynamically generate allowed domains based on interests
-        self.allowed_domains = []
-        self.start_urls = []
-        
-        # General educational domains that might have content for most subjects
-        general_domains = [
-            'education.com',
-            'pbskids.org',
-            'scholastic.com',
-            'brainpop.com',
-            'edutopia.org',
-            'teacherspayteachers.com',
-            'commoncore.org',
-            'readwritethink.org',
-            'outschool.com'
-        ]
+    async with get_browser_pool().page(policy='youtube') as page:
+        # Search YouTube
+        encoded_query = search_query.replace(' ', '+')
+        await page.goto(f'https://www.youtube.com/results?search_query={encoded_query}&sp=EgIQAQ%253D%253D') # Add filter for educational content
         
-        self.allowed_domains.extend(general_domains)
-        
-        # Add domain-specific educational sites based on keywords
-        for keyword in self.keywords:
-            keyword_lower = keyword.lower()
-            
-            # Art-related sites
-            if 'art' in keyword_lower or 'draw' in keyword_lower or 'paint' in keyword_lower or 'craft' in keyword_lower:
-                art_domains = [
-                    'artforkidshub.com', 
-                    'deepspacesparkle.com',
-                    'kinderart.com', 
-                    'artfulparent.com', 
-                    'artsonia.com',
-                    'theartofed.com',
-                    'incredibleart.org',
-                    'theartofeducation.edu',
-                    'cassieStephens.com'
-                ]
-                self.allowed_domains.extend(art_domains)
-                
-                # Create search URLs for art sites
-                self.start_urls.extend([
-                    f'https://www.artforkidshub.com/?s={keyword}',
-                    f'https://www.deepspacesparkle.com/?s={keyword}',
-                    f'https://kinderart.com/search-results/?q={keyword}',
-                    f'https://artfulparent.com/?s={keyword}'
-                ])
+        # Wait for content to load
+        try:
+            await page.wait_for_selector('ytd-video-renderer', timeout=5000)
             
-            # Music-related sites
-            if 'music' in keyword_lower or 'sing' in keyword_lower or 'instrument' in keyword_lower:
-                music_domains = [
-                    'musicplayhomeschool.com',
-                    'mmb.org',
-                    'musiceducationworks.org',
-                    'nafme.org',
-                    'makingmusicfun.net',
-                    'teachingchildrenmusic.com',
-                    'musicteachersgames.com',
-                    'classicsforkids.com',
-                    'musictechteacher.com'
-                ]
-                self.allowed_domains.extend(music_domains)
-                
-                # Create search URLs for music sites
-                self.start_urls.extend([
-                    f'https://makingmusicfun.net/htm/mmf_music_library/index.php?q={keyword}',
-                    f'https://www.classicsforkids.com/search?query={keyword}',
-                    f'https://teachingchildrenmusic.com/?s={keyword}'
-                ])
-            
-            # Reading-related sites
-            if 'read' in keyword_lower or 'book' in keyword_lower or 'literacy' in keyword_lower:
-                reading_domains = [
-                    'readinga-z.com',
-                    'readworks.org',
-                    'readingrockets.org',
-                    'starfall.com',
-                    'storylineonline.net',
-                    'readwritethink.org',
-                    'commonlit.org',
-                    'raz-kids.com',
-                    'literacycenter.net',
-                    'k5learning.com',
-                    'newsela.com',
-                    'scholastic.com',
-                    'readtheory.org',
-                    'kidlit.tv',
-                    'gutenberg.org'
-                ]
-                self.allowed_domains.extend(reading_domains)
-                
-                # Create search URLs for reading sites
-                self.start_urls.extend([
-                    f'https://www.readingrockets.org/search/site/{keyword}',
-                    f'https://www.readwritethink.org/search?term={keyword}',
-                    f'https://www.commonlit.org/en/texts?searchQuery={keyword}',
-                    f'https://www.k5learning.com/search/node/{keyword}'
-                ])
-            
-            # Writing-related sites
-            if 'writ' in keyword_lower or 'journal' in keyword_lower or 'essay' in keyword_lower:
-                writing_domains = [
-                    'writeshop.com',
-                    'nightzookeeper.com',
-                    'bravewriter.com',
-                    'readwritethink.org',
-                    'nanowrimo.org',
-                    'journalbuddies.com'
-                ]
-                self.allowed_domains.extend(writing_domains)
-                
-                # Create search URLs for writing sites
-                self.start_urls.extend([
-                    f'https://writeshop.com/?s={keyword}',
-                    f'https://www.bravewriter.com/search?q={keyword}',
-                    f'https://www.journalbuddies.com/?s={keyword}'
-                ])
-            
-            # Math-related sites
-            if 'math' in keyword_lower or 'number' in keyword_lower or 'geometry' in keyword_lower or 'algebra' in keyword_lower:
-                math_domains = [
-                    'khanacademy.org',
-                    'mathplayground.com',
-                    'prodigygame.com',
-                    'ixl.com',
-                    'coolmath.com',
-                    'mathgames.com',
-                    'illustrativemathematics.org'
-                ]
-                self.allowed_domains.extend(math_domains)
-                
-                # Create search URLs for math sites
-                self.start_urls.extend([
-                    f'https://www.khanacademy.org/search?page_search_query={keyword}',
-                    f'https://www.mathplayground.com/search.html?q={keyword}',
-                    f'https://www.coolmath.com/search?q={keyword}'
-                ])
-            
-            # Science-related sites
-            if 'science' in keyword_lower or 'biology' in keyword_lower or 'chemistry' in keyword_lower or 'physics' in keyword_lower:
-                science_domains = [
-                    'mysteryscience.com',
-                    'sciencekids.co.nz',
-                    'kids.nationalgeographic.com',
-                    'generationgenius.com',
-                    'sciencebuddies.org',
-                    'exploratorium.edu'
-                ]
-                self.allowed_domains.extend(science_domains)
-                
-                # Create search URLs for science sites
-                self.start_urls.extend([
-                    f'https://www.sciencekids.co.nz/search.html?q={keyword}',
-                    f'https://www.sciencebuddies.org/search?v=oli&s={keyword}',
-                    f'https://www.exploratorium.edu/search?keyword={keyword}'
-                ])
-            
-            # History-related sites
-            if 'history' in keyword_lower or 'geography' in keyword_lower or 'civiliz' in keyword_lower:
-                history_domains = [
-                    'bighistoryproject.com',
-                    'historyforkids.net',
-                    'thecrashcourse.com',
-                    'ducksters.com',
-                    'worldhistory.org',
-                    'historyextra.com'
-                ]
-                self.allowed_domains.extend(history_domains)
-                
-                # Create search URLs for history sites
-                self.start_urls.extend([
-                    f'https://www.historyforkids.net/search.html?searchword={keyword}',
-                    f'https://www.ducksters.com/search.php?q={keyword}',
-                    f'https://www.worldhistory.org/search/?q={keyword}'
-                ])
+            # Extract results
+            videos = await page.evaluate("""() => {
+                return Array.from(document.querySelectorAll('ytd-video-renderer'))
+                    .slice(0, 3) // Limit to top 3 results per keyword
+                    .map(video => {
+                        const titleElement = video.querySelector('a#video-title');
+                        const channelElement = video.querySelector('a.yt-simple-endpoint.style-scope.ytd-channel-name');
+                        
+                        return {
+                            title: titleElement?.title || '',
+                            url: titleElement?.href || '',
+                            channel: channelElement?.textContent?.trim() || '',
+                            type: 'video'
+                        };
+                    })
+                    .filter(video => video.url && video.title);
+            }""")
             
-            # Coding-related sites
-            if 'cod' in keyword_lower or 'program' in keyword_lower or 'computer science' in keyword_lower:
-                coding_domains = [
-                    'code.org',
-                    'scratch.mit.edu',
-                    'tynker.com',
-                    'codecademy.com',
-                    'codingkids.com.au',
-                    'codeforlife.education',
-                    'codemonkey.com'
-                ]
-                self.allowed_domains.extend(coding_domains)
-                
-                # Create search URLs for coding sites
-                self.start_urls.extend([
-                    f'https://code.org/search?q={keyword}',
-                    f'https://scratch.mit.edu/search/projects?q={keyword}',
-                    f'https://www.tynker.com/search/?q={keyword}'
-                ])
-        
-        # Remove duplicates
-        self.allowed_domains = list(set(self.allowed_domains))
-        self.start_urls = list(set(self.start_urls))
-        
-        # Add general educational search URLs as fallback if no specific URLs were generated
-        if not self.start_urls:
-            self.start_urls = [
-                'https://www.education.com/resources/',
-                'https://www.pbskids.org',
-                'https://www.scholastic.com/teachers/teaching-tools/'
-            ]
-
-    def parse(self, response):
-        # Extract all links from the page
-        for link in response.css('a'):
-            title = link.css('::text').get()
-            url = link.css('::attr(href)').get()
+            # Categorize the videos by subject
+            subjects = subject_classifier.classify_batch([(keyword, video['title']) for video in videos])
             
-            # Skip links without title or URL
-            if not title or not url:
-                continue
+            # Process results
+            for video, subject in zip(videos, subjects):
+                subject = subject or keyword
                 
-            # Parse URL to ensure it's absolute
-            if not url.startswith('http'):
-                url = response.urljoin(url)
-            
-            # Filter based on keywords
-            if any(keyword.lower() in title.lower() for keyword in self.keywords):
-                # Determine subject based on URL or title
-                subject = self.determine_subject(url, title)
+                # Create a description
+                description = f"Educational video about {subject}: {video['title']} by {video['channel']}"
                 
-                yield {
-                    'title': title.strip(),
-                    'url': url,
-                    'description': f"Educational resource: {title}",
+                results.append({
+                    'title': video['title'],
+                    'url': video['url'],
+                    'description': description,
                     'subject': subject,
-                    'type': self.determine_resource_type(url, title)
-                }
-        
-        # Follow next page links if available
-        next_page = response.css('a.next::attr(href), a.nextpostslink::attr(href), a[rel="next"]::attr(href)').get()
-        if next_page:
-            yield response.follow(next_page, self.parse)
-    
-    def determine_subject(self, url, title):
-        """Determine the subject of a resource based on URL and title"""
-        url_lower = url.lower()
-        title_lower = title.lower()
-        
-        # Check for subject indicators in URL and title
-        if any(term in url_lower or term in title_lower for term in ['art', 'draw', 'paint', 'craft']):
-            return 'art'
-        elif any(term in url_lower or term in title_lower for term in ['music', 'sing', 'instrument', 'song']):
-            return 'music'
-        elif any(term in url_lower or term in title_lower for term in ['read', 'book', 'literacy', 'phonics']):
-            return 'reading'
-        elif any(term in url_lower or term in title_lower for term in ['writ', 'essay', 'journal', 'grammar']):
-            return 'writing'
-        elif any(term in url_lower or term in title_lower for term in ['math', 'number', 'geometry', 'algebra']):
-            return 'math'
-        elif any(term in url_lower or term in title_lower for term in ['science', 'biology', 'chemistry', 'physics']):
-            return 'science'
-        elif any(term in url_lower or term in title_lower for term in ['history', 'geography', 'civil']):
-            return 'history'
-        elif any(term in url_lower or term in title_lower for term in ['cod', 'program', 'computer']):
-            return 'coding'
-        
-        # Default fallback to educational
-        return 'educational'
+                    'type': 'video'
+                })
+                
+        except Exception as e:
+            print(f"Error scraping YouTube for {search_query}: {e}")
     
-    def determine_resource_type(self, url, title):
-        """Determine the type of resource based on URL and title"""
-        url_lower = url.lower()
-        title_lower = title.lower()
-        
-        if 'video' in url_lower or 'video' in title_lower or 'youtube' in url_lower:
-            return 'video'
-        elif 'worksheet' in url_lower or 'worksheet' in title_lower or 'pdf' in url_lower:
-            return 'worksheet'
-        elif 'lesson' in url_lower or 'lesson' in title_lower or 'tutorial' in title_lower:
-            return 'lesson'
-        elif 'game' in url_lower or 'game' in title_lower or 'interactive' in url_lower:
-            return 'interactive'
-        elif 'activity' in url_lower or 'activity' in title_lower or 'project' in title_lower:
-            return 'activity'
-        
-        # Default fallback
-        return 'resource'
+    return results
 
-# Playwright scraper for dynamic content (YouTube)
-async def scrape_youtube(keywords):
-    """Scrape YouTube for educational content based on keywords."""
+async def scrape_youtube(keywords, concurrency=None, emit=None):
+    """
+    Scrape YouTube for educational content based on keywords.
+    If given, emit(order, video) is called for every video as soon as it is found.
+    """
     results = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        # Process each keyword to create more specific educational searches
-        for keyword in keywords:
-            keyword_lower = keyword.lower()
-            
-            # Create educational search term based on keyword
-            search_terms = [
-                f"{keyword} tutorial",
-                f"{keyword} for kids",
-                f"{keyword} lesson",
-                f"{keyword} homeschool",
-                f"{keyword} educational"
-            ]
-            
-            # Choose which search term to use based on keyword content
-            if 'art' in keyword_lower or 'draw' in keyword_lower or 'craft' in keyword_lower:
-                search_query = f"{keyword} art tutorial for kids"
-            elif 'music' in keyword_lower or 'instrument' in keyword_lower:
-                search_query = f"{keyword} music lesson"
-            elif 'read' in keyword_lower or 'book' in keyword_lower:
-                search_query = f"{keyword} reading activity"
-            elif 'write' in keyword_lower or 'journal' in keyword_lower:
-                search_query = f"{keyword} writing exercise"
-            elif 'math' in keyword_lower or 'number' in keyword_lower:
-                search_query = f"{keyword} math tutorial"
-            elif 'science' in keyword_lower or 'experiment' in keyword_lower:
-                search_query = f"{keyword} science experiment for kids"
-            elif 'history' in keyword_lower or 'geography' in keyword_lower:
-                search_query = f"{keyword} history lesson"
-            elif 'cod' in keyword_lower or 'program' in keyword_lower:
-                search_query = f"{keyword} coding tutorial for beginners"
-            else:
-                # Use a general educational search term if no specific category matches
-                search_query = search_terms[0]
-                
-            # Make sure we only search for appropriate content for children
-            if 'kid' not in search_query and 'children' not in search_query:
-                search_query += " for students"
-                
-            # Search YouTube
-            encoded_query = search_query.replace(' ', '+')
-            await page.goto(f'https://www.youtube.com/results?search_query={encoded_query}&sp=EgIQAQ%253D%253D') # Add filter for educational content
-            
-            # Wait for content to load
+    limit = asyncio.Semaphore(concurrency or YOUTUBE_SEARCH_CONCURRENCY)
+    
+    async def search(index, keyword):
+        async with limit:
+            return index, await search_youtube_keyword(keyword)
+    
+    # Search all keywords at once, a few pages at a time
+    tasks = [asyncio.ensure_future(search(index, keyword)) for index, keyword in enumerate(keywords)]
+    
+    try:
+        for finished in asyncio.as_completed(tasks):
             try:
-                await page.wait_for_selector('ytd-video-renderer', timeout=5000)
-                
-                # Extract results
-                videos = await page.evaluate("""() => {
-                    return Array.from(document.querySelectorAll('ytd-video-renderer'))
-                        .slice(0, 3) // Limit to top 3 results per keyword
-                        .map(video => {
-                            const titleElement = video.querySelector('a#video-title');
-                            const channelElement = video.querySelector('a.yt-simple-endpoint.style-scope.ytd-channel-name');
-                            
-                            return {
-                                title: titleElement?.title || '',
-                                url: titleElement?.href || '',
-                                channel: channelElement?.textContent?.trim() || '',
-                                type: 'video'
-                            };
-                        })
-                        .filter(video => video.url && video.title);
-                }""")
-                
-                # Process results
-                for video in videos:
-                    # Categorize the video by subject
-                    subject = determine_subject_from_keywords(keyword, video['title'])
-                    
-                    # Create a description
-                    description = f"Educational video about {subject}: {video['title']} by {video['channel']}"
-                    
-                    results.append({
-                        'title': video['title'],
-                        'url': video['url'],
-                        'description': description,
-                        'subject': subject,
-                        'type': 'video'
-                    })
-                    
-                    # Limit total results
-                    if len(results) >= 10:
-                        break
-                        
+                index, videos = await finished
             except Exception as e:
-                print(f"Error scraping YouTube for {search_query}: {e}")
+                print(f"Error scraping YouTube: {e}")
+                continue
+            
+            for position, video in enumerate(videos):
+                results.append((index, video))
+                if emit:
+                    emit((index, position), video)
                 
-            # Break if we have enough results
+                # Limit total results
+                if len(results) >= 10:
+                    break
+            
+            # Stop once we have enough results
             if len(results) >= 10:
                 break
-        
-        await browser.close()
-        return results
+    finally:
+        # Cancel searches that are still running once we have enough results
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Keep results in keyword order, as the sequential search did
+    results.sort(key=lambda item: item[0])
+    return [video for _, video in results]
 
 def determine_subject_from_keywords(keyword, title):
     """Helper function to categorize content based on keywords and title."""
-    keyword_lower = keyword.lower()
-    title_lower = title.lower()
-    
-    if any(term in keyword_lower or term in title_lower for term in ['art', 'draw', 'paint', 'craft']):
-        return 'art'
-    elif any(term in keyword_lower or term in title_lower for term in ['music', 'sing', 'instrument', 'song']):
-        return 'music'
-    elif any(term in keyword_lower or term in title_lower for term in ['read', 'book', 'literacy', 'phonics']):
-        return 'reading'
-    elif any(term in keyword_lower or term in title_lower for term in ['writ', 'essay', 'journal', 'grammar']):
-        return 'writing'
-    elif any(term in keyword_lower or term in title_lower for term in ['math', 'number', 'geometry', 'algebra']):
-        return 'math'
-    elif any(term in keyword_lower or term in title_lower for term in ['science', 'biology', 'chemistry', 'physics']):
-        return 'science'
-    elif any(term in keyword_lower or term in title_lower for term in ['history', 'geography', 'civil']):
-        return 'history'
-    elif any(term in keyword_lower or term in title_lower for term in ['cod', 'program', 'computer']):
-        return 'coding'
-    
-    # Default fallback to educational
-    return keyword
+    # Default fallback to the keyword itself
+    return subject_classifier.classify(keyword, title) or keyword
 
-# Playwright scraper for reading resources
-async def scrape_reading_resources(keywords):
-    """Scrape reading resources based on keywords and interests."""
-    reading_resources = []
-    grade_level = None
-    
-    # Extract grade level if present in keywords
+def get_grade_level(keywords):
+    """Extract grade level if present in keywords."""
     for keyword in keywords:
         keyword_lower = keyword.lower()
         for grade in ['preschool', 'kindergarten', '1st grade', '2nd grade', '3rd grade', 
                      '4th grade', '5th grade', '6th grade', '7th grade', '8th grade',
                      '9th grade', '10th grade', '11th grade', '12th grade']:
             if grade in keyword_lower:
-                grade_level = grade
-                break
-        if grade_level:
-            break
+                return grade
+    return None
+
+def get_reading_sites(keywords):
+    """Sites to check for reading resources - will be filtered by keywords."""
+    reading_sites = [
+        {
+            'name': 'Reading Rockets',
+            'url': 'https://www.readingrockets.org/search/site/{query}',
+            'grade_param': False
+        },
+        {
+            'name': 'ReadWorks',
+            'url': 'https://www.readworks.org/find-content#{grade}/search?query={query}',
+            'grade_param': True
+        },
+        {
+            'name': 'CommonLit',
+            'url': 'https://www.commonlit.org/en/texts?searchQuery={query}',
+            'grade_param': False
+        },
+        {
+            'name': 'K5 Learning',
+            'url': 'https://www.k5learning.com/search/node/{query}',
+            'grade_param': False
+        }
+    ]
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch()
-        page = await browser.new_page()
-        
-        # Sites to check for reading resources - will be filtered by keywords
-        reading_sites = [
+    # Include sites focused on writing if writing-related keywords are present
+    if any('writ' in keyword.lower() for keyword in keywords):
+        writing_sites = [
             {
-                'name': 'Reading Rockets',
-                'url': 'https://www.readingrockets.org/search/site/{query}',
+                'name': 'WriteShop',
+                'url': 'https://writeshop.com/?s={query}',
                 'grade_param': False
             },
             {
-                'name': 'ReadWorks',
-                'url': 'https://www.readworks.org/find-content#{grade}/search?query={query}',
-                'grade_param': True
-            },
-            {
-                'name': 'CommonLit',
-                'url': 'https://www.commonlit.org/en/texts?searchQuery={query}',
+                'name': 'Brave Writer',
+                'url': 'https://bravewriter.com/search?q={query}',
                 'grade_param': False
             },
             {
-                'name': 'K5 Learning',
-                'url': 'https://www.k5learning.com/search/node/{query}',
+                'name': 'Journal Buddies',
+                'url': 'https://www.journalbuddies.com/?s={query}',
                 'grade_param': False
             }
         ]
+        reading_sites.extend(writing_sites)
+    
+    return reading_sites
+
+async def search_reading_site(site, keyword, grade_level, has_writing_keywords):
+    """Search one reading/writing site for a keyword and return up to 3 resources."""
+    reading_resources = []
+    
+    # Format query for search
+    query = keyword.replace(' ', '+')
+    site_url = site['url'].replace('{query}', query)
+    
+    # Add grade parameter if supported and available
+    if site['grade_param'] and grade_level:
+        grade_formatted = grade_level.replace(' ', '-').lower()
+        site_url = site_url.replace('{grade}', grade_formatted)
+    else:
+        site_url = site_url.replace('{grade}/', '')
+    
+    async with get_browser_pool().page(policy='search') as page:
+        # Navigate to search URL
+        await page.goto(site_url)
         
-        # Include sites focused on writing if writing-related keywords are present
-        has_writing_keywords = any('writ' in keyword.lower() for keyword in keywords)
-        if has_writing_keywords:
-            writing_sites = [
-                {
-                    'name': 'WriteShop',
-                    'url': 'https://writeshop.com/?s={query}',
-                    'grade_param': False
-                },
-                {
-                    'name': 'Brave Writer',
-                    'url': 'https://bravewriter.com/search?q={query}',
-                    'grade_param': False
-                },
-                {
-                    'name': 'Journal Buddies',
-                    'url': 'https://www.journalbuddies.com/?s={query}',
-                    'grade_param': False
-                }
-            ]
-            reading_sites.extend(writing_sites)
+        # Wait for content to load
+        await page.wait_for_selector('a', timeout=5000)
         
-        # Process each keyword to find relevant resources
-        for keyword in keywords:
-            # Skip very general keywords
-            if keyword.lower() in ['reading', 'writing', 'grade', 'school', 'homeschool', 'education']:
-                continue
-                
-            # Format query for search
-            query = keyword.replace(' ', '+')
-            
-            # Process each reading/writing site
-            for site in reading_sites:
-                try:
-                    site_url = site['url'].replace('{query}', query)
-                    
-                    # Add grade parameter if supported and available
-                    if site['grade_param'] and grade_level:
-                        grade_formatted = grade_level.replace(' ', '-').lower()
-                        site_url = site_url.replace('{grade}', grade_formatted)
-                    else:
-                        site_url = site_url.replace('{grade}/', '')
-                    
-                    # Navigate to search URL
-                    await page.goto(site_url)
-                    
-                    # Wait for content to load
-                    await page.wait_for_selector('a', timeout=5000)
-                    
-                    # Extract resource links
-                    resources = await page.evaluate("""(siteName) => {
-                        return Array.from(document.querySelectorAll('a[href*="lesson"], a[href*="resource"], a[href*="activity"], a[href*="worksheet"], a[href*="article"], a[href*="text"]'))
-                            .slice(0, 3) // Limit to top 3 results per site
-                            .map(link => {
-                                // Get text content from parent element for better description
-                                let descriptionElement = link.closest('div, li, article');
-                                let description = '';
-                                if (descriptionElement) {
-                                    // Get text but limit length
-                                    description = descriptionElement.textContent.trim().substring(0, 150) + '...';
-                                } else {
-                                    description = `Resource from ${siteName}`;
-                                }
-                                
-                                return {
-                                    title: link.textContent.trim() || 'Educational Resource',
-                                    url: link.href,
-                                    description: description,
-                                    site: siteName
-                                };
-                            })
-                            .filter(resource => resource.url && resource.title);
-                    }""", site['name'])
-                    
-                    # Process results
-                    for resource in resources:
-                        # Determine subject and type
-                        subject = determine_subject_from_keywords(keyword, resource['title'])
-                        resource_type = 'reading resource' if not has_writing_keywords else 'writing resource'
-                        
-                        if 'worksheet' in resource['url'].lower() or 'worksheet' in resource['title'].lower():
-                            resource_type = 'worksheet'
-                        elif 'lesson' in resource['url'].lower() or 'lesson' in resource['title'].lower():
-                            resource_type = 'lesson'
-                        
-                        reading_resources.append({
-                            'title': resource['title'],
-                            'url': resource['url'],
-                            'description': resource['description'],
-                            'subject': subject,
-                            'type': resource_type
-                        })
+        # Extract resource links
+        resources = await page.evaluate("""(siteName) => {
+            return Array.from(document.querySelectorAll('a[href*="lesson"], a[href*="resource"], a[href*="activity"], a[href*="worksheet"], a[href*="article"], a[href*="text"]'))
+                .slice(0, 3) // Limit to top 3 results per site
+                .map(link => {
+                    // Get text content from parent element for better description
+                    let descriptionElement = link.closest('div, li, article');
+                    let description = '';
+                    if (descriptionElement) {
+                        // Get text but limit length
+                        description = descriptionElement.textContent.trim().substring(0, 150) + '...';
+                    } else {
+                        description = `Resource from ${siteName}`;
+                    }
                     
-                    # Limit total results
-                    if len(reading_resources) >= 15:
-                        break
-                        
-                except Exception as e:
-                    print(f"Error scraping {site['name']}: {e}")
-                    continue
-            
-            # Break if we have enough results
-            if len(reading_resources) >= 15:
-                break
-                
-        await browser.close()
-        
-    # Return unique resources (avoid duplicates)
-    seen_urls = set()
-    unique_resources = []
+                    return {
+                        title: link.textContent.trim() || 'Educational Resource',
+                        url: link.href,
+                        description: description,
+                        site: siteName
+                    };
+                })
+                .filter(resource => resource.url && resource.title);
+        }""", site['name'])
     
-    for resource in reading_resources:
-        if resource['url'] not in seen_urls:
-            seen_urls.add(resource['url'])
-            unique_resources.append(resource)
+    # Determine subject and type of all resources at once
+    subjects = subject_classifier.classify_batch([(keyword, resource['title']) for resource in resources])
+    resource_types = reading_type_classifier.classify_batch([(resource['url'], resource['title']) for resource in resources])
     
-    return unique_resources[:10]  # Return top 10 unique resources
-
-def filter_results(results, keywords):
-    """Filter and prioritize results based on keywords."""
-    filtered = []
+    # Process results
+    for resource, subject, resource_type in zip(resources, subjects, resource_types):
+        subject = subject or keyword
+        resource_type = resource_type or ('reading resource' if not has_writing_keywords else 'writing resource')
+        
+        reading_resources.append({
+            'title': resource['title'],
+            'url': resource['url'],
+            'description': resource['description'],
+            'subject': subject,
+            'type': resource_type
+        })
     
-    # Identify potential sub-interest keywords (more specific, longer keywords)
-    main_subject_keywords = ['math', 'science', 'reading', 'writing', 'history', 'art', 'music', 'coding', 'sports', 'nature', 'geography', 'languages']
-    grade_keywords = ['preschool', 'kindergarten', '1st grade', '2nd grade', '3rd grade', '4th grade', '5th grade', 
-                     '6th grade', '7th grade', '8th grade', '9th grade', '10th grade', '11th grade', '12th grade']
-    
-    # Art-specific terminology to boost relevance scoring
-    art_technique_keywords = [
-        'drawing', 'painting', 'watercolor', 'acrylic', 'oil', 'pastels', 'sculpture', 
-        'ceramics', 'printmaking', 'collage', 'mixed media', 'color theory', 'perspective',
-        'shading', 'texture', 'composition', 'portrait', 'landscape', 'figure', 'abstract',
-        'art history', 'digital art', 'crafts', 'clay', 'fiber arts', 'weaving', '3d art'
-    ]
+    return reading_resources
+
+# Playwright scraper for reading resources
+async def scrape_reading_resources(keywords, concurrency=None, site_concurrency=None, emit=None):
+    """
+    Scrape reading resources based on keywords and interests.
+    If given, emit(order, resource) is called for every resource as soon as it is found.
+    """
+    reading_resources = []
+    seen_urls = set()
+    grade_level = get_grade_level(keywords)
+    reading_sites = get_reading_sites(keywords)
+    has_writing_keywords = any('writ' in keyword.lower() for keyword in keywords)
     
-    # Music-specific terminology to boost relevance scoring
-    music_terminology_keywords = [
-        'rhythm', 'melody', 'harmony', 'notes', 'scale', 'chord', 'tempo', 'dynamics',
-        'singing', 'song', 'instrument', 'percussion', 'recorder', 'ukulele', 'piano',
-        'guitar', 'orchestra', 'band', 'ensemble', 'composition', 'musical', 'notation',
-        'sheet music', 'music theory', 'pitch', 'tone', 'staff', 'clef', 'time signature',
-        'beat', 'measure', 'vocal', 'performance', 'concert', 'music history', 'composer',
-        'symphony', 'sonata', 'music genre', 'folk music', 'classical music', 'jazz',
-        'digital music', 'recording', 'music production', 'sound', 'audio', 'music technology'
-    ]
+    # Bound the keyword x site matrix overall and per site, so no single site gets hammered
+    limit = asyncio.Semaphore(concurrency or READING_SEARCH_CONCURRENCY)
+    site_limits = {
+        site['name']: asyncio.Semaphore(site_concurrency or READING_SITE_CONCURRENCY)
+        for site in reading_sites
+    }
     
-    # Reading-specific terminology to boost relevance scoring
-    reading_terminology_keywords = [
-        'phonics', 'phonological awareness', 'letter recognition', 'alphabet', 'sight words', 
-        'phonemes', 'fluency', 'decoding', 'blending', 'comprehension', 'vocabulary',
-        'story elements', 'characters', 'setting', 'plot', 'theme', 'fiction', 'nonfiction',
-        'literature', 'genre', 'author study', 'inference', 'prediction', 'summarizing',
-        'reading strategies', 'reading skills', 'chapter book', 'picture book', 'anthology',
-        'reader', 'literacy', 'literary elements', 'literary devices', 'poetry', 'novel',
-        'biography', 'autobiography', 'narrative', 'fairy tale', 'folktale', 'myth', 'legend',
-        'research', 'text features', 'text structure', 'main idea', 'details', 'critical reading',
-        'author\'s purpose', 'author\'s craft', 'literary analysis', 'literature circles',
-        'reading response', 'reading workshop', 'guided reading', 'independent reading',
-        'shared reading', 'fluent reading', 'reading assessment', 'reading level', 'lexile',
-        'textual evidence', 'annotation', 'close reading', 'metacognition', 'context clues',
-        'figurative language', 'rhetoric', 'argumentative text', 'persuasive text', 'digital literacy',
-        'media literacy', 'compare and contrast', 'cause and effect', 'fact and opinion',
-        'american literature', 'world literature', 'british literature', 'classic literature',
-        'contemporary literature', 'literary criticism', 'literary theory', 'comparative literature'
-    ]
+    async def search(index, site, keyword):
+        async with site_limits[site['name']]:
+            async with limit:
+                try:
+                    return index, await search_reading_site(site, keyword, grade_level, has_writing_keywords)
+                except Exception as e:
+                    print(f"Error scraping {site['name']}: {e}")
+                    return index, []
     
-    # Writing-specific terminology to boost relevance scoring
-    writing_terminology_keywords = [
-        'handwriting', 'letter formation', 'scribbling', 'name writing', 'sentence writing',
-        'paragraph', 'essay', 'narrative', 'informative', 'opinion', 'persuasive', 'argumentative',
-        'creative writing', 'journal', 'story development', 'revising', 'editing', 'publishing',
-        'grammar', 'spelling', 'vocabulary', 'voice', 'style', 'thesis', 'research paper',
-        'technical writing', 'rhetoric', 'writing process', 'drafting', 'proofreading',
-        'writing workshop', 'author\'s craft', 'sentence structure', 'character development',
-        'plot development', 'setting description', 'dialogue writing', 'memoir', 'journalism',
-        'expository writing', 'descriptive writing', 'poetry writing', 'digital composition',
-        'multimedia presentation', 'academic writing', 'citations', 'bibliography', 'annotation',
-        'college essay', 'analytical writing', 'critical analysis', 'research synthesis',
-        'professional writing', 'writing portfolio', 'publication'
-    ]
+    # Process each keyword on each reading/writing site
+    searches = [(site, keyword) for site, keyword, _, _ in reading_searches_for(keywords)]
     
-    # Sports-specific terminology to boost relevance scoring
-    sports_terminology_keywords = [
-        'movement skills', 'motor skills', 'coordination', 'balance', 'flexibility', 'agility',
-        'ball skills', 'throwing', 'catching', 'kicking', 'running', 'jumping', 'hopping',
-        'team games', 'sportsmanship', 'rules', 'physical activity', 'exercise', 'fitness', 
-        'sports equipment', 'gymnastics', 'dance', 'swimming', 'soccer', 'basketball', 'baseball',
-        'volleyball', 'football', 'tennis', 'hockey', 'track and field', 'physical education',
-        'outdoor games', 'movement exploration', 'body awareness', 'spatial awareness', 'rhythm',
-        'movement patterns', 'relay races', 'obstacle courses', 'cooperative games', 'recreational'
-    ]
+    tasks = [asyncio.ensure_future(search(index, site, keyword)) for index, (site, keyword) in enumerate(searches)]
     
-    # Coding-specific terminology to boost relevance scoring
-    coding_terminology_keywords = [
-        'programming', 'code', 'coding', 'algorithm', 'sequence', 'debugging', 'computational thinking',
-        'block coding', 'scratch', 'python', 'javascript', 'html', 'css', 'web development',
-        'app development', 'game development', 'robotics', 'loops', 'conditionals', 'variables',
-        'functions', 'data structures', 'data types', 'boolean logic', 'control flow', 'syntax',
-        'commands', 'programming language', 'computer science', 'software', 'hardware', 'interface',
-        'database', 'digital storytelling', 'animation', 'unplugged activities', 'binary', 'logic',
-        'decomposition', 'abstraction', 'patterns', 'algorithms', 'logic gates', 'problem-solving',
-        'project planning', 'testing', 'debugging', 'software development', 'cybersecurity',
-        'mobile apps', 'web apps', 'user interface', 'user experience', 'front-end', 'back-end',
-        'full-stack', 'APIs', 'object-oriented', 'functional programming', 'game mechanics'
-    ]
+    found = 0
     
-    # Nature-specific terminology to boost relevance scoring
-    nature_terminology_keywords = [
-        'ecosystem', 'habitat', 'environment', 'biodiversity', 'conservation', 'sustainable',
-        'wildlife', 'plants', 'animals', 'botany', 'zoology', 'ecology', 'biomes', 'forest',
-        'ocean', 'marine', 'desert', 'jungle', 'rainforest', 'wetland', 'prairie', 'tundra',
-        'species', 'life cycle', 'food web', 'food chain', 'adaptation', 'evolution', 'natural',
-        'nature', 'outdoors', 'environmental', 'climate', 'weather', 'seasons', 'resources',
-        'earth', 'geology', 'rocks', 'minerals', 'water cycle', 'water conservation', 'energy',
-        'renewable', 'recycling', 'pollution', 'environmental impact', 'stewardship', 'preservation',
-        'sustainability', 'biology', 'carbon', 'footprint', 'deforestation', 'endangered',
-        'extinct', 'organic', 'climate change', 'global warming', 'earth day', 'green living',
-        'earth science', 'environmental science', 'ecology', 'biogeochemical', 'population dynamics'
-    ]
+    def enough():
+        return found >= 15 or len(seen_urls) >= 10
     
-    # Animals-specific terminology to boost relevance scoring
-    animals_terminology_keywords = [
-        'zoology', 'animal', 'wildlife', 'pet', 'mammal', 'bird', 'reptile', 'amphibian', 'fish',
-        'insect', 'invertebrate', 'vertebrate', 'species', 'breed', 'habitat', 'adaptation',
-        'behavior', 'carnivore', 'herbivore', 'omnivore', 'predator', 'prey', 'endangered',
-        'extinct', 'conservation', 'life cycle', 'migration', 'hibernation', 'domesticated',
-        'wild', 'farm animal', 'marine animal', 'zoo', 'aquarium', 'safari', 'ecosystem',
-        'food chain', 'classification', 'taxonomy', 'phylum', 'genus', 'species', 'fauna',
-        'biodiversity', 'evolution', 'natural selection', 'genetics', 'DNA', 'heredity',
-        'anatomy', 'physiology', 'skeletal', 'circulatory', 'digestive', 'reproductive',
-        'respiratory', 'ethology', 'instinct', 'camouflage', 'communication', 'mating',
-        'offspring', 'incubation', 'metamorphosis', 'nesting', 'herd', 'pack', 'pride',
-        'flock', 'school', 'colony', 'hive', 'veterinary', 'animal care', 'animal welfare'
-    ]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            index, resources = await finished
+            
+            # Keep unique resources up to the limits; only those are emitted, so what is
+            # streamed is exactly what is returned
+            for position, resource in enumerate(resources):
+                found += 1
+                url = canonical_url(resource['url'])
+                if url not in seen_urls:
+                    seen_urls.add(url)
+                    reading_resources.append(((index, position), resource))
+                    if emit:
+                        emit((index, position), resource)
+                if enough():
+                    break
+            
+            # Stop early once we have enough results
+            if enough():
+                break
+    finally:
+        # Cancel the searches that are no longer needed
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
     
-    # Space-specific terminology to boost relevance scoring
-    space_terminology_keywords = [
-        'astronomy', 'space', 'planet', 'solar system', 'galaxy', 'universe', 'cosmos',
-        'star', 'constellation', 'moon', 'sun', 'earth', 'mars', 'jupiter', 'saturn',
-        'venus', 'mercury', 'uranus', 'neptune', 'pluto', 'asteroid', 'comet', 'meteor',
-        'orbit', 'gravity', 'telescope', 'observatory', 'satellite', 'spacecraft', 'rocket',
-        'astronaut', 'nasa', 'esa', 'spacex', 'iss', 'international space station',
-        'eclipse', 'lunar', 'solar', 'celestial', 'cosmic', 'nebula', 'supernova', 'black hole',
-        'milky way', 'light year', 'parsec', 'astronomer', 'astrophysics', 'cosmology',
-        'exoplanet', 'extraterrestrial', 'mission', 'launch', 'touchdown', 'rover', 'probe',
-        'hubble', 'james webb', 'observatory', 'space shuttle', 'apollo', 'gemini', 'mercury program',
-        'day/night cycle', 'rotation', 'revolution', 'axis', 'equinox', 'solstice',
-        'astronomical unit', 'big bang', 'dark matter', 'dark energy', 'quasar', 'pulsar',
-        'dwarf planet', 'space exploration', 'space travel', 'interstellar', 'spacewalk',
-        'zero gravity', 'weightlessness', 'astronavigation', 'cosmonauts', 'planetary science'
-    ]
+    # Keep results in keyword and site order, as the sequential search did
+    reading_resources.sort(key=lambda item: item[0])
     
+    return [resource for _, resource in reading_resources]  # At most 10 unique resources
+
+# Relevance vocabulary for filter_results, compiled once into RELEVANCE_MATCHER below
+
+# Identify potential sub-interest keywords (more specific, longer keywords)
+MAIN_SUBJECT_KEYWORDS = ['math', 'science', 'reading', 'writing', 'history', 'art', 'music', 'coding', 'sports', 'nature', 'geography', 'languages']
+GRADE_KEYWORDS = ['preschool', 'kindergarten', '1st grade', '2nd grade', '3rd grade', '4th grade', '5th grade', 
+                  '6th grade', '7th grade', '8th grade', '9th grade', '10th grade', '11th grade', '12th grade']
+
+# Art-specific terminology to boost relevance scoring
+ART_TECHNIQUE_KEYWORDS = [
+    'drawing', 'painting', 'watercolor', 'acrylic', 'oil', 'pastels', 'sculpture', 
+    'ceramics', 'printmaking', 'collage', 'mixed media', 'color theory', 'perspective',
+    'shading', 'texture', 'composition', 'portrait', 'landscape', 'figure', 'abstract',
+    'art history', 'digital art', 'crafts', 'clay', 'fiber arts', 'weaving', '3d art'
+]
+
+# Music-specific terminology to boost relevance scoring
+MUSIC_TERMINOLOGY_KEYWORDS = [
+    'rhythm', 'melody', 'harmony', 'notes', 'scale', 'chord', 'tempo', 'dynamics',
+    'singing', 'song', 'instrument', 'percussion', 'recorder', 'ukulele', 'piano',
+    'guitar', 'orchestra', 'band', 'ensemble', 'composition', 'musical', 'notation',
+    'sheet music', 'music theory', 'pitch', 'tone', 'staff', 'clef', 'time signature',
+    'beat', 'measure', 'vocal', 'performance', 'concert', 'music history', 'composer',
+    'symphony', 'sonata', 'music genre', 'folk music', 'classical music', 'jazz',
+    'digital music', 'recording', 'music production', 'sound', 'audio', 'music technology'
+]
+
+# Reading-specific terminology to boost relevance scoring
+READING_TERMINOLOGY_KEYWORDS = [
+    'phonics', 'phonological awareness', 'letter recognition', 'alphabet', 'sight words', 
+    'phonemes', 'fluency', 'decoding', 'blending', 'comprehension', 'vocabulary',
+    'story elements', 'characters', 'setting', 'plot', 'theme', 'fiction', 'nonfiction',
+    'literature', 'genre', 'author study', 'inference', 'prediction', 'summarizing',
+    'reading strategies', 'reading skills', 'chapter book', 'picture book', 'anthology',
+    'reader', 'literacy', 'literary elements', 'literary devices', 'poetry', 'novel',
+    'biography', 'autobiography', 'narrative', 'fairy tale', 'folktale', 'myth', 'legend',
+    'research', 'text features', 'text structure', 'main idea', 'details', 'critical reading',
+    'author\'s purpose', 'author\'s craft', 'literary analysis', 'literature circles',
+    'reading response', 'reading workshop', 'guided reading', 'independent reading',
+    'shared reading', 'fluent reading', 'reading assessment', 'reading level', 'lexile',
+    'textual evidence', 'annotation', 'close reading', 'metacognition', 'context clues',
+    'figurative language', 'rhetoric', 'argumentative text', 'persuasive text', 'digital literacy',
+    'media literacy', 'compare and contrast', 'cause and effect', 'fact and opinion',
+    'american literature', 'world literature', 'british literature', 'classic literature',
+    'contemporary literature', 'literary criticism', 'literary theory', 'comparative literature'
+]
+
+# Writing-specific terminology to boost relevance scoring
+WRITING_TERMINOLOGY_KEYWORDS = [
+    'handwriting', 'letter formation', 'scribbling', 'name writing', 'sentence writing',
+    'paragraph', 'essay', 'narrative', 'informative', 'opinion', 'persuasive', 'argumentative',
+    'creative writing', 'journal', 'story development', 'revising', 'editing', 'publishing',
+    'grammar', 'spelling', 'vocabulary', 'voice', 'style', 'thesis', 'research paper',
+    'technical writing', 'rhetoric', 'writing process', 'drafting', 'proofreading',
+    'writing workshop', 'author\'s craft', 'sentence structure', 'character development',
+    'plot development', 'setting description', 'dialogue writing', 'memoir', 'journalism',
+    'expository writing', 'descriptive writing', 'poetry writing', 'digital composition',
+    'multimedia presentation', 'academic writing', 'citations', 'bibliography', 'annotation',
+    'college essay', 'analytical writing', 'critical analysis', 'research synthesis',
+    'professional writing', 'writing portfolio', 'publication'
+]
+
+# Sports-specific terminology to boost relevance scoring
+SPORTS_TERMINOLOGY_KEYWORDS = [
+    'movement skills', 'motor skills', 'coordination', 'balance', 'flexibility', 'agility',
+    'ball skills', 'throwing', 'catching', 'kicking', 'running', 'jumping', 'hopping',
+    'team games', 'sportsmanship', 'rules', 'physical activity', 'exercise', 'fitness', 
+    'sports equipment', 'gymnastics', 'dance', 'swimming', 'soccer', 'basketball', 'baseball',
+    'volleyball', 'football', 'tennis', 'hockey', 'track and field', 'physical education',
+    'outdoor games', 'movement exploration', 'body awareness', 'spatial awareness', 'rhythm',
+    'movement patterns', 'relay races', 'obstacle courses', 'cooperative games', 'recreational'
+]
+
+# Coding-specific terminology to boost relevance scoring
+CODING_TERMINOLOGY_KEYWORDS = [
+    'programming', 'code', 'coding', 'algorithm', 'sequence', 'debugging', 'computational thinking',
+    'block coding', 'scratch', 'python', 'javascript', 'html', 'css', 'web development',
+    'app development', 'game development', 'robotics', 'loops', 'conditionals', 'variables',
+    'functions', 'data structures', 'data types', 'boolean logic', 'control flow', 'syntax',
+    'commands', 'programming language', 'computer science', 'software', 'hardware', 'interface',
+    'database', 'digital storytelling', 'animation', 'unplugged activities', 'binary', 'logic',
+    'decomposition', 'abstraction', 'patterns', 'algorithms', 'logic gates', 'problem-solving',
+    'project planning', 'testing', 'debugging', 'software development', 'cybersecurity',
+    'mobile apps', 'web apps', 'user interface', 'user experience', 'front-end', 'back-end',
+    'full-stack', 'APIs', 'object-oriented', 'functional programming', 'game mechanics'
+]
+
+# Nature-specific terminology to boost relevance scoring
+NATURE_TERMINOLOGY_KEYWORDS = [
+    'ecosystem', 'habitat', 'environment', 'biodiversity', 'conservation', 'sustainable',
+    'wildlife', 'plants', 'animals', 'botany', 'zoology', 'ecology', 'biomes', 'forest',
+    'ocean', 'marine', 'desert', 'jungle', 'rainforest', 'wetland', 'prairie', 'tundra',
+    'species', 'life cycle', 'food web', 'food chain', 'adaptation', 'evolution', 'natural',
+    'nature', 'outdoors', 'environmental', 'climate', 'weather', 'seasons', 'resources',
+    'earth', 'geology', 'rocks', 'minerals', 'water cycle', 'water conservation', 'energy',
+    'renewable', 'recycling', 'pollution', 'environmental impact', 'stewardship', 'preservation',
+    'sustainability', 'biology', 'carbon', 'footprint', 'deforestation', 'endangered',
+    'extinct', 'organic', 'climate change', 'global warming', 'earth day', 'green living',
+    'earth science', 'environmental science', 'ecology', 'biogeochemical', 'population dynamics'
+]
+
+# Animals-specific terminology to boost relevance scoring
+ANIMALS_TERMINOLOGY_KEYWORDS = [
+    'zoology', 'animal', 'wildlife', 'pet', 'mammal', 'bird', 'reptile', 'amphibian', 'fish',
+    'insect', 'invertebrate', 'vertebrate', 'species', 'breed', 'habitat', 'adaptation',
+    'behavior', 'carnivore', 'herbivore', 'omnivore', 'predator', 'prey', 'endangered',
+    'extinct', 'conservation', 'life cycle', 'migration', 'hibernation', 'domesticated',
+    'wild', 'farm animal', 'marine animal', 'zoo', 'aquarium', 'safari', 'ecosystem',
+    'food chain', 'classification', 'taxonomy', 'phylum', 'genus', 'species', 'fauna',
+    'biodiversity', 'evolution', 'natural selection', 'genetics', 'DNA', 'heredity',
+    'anatomy', 'physiology', 'skeletal', 'circulatory', 'digestive', 'reproductive',
+    'respiratory', 'ethology', 'instinct', 'camouflage', 'communication', 'mating',
+    'offspring', 'incubation', 'metamorphosis', 'nesting', 'herd', 'pack', 'pride',
+    'flock', 'school', 'colony', 'hive', 'veterinary', 'animal care', 'animal welfare'
+]
+
+# Space-specific terminology to boost relevance scoring
+SPACE_TERMINOLOGY_KEYWORDS = [
+    'astronomy', 'space', 'planet', 'solar system', 'galaxy', 'universe', 'cosmos',
+    'star', 'constellation', 'moon', 'sun', 'earth', 'mars', 'jupiter', 'saturn',
+    'venus', 'mercury', 'uranus', 'neptune', 'pluto', 'asteroid', 'comet', 'meteor',
+    'orbit', 'gravity', 'telescope', 'observatory', 'satellite', 'spacecraft', 'rocket',
+    'astronaut', 'nasa', 'esa', 'spacex', 'iss', 'international space station',
+    'eclipse', 'lunar', 'solar', 'celestial', 'cosmic', 'nebula', 'supernova', 'black hole',
+    'milky way', 'light year', 'parsec', 'astronomer', 'astrophysics', 'cosmology',
+    'exoplanet', 'extraterrestrial', 'mission', 'launch', 'touchdown', 'rover', 'probe',
+    'hubble', 'james webb', 'observatory', 'space shuttle', 'apollo', 'gemini', 'mercury program',
+    'day/night cycle', 'rotation', 'revolution', 'axis', 'equinox', 'solstice',
+    'astronomical unit', 'big bang', 'dark matter', 'dark energy', 'quasar', 'pulsar',
+    'dwarf planet', 'space exploration', 'space travel', 'interstellar', 'spacewalk',
+    'zero gravity', 'weightlessness', 'astronavigation', 'cosmonauts', 'planetary science'
+]
+
+# Music instrument tutorials and lessons get an additional boost
+MUSIC_INSTRUMENTS = ['piano', 'guitar', 'violin', 'ukulele', 'recorder', 'drums', 'flute', 'percussion']
+LESSON_TERMS = ['learn', 'lesson', 'tutorial']
+
+# Interest categories scored by filter_results. A keyword containing one of 'keyword_terms' is
+# related to the category; a result containing one of 'text_terms' (or with the category as
+# its subject) earns points for every terminology match. Terms listed twice count twice.
+RELEVANCE_CATEGORIES = [
+    {'name': 'art', 'keyword_terms': ['art'], 'text_terms': ['art'], 'terms': ART_TECHNIQUE_KEYWORDS},
+    {'name': 'music', 'keyword_terms': ['music'], 'text_terms': ['music'], 'terms': MUSIC_TERMINOLOGY_KEYWORDS},
+    {'name': 'reading', 'keyword_terms': ['reading'], 'text_terms': ['reading'], 'terms': READING_TERMINOLOGY_KEYWORDS},
+    {'name': 'writing', 'keyword_terms': ['writing'], 'text_terms': ['writing'], 'terms': WRITING_TERMINOLOGY_KEYWORDS},
+    {'name': 'sports', 'keyword_terms': ['sports', 'physical', 'movement'],
+     'text_terms': ['sports', 'physical education'], 'terms': SPORTS_TERMINOLOGY_KEYWORDS},
+    {'name': 'coding', 'keyword_terms': ['coding', 'programming', 'computer science'],
+     'text_terms': ['coding', 'programming', 'computer science'], 'terms': CODING_TERMINOLOGY_KEYWORDS},
+    {'name': 'nature', 'keyword_terms': ['nature', 'environment', 'ecology', 'biology', 'earth'],
+     'text_terms': ['nature', 'environment', 'ecology'], 'terms': NATURE_TERMINOLOGY_KEYWORDS},
+    {'name': 'animals', 'keyword_terms': ['animal', 'zoology', 'wildlife', 'pet', 'species'],
+     'text_terms': ['animal', 'wildlife', 'zoology', 'pet'], 'terms': ANIMALS_TERMINOLOGY_KEYWORDS},
+    {'name': 'space', 'keyword_terms': ['space', 'astronomy', 'planet', 'solar system', 'universe', 'galaxy', 'star', 'celestial'],
+     'text_terms': ['space', 'astronomy', 'planet', 'solar system', 'universe'], 'terms': SPACE_TERMINOLOGY_KEYWORDS}
+]
+
+for _category in RELEVANCE_CATEGORIES:
+    _category['term_counts'] = Counter(_category['terms'])
+    _category['text_term_set'] = frozenset(_category['text_terms'])
+
+# Every term filter_results looks for, found in one pass over a result's text
+RELEVANCE_MATCHER = TermMatcher(
+    [term for category in RELEVANCE_CATEGORIES
+     for term in category['keyword_terms'] + category['text_terms'] + category['terms']]
+    + MUSIC_INSTRUMENTS + LESSON_TERMS
+)
+
+def build_relevance_profile(keywords):
+    """Work out, once per search, which keywords are specific topics and which interest categories they relate to."""
     # Categorize keywords into main subjects and specific topics
     specific_topic_keywords = []
-    art_related_keywords = []
-    music_related_keywords = []
-    reading_related_keywords = []
-    writing_related_keywords = []
-    sports_related_keywords = []
-    coding_related_keywords = []
-    nature_related_keywords = []
-    animals_related_keywords = []
-    space_related_keywords = []
+    related_keywords = {category['name']: [] for category in RELEVANCE_CATEGORIES}
     
     for keyword in keywords:
+        keyword_lower = keyword.lower()
         is_generic = False
         # Check if keyword contains just a grade or main subject
-        for grade in grade_keywords:
-            if grade in keyword.lower() and len(keyword.split()) <= 2:
+        for grade in GRADE_KEYWORDS:
+            if grade in keyword_lower and len(keyword.split()) <= 2:
                 is_generic = True
                 break
                 
-        for subject in main_subject_keywords:
-            if subject in keyword.lower() and len(keyword.split()) <= 2:
+        for subject in MAIN_SUBJECT_KEYWORDS:
+            if subject in keyword_lower and len(keyword.split()) <= 2:
                 is_generic = True
                 break
                 
         if not is_generic and len(keyword.split()) >= 2:
             specific_topic_keywords.append(keyword)
-            
-        # Identify art-specific keywords
-        if 'art' in keyword.lower():
-            art_related_keywords.append(keyword)
-            for technique in art_technique_keywords:
-                if technique in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important art technique keywords
-        
-        # Identify music-specific keywords
-        if 'music' in keyword.lower():
-            music_related_keywords.append(keyword)
-            for term in music_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important music terminology keywords
         
-        # Identify reading-specific keywords
-        if 'reading' in keyword.lower():
-            reading_related_keywords.append(keyword)
-            for term in reading_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important reading terminology keywords
-                    
-        # Identify writing-specific keywords
-        if 'writing' in keyword.lower():
-            writing_related_keywords.append(keyword)
-            for term in writing_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important writing terminology keywords
-                    
-        # Identify sports-specific keywords
-        if 'sports' in keyword.lower() or 'physical' in keyword.lower() or 'movement' in keyword.lower():
-            sports_related_keywords.append(keyword)
-            for term in sports_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important sports terminology keywords
-                    
-        # Identify coding-specific keywords
-        if 'coding' in keyword.lower() or 'programming' in keyword.lower() or 'computer science' in keyword.lower():
-            coding_related_keywords.append(keyword)
-            for term in coding_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important coding terminology keywords
-                    
-        # Identify nature-specific keywords
-        if 'nature' in keyword.lower() or 'environment' in keyword.lower() or 'ecology' in keyword.lower() or 'biology' in keyword.lower() or 'earth' in keyword.lower():
-            nature_related_keywords.append(keyword)
-            for term in nature_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important nature terminology keywords
-                    
-        # Identify animals-specific keywords
-        if 'animal' in keyword.lower() or 'zoology' in keyword.lower() or 'wildlife' in keyword.lower() or 'pet' in keyword.lower() or 'species' in keyword.lower():
-            animals_related_keywords.append(keyword)
-            for term in animals_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important animals terminology keywords
-                    
-        # Identify space-specific keywords
-        if 'space' in keyword.lower() or 'astronomy' in keyword.lower() or 'planet' in keyword.lower() or 'solar system' in keyword.lower() or 'universe' in keyword.lower() or 'galaxy' in keyword.lower() or 'star' in keyword.lower() or 'celestial' in keyword.lower():
-            space_related_keywords.append(keyword)
-            for term in space_terminology_keywords:
-                if term in keyword.lower():
-                    specific_topic_keywords.append(keyword)  # Double count important space terminology keywords
-    
-    for result in results:
-        # Ensure required fields exist
-        if 'title' not in result or not result['title']:
-            continue
-            
-        if 'url' not in result or not result['url']:
-            continue
-            
-        # Add default values for required fields if they don't exist
-        if 'description' not in result or not result['description']:
-            result['description'] = f"Educational resource about {result.get('subject', 'various topics')}"
-            
-        if 'subject' not in result or not result['subject']:
-            result['subject'] = 'Educational'
-            
-        if 'type' not in result or not result['type']:
-            result['type'] = determine_resource_type_from_url(result.get('url', ''))
-            
-        if 'estimatedTime' not in result:
-            result['estimatedTime'] = estimate_completion_time(result)
-        
-        # Combine title and description for matching
-        text_to_match = (result['title'] + " " + result['description']).lower()
-        
-        # Score based on keyword matches with weighting
-        score = 0
-        
-        # Higher score for specific topic matches - these are more important
-        for keyword in specific_topic_keywords:
-            if keyword.lower() in text_to_match:
-                # Specific topic keywords get 3 points
-                score += 3
-                
-                # Extra points if it's in the title (more relevant)
-                if keyword.lower() in result['title'].lower():
-                    score += 2
-        
-        # Base points for any keyword match
-        for keyword in keywords:
-            if keyword.lower() in text_to_match:
-                score += 1
-                
-        # Extra points for art technique matches in art-related results
-        if 'art' in text_to_match or result.get('subject', '').lower() == 'art':
-            for technique in art_technique_keywords:
-                if technique in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of art techniques
-                    if technique in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific art-related keywords
-            for keyword in art_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
-        
-        # Extra points for music terminology matches in music-related results
-        if 'music' in text_to_match or result.get('subject', '').lower() == 'music':
-            for term in music_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of music terminology
-                    if term in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific music-related keywords
-            for keyword in music_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
-                    
-            # Additional scoring for music instrument tutorials and lessons
-            instruments = ['piano', 'guitar', 'violin', 'ukulele', 'recorder', 'drums', 'flute', 'percussion']
-            for instrument in instruments:
-                if instrument in text_to_match and ('learn' in text_to_match or 'lesson' in text_to_match or 'tutorial' in text_to_match):
-                    score += 3
+        # Identify category-specific keywords
+        keyword_hits = RELEVANCE_MATCHER.find(keyword_lower)
+        for category in RELEVANCE_CATEGORIES:
+            if any(term in keyword_hits for term in category['keyword_terms']):
+                related_keywords[category['name']].append(keyword)
+                for term, count in category['term_counts'].items():
+                    if term in keyword_hits:
+                        # Double count keywords with important category terminology
+                        specific_topic_keywords.extend([keyword] * count)
+    
+    keywords_lower = [keyword.lower() for keyword in keywords]
+    return {
+        'keywords': keywords_lower,
+        'specific_topic_keywords': [keyword.lower() for keyword in specific_topic_keywords],
+        'related_keywords': {name: [keyword.lower() for keyword in related] for name, related in related_keywords.items()},
+        # The keywords themselves are matched with a per-search automaton
+        'keyword_matcher': TermMatcher(keywords_lower)
+    }
+
+def prepare_result(result):
+    """Fill in default values for a result. Returns False if it lacks a title or URL."""
+    # Ensure required fields exist
+    if 'title' not in result or not result['title']:
+        return False
         
-        # Extra points for reading terminology matches in reading-related results
-        if 'reading' in text_to_match or result.get('subject', '').lower() == 'reading':
-            for term in reading_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of reading terminology
-                    if term in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific reading-related keywords
-            for keyword in reading_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
+    if 'url' not in result or not result['url']:
+        return False
         
-        # Extra points for writing terminology matches in writing-related results
-        if 'writing' in text_to_match or result.get('subject', '').lower() == 'writing':
-            for term in writing_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of writing terminology
-                    if term in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific writing-related keywords
-            for keyword in writing_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
+    # Add default values for required fields if they don't exist
+    if 'description' not in result or not result['description']:
+        result['description'] = f"Educational resource about {result.get('subject', 'various topics')}"
         
-        # Extra points for sports terminology matches in sports-related results
-        if 'sports' in text_to_match or 'physical education' in text_to_match or result.get('subject', '').lower() == 'sports':
-            for term in sports_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of sports terminology
-                    if term in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific sports-related keywords
-            for keyword in sports_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
+    if 'subject' not in result or not result['subject']:
+        result['subject'] = 'Educational'
         
-        # Extra points for coding terminology matches in coding-related results
-        if 'coding' in text_to_match or 'programming' in text_to_match or 'computer science' in text_to_match or result.get('subject', '').lower() == 'coding':
-            for term in coding_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of coding terminology
-                    if term in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific coding-related keywords
-            for keyword in coding_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
+    if 'type' not in result or not result['type']:
+        result['type'] = determine_resource_type_from_url(result.get('url', ''))
         
-        # Extra points for nature terminology matches in nature-related results
-        if 'nature' in text_to_match or 'environment' in text_to_match or 'ecology' in text_to_match or result.get('subject', '').lower() == 'nature':
-            for term in nature_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of nature terminology
-                    if term in result['title'].lower():
-                        score += 1
+    if 'estimatedTime' not in result:
+        result['estimatedTime'] = estimate_completion_time(result)
+    
+    return True
+
+def match_result(result, profile):
+    """
+    Find the vocabulary terms and keywords in a result's title and description.
+    Returns (term_hits, keyword_hits, title_length): the hits map each match to the end of its
+    first occurrence, and a match is in the title if its end is at most title_length.
+    """
+    # Combine title and description for matching
+    title_lower = result['title'].lower()
+    text_to_match = (result['title'] + " " + result['description']).lower()
+    term_hits = RELEVANCE_MATCHER.find(text_to_match)
+    keyword_hits = profile['keyword_matcher'].find(text_to_match)
+    
+    if text_to_match.startswith(title_lower):
+        return term_hits, keyword_hits, len(title_lower)
+    
+    # Lowercasing the title on its own gave different text, so check the title directly
+    term_hits = {term: 0 if term in title_lower else 1 for term in term_hits}
+    keyword_hits = {keyword: 0 if keyword in title_lower else 1 for keyword in keyword_hits}
+    return term_hits, keyword_hits, 0
+
+def score_result(result, profile):
+    """Score one result against the search's keywords."""
+    term_hits, keyword_hits, title_length = match_result(result, profile)
+    subject = result.get('subject', '').lower()
+    
+    # Score based on keyword matches with weighting
+    score = 0
+    
+    # Higher score for specific topic matches - these are more important
+    for keyword in profile['specific_topic_keywords']:
+        if keyword in keyword_hits:
+            # Specific topic keywords get 3 points
+            score += 3
             
-            # Boost resources that match specific nature-related keywords
-            for keyword in nature_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
+            # Extra points if it's in the title (more relevant)
+            if keyword_hits[keyword] <= title_length:
+                score += 2
+    
+    # Base points for any keyword match
+    for keyword in profile['keywords']:
+        if keyword in keyword_hits:
+            score += 1
+    
+    # Extra points for terminology matches in category-related results
+    for category in RELEVANCE_CATEGORIES:
+        if subject != category['name'] and category['text_term_set'].isdisjoint(term_hits):
+            continue
         
-        # Extra points for animals terminology matches in animals-related results
-        if 'animal' in text_to_match or 'wildlife' in text_to_match or 'zoology' in text_to_match or 'pet' in text_to_match or result.get('subject', '').lower() == 'animals':
-            for term in animals_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of animals terminology
-                    if term in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific animals-related keywords
-            for keyword in animals_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
+        term_counts = category['term_counts']
+        for term, end in term_hits.items():
+            count = term_counts.get(term)
+            if count:
+                score += 2 * count
+                
+                # Even more points for title matches of category terminology
+                if end <= title_length:
+                    score += count
         
-        # Extra points for space terminology matches in space-related results
-        if 'space' in text_to_match or 'astronomy' in text_to_match or 'planet' in text_to_match or 'solar system' in text_to_match or 'universe' in text_to_match or result.get('subject', '').lower() == 'space':
-            for term in space_terminology_keywords:
-                if term in text_to_match:
-                    score += 2
-                    
-                    # Even more points for title matches of space terminology
-                    if term in result['title'].lower():
-                        score += 1
-            
-            # Boost resources that match specific space-related keywords
-            for keyword in space_related_keywords:
-                if keyword.lower() in text_to_match:
-                    score += 1
+        # Boost resources that match specific category-related keywords
+        for keyword in profile['related_keywords'][category['name']]:
+            if keyword in keyword_hits:
+                score += 1
         
-        # Add result if it has a score greater than 0
+        # Additional scoring for music instrument tutorials and lessons
+        if category['name'] == 'music' and any(term in term_hits for term in LESSON_TERMS):
+            score += 3 * sum(1 for instrument in MUSIC_INSTRUMENTS if instrument in term_hits)
+    
+    return score
+
+@functools.lru_cache(maxsize=None)
+def load_batch_scoring():
+    """Import batch_scoring on first use, or return None without NumPy/SciPy (every pool is then scored one result at a time)."""
+    try:
+        import batch_scoring
+    except ImportError:
+        return None
+    return batch_scoring
+
+def filter_results(results, keywords):
+    """Filter and prioritize results based on keywords."""
+    profile = build_relevance_profile(keywords)
+    candidates = [result for result in results if prepare_result(result)]
+    
+    # Large candidate pools are scored as one sparse matrix product
+    batch_scoring = load_batch_scoring() if len(candidates) >= BATCH_SCORING_MIN_RESULTS else None
+    if batch_scoring is not None:
+        matches = [match_result(result, profile) for result in candidates]
+        subjects = [result.get('subject', '').lower() for result in candidates]
+        scores = batch_scoring.score_matches(matches, subjects, profile, RELEVANCE_CATEGORIES,
+                                             MUSIC_INSTRUMENTS, LESSON_TERMS)
+    else:
+        scores = [score_result(result, profile) for result in candidates]
+    
+    # Add result if it has a score greater than 0
+    filtered = []
+    for result, score in zip(candidates, scores):
         if score > 0:
-            result['relevance_score'] = score
+            result['relevance_score'] = int(score)
             filtered.append(result)
     
     # Sort by relevance
@@ -1039,20 +762,7 @@ def filter_results(results, keywords):
 
 def determine_resource_type_from_url(url):
     """Determine the type of resource based on URL."""
-    url_lower = url.lower()
-    
-    if 'youtube.com' in url_lower or 'youtu.be' in url_lower or 'vimeo.com' in url_lower:
-        return 'Video'
-    elif '.pdf' in url_lower or 'worksheet' in url_lower or 'printable' in url_lower:
-        return 'Worksheet'
-    elif 'game' in url_lower or 'interactive' in url_lower or 'play' in url_lower:
-        return 'Interactive'
-    elif 'lesson' in url_lower or 'curriculum' in url_lower or 'plan' in url_lower:
-        return 'Lesson Plan'
-    elif 'activity' in url_lower or 'project' in url_lower or 'experiment' in url_lower:
-        return 'Activity'
-    else:
-        return 'Resource'
+    return url_type_classifier.classify(url)
 
 def estimate_completion_time(resource):
     """Estimate completion time based on resource type."""
@@ -1095,8 +805,135 @@ def estimate_completion_time(resource):
     # Default for all other types
     return '5 minutes'
 
-def scrape_resources(search_id, keywords):
-    """Scrape educational resources using Scrapy and Playwright based on profile interests."""
+def install_asyncio_reactor():
+    """Install the asyncio-backed Twisted reactor (once per process) and Scrapy logging."""
+    from scrapy.utils.log import configure_logging
+    from scrapy.utils.reactor import install_reactor
+    
+    install_reactor(ASYNCIO_REACTOR)
+    configure_logging({'LOG_LEVEL': 'INFO'})
+
+def run_with_reactor(coroutine_factory):
+    """
+    Run an async entry point on the asyncio reactor and return its result.
+    The reactor can only be started once per process, so this is the single
+    place where it is run - both for one-off searches and for the worker.
+    """
+    install_asyncio_reactor()
+    from twisted.internet import reactor
+    from twisted.internet.defer import Deferred
+    
+    outcome = {}
+    
+    def finish(result):
+        outcome['result'] = result
+        reactor.stop()
+    
+    def fail(failure):
+        outcome['error'] = failure.value
+        reactor.stop()
+    
+    def start():
+        deferred = Deferred.fromFuture(asyncio.ensure_future(coroutine_factory()))
+        deferred.addCallbacks(finish, fail)
+    
+    reactor.callWhenRunning(start)
+    reactor.run()
+    
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome.get('result')
+
+def run_without_reactor(coroutine_factory):
+    """
+    Run an async entry point on a plain asyncio event loop and return its result.
+    For runs that never crawl, which then skip importing Scrapy and Twisted altogether.
+    """
+    return asyncio.run(coroutine_factory())
+
+async def crawl_static_sites(search_id, keywords, emit=None, deadline=None):
+    """
+    Run EduSpider on the already running reactor and return the scraped items.
+    Items are collected in memory as they are scraped; if given, emit(order, item) is
+    called for every item at the same time. With a deadline, the spider closes itself
+    when the discovery budget runs out.
+    """
+    from scrapy import signals
+    from scrapy.crawler import CrawlerRunner
+    from scrapy.utils.defer import deferred_to_future
+    from edu_spider import EduSpider
+    from scrapy_page_cache import page_cache_settings
+    
+    settings = {
+        'LOG_LEVEL': 'INFO',
+        'TWISTED_REACTOR': ASYNCIO_REACTOR,
+        'DEPTH_LIMIT': CRAWL_DEPTH_LIMIT,
+        **page_cache_settings(),
+    }
+    budget = deadline.budget('discovery') if deadline else None
+    if budget is not None:
+        settings['CLOSESPIDER_TIMEOUT'] = max(budget, 1)
+    if EXPORT_SCRAPY_FEED:
+        settings['FEEDS'] = {
+            f'data/searches/{search_id}_scrapy.json': {'format': 'json', 'overwrite': True},
+        }
+    runner = CrawlerRunner(settings=settings)
+    crawler = runner.create_crawler(EduSpider)
+    
+    items = []
+    
+    def item_scraped(item, response, spider):
+        item = dict(item)
+        items.append(item)
+        if emit:
+            emit((len(items) - 1,), dict(item))
+    
+    crawler.signals.connect(item_scraped, signal=signals.item_scraped)
+    
+    if deadline:
+        def spider_closed(spider, reason):
+            if reason == 'closespider_timeout':
+                deadline.mark_partial('discovery')
+        
+        crawler.signals.connect(spider_closed, signal=signals.spider_closed)
+    
+    try:
+        await deferred_to_future(runner.crawl(crawler, keywords=keywords))
+    except asyncio.CancelledError:
+        # Stop the crawl itself, not just our wait for it
+        if crawler.crawling:
+            await deferred_to_future(crawler.stop())
+        raise
+    
+    return items
+
+def clean_keyword_list(keywords):
+    """Strip keywords, dropping empty and duplicate ones."""
+    clean_keywords = []
+    for keyword in keywords:
+        # Skip empty keywords
+        if not keyword or len(keyword.strip()) == 0:
+            continue
+        
+        # Clean and add the keyword
+        clean_keyword = keyword.strip()
+        if clean_keyword not in clean_keywords:
+            clean_keywords.append(clean_keyword)
+    return clean_keywords
+
+def detect_interests(keywords):
+    """Interests found in the keywords, which decide the dynamic scrapers to run."""
+    detected_interests = set()
+    for keyword in keywords:
+        detected_interests.update(interest_classifier.labels(keyword))
+    return detected_interests
+
+async def scrape_resources(search_id, keywords, extraction_queue=None, deadline=None):
+    """
+    Scrape educational resources using Scrapy and Playwright based on profile interests.
+    With an extraction queue, content extraction for the top results starts during discovery.
+    With a deadline, discovery stops when its budget runs out.
+    """
     # Step 1: Clean and validate keywords
     if not keywords or len(keywords) == 0:
         update_status(search_id, "error", "No search keywords provided", 0)
@@ -1110,93 +947,169 @@ def scrape_resources(search_id, keywords):
         }
     
     # Clean keywords - remove duplicates and standardize
-    clean_keywords = []
-    for keyword in keywords:
-        # Skip empty keywords
-        if not keyword or len(keyword.strip()) == 0:
-            continue
-        
-        # Clean and add the keyword
-        clean_keyword = keyword.strip()
-        if clean_keyword not in clean_keywords:
-            clean_keywords.append(clean_keyword)
+    clean_keywords = clean_keyword_list(keywords)
     
-    # Step 2: Scrape static sites with Scrapy
-    update_status(search_id, "scraping", "Searching educational websites for personalized content...", 20)
+    # Serve recent results for the same keyword set from the search cache
+    cached = get_cached_search(clean_keywords)
+    if cached is not None:
+        cached_results, age, is_fresh = cached
+        cache_status = {'hit': True, 'ageSeconds': int(age), 'stale': not is_fresh}
+        if is_fresh:
+            update_status(search_id, "processing", "Found recent results for these interests...", 70, cache=cache_status)
+        else:
+            update_status(search_id, "processing", "Found earlier results for these interests, refreshing them in the background...", 70, cache=cache_status)
+            refresh_search_cache_in_background(clean_keywords)
+        return [dict(result) for result in cached_results]
     
-    scrapy_results = []
-    process = CrawlerProcess(settings={
-        'FEEDS': {
-            f'data/searches/{search_id}_scrapy.json': {'format': 'json'},
-        },
-        'LOG_LEVEL': 'INFO',
-    })
-    process.crawl(EduSpider, keywords=clean_keywords)
-    process.start()
-    
-    # Load Scrapy results
-    scrapy_file = f'data/searches/{search_id}_scrapy.json'
-    if os.path.exists(scrapy_file):
-        with open(scrapy_file, 'r') as f:
-            scrapy_results = json.load(f)
-    
-    # Step 3: Analyze keywords to determine which dynamic scrapers to use
-    update_status(search_id, "scraping", "Searching for specialized resources based on interests...", 40)
-    
-    # Initialize results containers
-    youtube_results = []
-    reading_results = []
-    loop = asyncio.get_event_loop()
-    
-    # Analyze keywords to determine interests
-    interest_categories = {
-        'art': ['art', 'draw', 'paint', 'craft', 'color', 'design'],
-        'music': ['music', 'song', 'instrument', 'singing', 'notes', 'melody'],
-        'reading': ['read', 'book', 'story', 'literature', 'phonics', 'comprehension'],
-        'writing': ['writ', 'journal', 'essay', 'grammar', 'composition', 'letter'],
-        'math': ['math', 'number', 'geometry', 'algebra', 'count', 'calculation'],
-        'science': ['science', 'biology', 'chemistry', 'physics', 'experiment', 'nature'],
-        'history': ['history', 'past', 'geography', 'civil', 'culture', 'ancient'],
-        'coding': ['cod', 'program', 'computer science', 'algorithm', 'software']
-    }
+    update_status(search_id, "scraping", "Starting a new search...", 15, cache={'hit': False})
     
-    detected_interests = set()
-    for keyword in clean_keywords:
-        keyword_lower = keyword.lower()
-        for interest, terms in interest_categories.items():
-            if any(term in keyword_lower for term in terms):
-                detected_interests.add(interest)
+    results = await discover_and_rank(search_id, clean_keywords, extraction_queue, deadline)
+    
+    # Results cut short by the deadline would hide the full ranking from later searches
+    if not (deadline and deadline.partial):
+        store_cached_search(clean_keywords, results)
+    return results
+
+def served_from_cache(keywords):
+    """
+    Whether a search for the keywords will be answered from the search cache, without crawling.
+    Entries about to expire don't count, as they may be gone by the time the search gets to them.
+    """
+    cached = get_cached_search(clean_keyword_list(keywords))
+    return cached is not None and cached[1] < SEARCH_CACHE_MAX_STALE_SECONDS - 60
+
+def refresh_search_cache_in_background(keywords):
+    """
+    Refresh a stale search cache entry without holding up the current search.
+    A worker refreshes on its own event loop; a one-off run hands the refresh to a detached process.
+    """
+    if not claim_refresh(keywords):
+        return
     
-    # Step 4: Scrape resources based on detected interests
+    if REFRESH_IN_PROCESS:
+        task = asyncio.ensure_future(refresh_search_cache(keywords))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+        return
     
-    # Always scrape YouTube for educational videos - it has content for all subjects
-    update_status(search_id, "scraping", "Finding educational videos based on interests...", 50)
-    youtube_results = loop.run_until_complete(scrape_youtube(clean_keywords))
+    try:
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--refresh-cache', *keywords],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        print(f"Could not start search cache refresh: {e}")
+        release_refresh(keywords)
+
+async def refresh_search_cache(keywords):
+    """Run discovery and ranking again for a keyword set and store the new results."""
+    # A refresh task inherits the context of the search that started it; give it its own
+    # counters and no event sink, so nothing of the refresh ends up in that search
+    start_search_events(None)
+    start_search_metrics()
+    
+    try:
+        results = await discover_and_rank(f"refresh-{search_cache_key(keywords)}", keywords)
+        store_cached_search(keywords, results)
+        print(f"Refreshed search cache for {len(keywords)} keywords ({len(results)} results)")
+    except Exception as e:
+        print(f"Search cache refresh failed: {e}")
+    finally:
+        release_refresh(keywords)
+
+async def discover_and_rank(search_id, clean_keywords, extraction_queue=None, deadline=None):
+    """
+    Find resources for the keywords with Scrapy and Playwright, ranking them as they arrive.
+    All sources run at once on the same event loop, and sources still running are cancelled
+    once the top results have settled or the deadline's discovery budget runs out. Results
+    entering the top results are submitted to the extraction queue, if given, so their
+    content is fetched while discovery goes on.
+    """
+    deadline = deadline or SearchDeadline()
+    profile = build_relevance_profile(clean_keywords)
+    
+    def score(result):
+        return score_result(result, profile) if prepare_result(result) else None
+    
+    def entered(result):
+        # Better results get extraction slots first
+        if extraction_queue is not None and result['url'] != '#' and not result['url'].startswith('file://'):
+            extraction_queue.submit(result['url'], -result.get('relevance_score', 0))
+            increment('prefetchedExtractions')
+        if streaming():
+            emit_event('resource', resource=standardize_results([result])[0], score=result.get('relevance_score', 0))
+    
+    def left(result):
+        if extraction_queue is not None:
+            extraction_queue.discard(result['url'])
+        emit_event('resource_removed', url=result['url'])
+    
+    # The same resource under another URL, or mirrored with near-identical text, is ranked once
+    duplicates = DuplicateIndex()
+    ranking = RankingStream(score, on_enter=entered, on_leave=left, key=duplicates.key)
+    
+    # Results are ordered by source, then by their position in it, for ties and duplicate URLs
+    def emit_to(source):
+        return lambda order, result: ranking.add((source,) + order, result)
+    
+    # Step 2: Analyze keywords to determine which dynamic scrapers to use
+    detected_interests = detect_interests(clean_keywords)
+    
+    # Step 3: Scrape static sites with Scrapy, and YouTube for educational videos - it has content for all subjects
+    sources = [
+        ('educational websites', crawl_static_sites(search_id, clean_keywords, emit=emit_to(0), deadline=deadline)),
+        ('educational videos', scrape_youtube(clean_keywords, emit=emit_to(1)))
+    ]
     
     # Scrape reading/writing resources if relevant interests are detected
     if 'reading' in detected_interests or 'writing' in detected_interests:
-        update_status(search_id, "scraping", f"Finding {'reading and writing' if 'reading' in detected_interests and 'writing' in detected_interests else 'reading' if 'reading' in detected_interests else 'writing'} resources...", 60)
-        reading_results = loop.run_until_complete(scrape_reading_resources(clean_keywords))
+        label = 'reading and writing' if 'reading' in detected_interests and 'writing' in detected_interests else 'reading' if 'reading' in detected_interests else 'writing'
+        sources.append((f"{label} resources", scrape_reading_resources(clean_keywords, emit=emit_to(2))))
     
-    # Step 5: Combine and filter results
-    update_status(search_id, "processing", "Processing and filtering results based on your interests...", 70)
-    all_results = scrapy_results + youtube_results + reading_results
+    # Step 4: Run every source concurrently, reporting progress as each one finishes
+    finished = []
+    
+    async def run_source(name, source):
+        await source
+        finished.append(name)
+        update_status(search_id, "scraping", f"Finished searching {name}...", 20 + 40 * len(finished) // len(sources))
     
-    # Remove duplicate results (based on URL)
-    unique_urls = set()
-    unique_results = []
+    update_status(search_id, "scraping", "Searching educational websites, videos and specialized resources based on interests...", 20)
     
-    for result in all_results:
-        if result.get('url') and result['url'] not in unique_urls:
-            unique_urls.add(result['url'])
-            unique_results.append(result)
+    with deadline.stage('discovery'):
+        try:
+            settled = await asyncio.wait_for(
+                ranking.run_until_settled(*(run_source(name, source) for name, source in sources)),
+                deadline.budget('discovery')
+            )
+        except asyncio.TimeoutError:
+            # Cancelling the wait cancels every source that is still running
+            settled = False
+            deadline.mark_partial('discovery')
+            print("Discovery ran out of time, ranking the results found so far")
     
-    # Apply relevance filtering to prioritize best matches
-    filtered_results = filter_results(unique_results, clean_keywords)
+    if settled:
+        print("Top results settled, stopped the remaining discovery early")
+        increment('discoveryStoppedEarly')
     
-    # Ensure all required fields are present
+    # Every merged duplicate of a top result is an extraction we don't run
+    increment('duplicatesMerged', duplicates.merged_count())
+    increment('extractionsAvoided', duplicates.merged_count(ranking.top_keys()))
+    
+    # Step 5: Take the ranked results
+    update_status(search_id, "processing", "Processing and filtering results based on your interests...", 70)
+    
+    with deadline.stage('ranking'):
+        standardized_results = standardize_results(ranking.results())
+    
+    return standardized_results
+
+def standardize_results(ranked_results):
+    """Ensure all required fields are present"""
     standardized_results = []
-    for result in filtered_results:
+    for result in ranked_results:
         standardized_result = {
             'title': result.get('title', 'Educational Resource'),
             'url': result.get('url', '#'),
@@ -1211,7 +1124,8 @@ def scrape_resources(search_id, keywords):
 
 async def extract_resource_content(url):
     """
-    Extract meaningful content from a resource URL using Playwright.
+    Extract meaningful content from a resource URL.
+    Tries a plain HTTP fetch first and falls back to Playwright when the static page is too thin.
     Focuses on article text, lists, and headings.
     """
     try:
@@ -1219,22 +1133,25 @@ async def extract_resource_content(url):
         # but we can extract the video description which is often informative
         if 'youtube.com' in url or 'youtu.be' in url:
             return await extract_youtube_content(url)
-            
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
-            )
-            page = await context.new_page()
-            
+        
+        # Most educational sites serve their text in the static HTML, so skip the browser when we can
+        static_content = None
+        if extraction_paths.prefers_http(url):
+            static_content = await extract_static_content(url)
+            if len(static_content) >= MIN_STATIC_CONTENT_LENGTH:
+                extraction_paths.record(url, 'http')
+                increment('httpExtractions')
+                return process_extracted_content(static_content)
+        
+        increment('browserExtractions')
+        async with get_browser_pool().page(policy='article') as page:
             # Set a timeout for navigation
             try:
                 await page.goto(url, timeout=15000, wait_until='domcontentloaded')
-                # Wait a bit for dynamic content to load
-                await page.wait_for_timeout(2000)
+                # Wait for dynamic content to settle (returns at once for static pages)
+                await wait_until_ready(page, deadline_ms=2000)
             except Exception as e:
                 print(f"Navigation error for {url}: {e}")
-                await browser.close()
                 return ""
             
             # Extract meaningful content - article, lists, headings
@@ -1355,7 +1272,9 @@ async def extract_resource_content(url):
                 return combinedContent.slice(0, 15000); // Allow larger content than before
             }""")
             
-            await browser.close()
+            # The domain only counts as needing the browser once it did better than the static page
+            if static_content is not None and content and len(content) > len(static_content):
+                extraction_paths.record(url, 'browser')
             
             # Process the content to make it more usable
             if content:
@@ -1369,19 +1288,14 @@ async def extract_resource_content(url):
 async def extract_youtube_content(url):
     """Extract content from YouTube videos (title, description, etc.)"""
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36'
-            )
-            page = await context.new_page()
-            
+        async with get_browser_pool().page(policy='youtube') as page:
             try:
                 await page.goto(url, timeout=20000, wait_until='domcontentloaded')
-                await page.wait_for_timeout(3000)  # Wait for dynamic content
+                # Wait for the description to be filled in by YouTube's scripts, or at least to appear
+                description = '#description-inline-expander, #description'
+                await wait_until_ready(page, deadline_ms=3000, content_selector=description, ready_selector=description)
             except Exception as e:
                 print(f"YouTube navigation error for {url}: {e}")
-                await browser.close()
                 return "YouTube video - content unavailable"
             
             # Extract YouTube video metadata
@@ -1434,7 +1348,6 @@ async def extract_youtube_content(url):
                 return result;
             }""")
             
-            await browser.close()
             return content
     except Exception as e:
         print(f"Error extracting YouTube content from {url}: {e}")
@@ -1472,113 +1385,462 @@ def process_extracted_content(content):
     
     return content
 
-async def fetch_resource_content(standardized_results):
-    """Extract and add content for each resource"""
-    update_resources = []
-    
-    # Process resources in batches to avoid overwhelming the system
-    batch_size = 3
-    for i in range(0, len(standardized_results), batch_size):
-        batch = standardized_results[i:i+batch_size]
-        tasks = []
-        
-        for resource in batch:
-            if resource['url'] != '#' and not resource['url'].startswith('file://'):
-                tasks.append(extract_resource_content(resource['url']))
-            else:
-                tasks.append(asyncio.sleep(0))  # Dummy task for resources without valid URLs
-        
-        # Wait for all content extraction tasks in this batch to complete
-        contents = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Add content to resources
-        for j, resource in enumerate(batch):
-            content = contents[j] if not isinstance(contents[j], Exception) else ""
-            resource['contentText'] = content if content else ""
-            update_resources.append(resource)
-    
-    return update_resources
-
-def main():
-    """Main entry point for the scraper."""
-    if len(sys.argv) < 2:
-        print("Usage: python main.py <search_id> [keywords...]")
-        sys.exit(1)
+async def fetch_resource_content(standardized_results, queue=None, deadline=None):
+    """
+    Extract and add content for each resource.
+    Resources from the search cache whose content blob is still stored keep it and are not
+    extracted again; the content of all others is extracted.
+    A queue that already holds prefetched extractions is reused, so they are not started again.
+    With a deadline, extractions still running when the extraction budget runs out are
+    cancelled and their resources are left without content.
+    """
+    queue = queue or ExtractionQueue(extract_resource_content)
     
-    search_id = sys.argv[1]
+    def fill_content(resource, future):
+        # Fill in each resource as soon as its extraction finishes
+        content = ""
+        if not future.cancelled() and future.exception() is None:
+            content = future.result()
+        resource['contentText'] = content if content else ""
     
-    # Get keywords from command line arguments
-    keywords = sys.argv[2:] if len(sys.argv) > 2 else []
+    # Results are sorted by relevance, so queueing in list order extracts the top results first.
+    # Resources prefetched during discovery keep the future they already have.
+    futures = []
+    for priority, resource in enumerate(standardized_results):
+        if resource.get('contentId') and has_content(resource['contentId']):
+            increment('cachedContent')
+            emit_event('content', url=resource['url'], contentId=resource['contentId'],
+                       contentLength=resource.get('contentLength', 0))
+            continue
+        resource.pop('contentId', None)
+        resource.pop('contentLength', None)
+        
+        resource['contentText'] = ""  # Until extracted; resources without valid URLs keep it empty
+        if resource['url'] != '#' and not resource['url'].startswith('file://'):
+            future = queue.submit(resource['url'], priority)
+            future.add_done_callback(lambda done, resource=resource: fill_content(resource, done))
+            futures.append(future)
     
-    # Validate inputs
-    if not search_id:
-        print("Error: Search ID is required")
-        sys.exit(1)
+    try:
+        if futures:
+            _, pending = await asyncio.wait(futures, timeout=deadline.budget('extraction') if deadline else None)
+            if pending:
+                deadline.mark_partial('extraction')
+                print(f"Extraction ran out of time, {len(pending)} resources were left without content")
+    finally:
+        queue.cancel()
     
-    if not keywords or len(keywords) == 0:
-        print("Warning: No keywords provided. Will use default educational keywords.")
-        # Provide some basic fallback keywords for educational content
-        keywords = ["educational", "learning", "homeschool", "student resources"]
+    return standardized_results
+
+async def run_search(search_id, keywords, deadline_seconds=None, send_event=None):
+    """
+    Run one complete search and store its results in the status file.
+    With a deadline (in seconds), the search returns whatever it has gathered when time runs out.
+    With send_event, progress, resources and their content are also streamed as they come in.
+    """
+    # Per-search counters, written to the status file with the results
+    metrics = start_search_metrics()
+    start_search_events(send_event)
     
-    # Log the search process
-    print(f"Starting search {search_id} with {len(keywords)} keywords")
-    print(f"Sample keywords: {', '.join(keywords[:5])}" + ("..." if len(keywords) > 5 else ""))
+    # Stage budgets and timings, also written to the status file
+    deadline = SearchDeadline(DEFAULT_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds)
     
     # Create the status file if it doesn't exist
-    status_file = os.path.join('data', 'searches', f'{search_id}.json')
-    if not os.path.exists(status_file):
-        initial_status = {
-            "id": search_id,
-            "status": "initializing",
-            "message": "Starting search...",
-            "progress": 0,
-            "startTime": datetime.now().isoformat(),
-            "keywords": keywords
-        }
-        with open(status_file, 'w') as f:
-            json.dump(initial_status, f, indent=2)
+    create_status(search_id, keywords)
     
     # Update status to scraping
     update_status(search_id, "initializing", "Starting search for educational resources based on profile interests...", 10)
     
+    async def extract_and_report(url):
+        content = await extract_resource_content(url)
+        if content:
+            emit_event('content', url=url, contentId=content_id(url), contentText=content)
+        return content
+    
+    # Shared by discovery and extraction, so top results are extracted while discovery runs
+    extraction_queue = ExtractionQueue(extract_and_report)
+    
     try:
         # Scrape resources
-        results = scrape_resources(search_id, keywords)
+        results = await scrape_resources(search_id, keywords, extraction_queue, deadline)
+        emit_event('results', results=results)
         
         # Update status to processing
         update_status(search_id, "processing", "Extracting content from resources...", 80)
         
         # Extract content from each resource
-        loop = asyncio.get_event_loop()
-        results_with_content = loop.run_until_complete(fetch_resource_content(results))
+        with deadline.stage('extraction'):
+            results_with_content = await fetch_resource_content(results, extraction_queue, deadline)
         
         # Update status to processing
         update_status(search_id, "processing", "Finalizing your personalized educational resources...", 90)
         
-        # Store results in the status file
-        with open(status_file, 'r') as f:
-            search_status = json.load(f)
+        # Store results in the status file, replacing it in one step, with their content in separate blobs
+        indexed_results = index_results(results_with_content)
+        finish_status(
+            search_id,
+            "success",
+            "Search completed with partial results (time limit reached)" if deadline.partial else "Search completed successfully!",
+            100,
+            endTime=datetime.now().isoformat(),
+            results=indexed_results,
+            metrics=metrics,
+            **deadline.summary()
+        )
         
-        search_status["status"] = "success"
-        search_status["message"] = "Search completed successfully!"
-        search_status["progress"] = 100
-        search_status["endTime"] = datetime.now().isoformat()
-        search_status["results"] = results_with_content
-        
-        with open(status_file, 'w') as f:
-            json.dump(search_status, f, indent=2)
+        # Later hits on the search cache return this content instead of extracting it again
+        store_cached_content(clean_keyword_list(keywords), indexed_results)
         
         print(f"Search completed successfully! Found {len(results_with_content)} resources.")
+        if metrics.get('blockedRequests'):
+            print(f"Blocked {metrics['blockedRequests']} subresource requests "
+                  f"(~{metrics.get('estimatedBytesSaved', 0) // 1024} KB saved)")
+        
+        return {'resources': len(results_with_content), 'partial': deadline.partial}
         
     except Exception as e:
         # Handle any unexpected errors
         print(f"Error during search: {e}")
         
+        # Stop any extractions still running for discovery
+        extraction_queue.cancel()
+        
         # Update status to error
         error_message = str(e)
-        update_status(search_id, "error", f"An error occurred: {error_message[:100]}", 0)
+        finish_status(search_id, "error", f"An error occurred: {error_message[:100]}", 0, endTime=datetime.now().isoformat())
         
+        raise
+
+async def run_search_once(search_id, keywords, deadline_seconds=None, send_event=None):
+    """Run a single search in this process and release the browser afterwards."""
+    try:
+        return await run_search(search_id, keywords, deadline_seconds, send_event)
+    finally:
+        await close_browser_pool()
+
+async def run_refresh_once(keywords):
+    """Refresh one search cache entry in this process and release the browser afterwards."""
+    try:
+        await refresh_search_cache(keywords)
+    finally:
+        await close_browser_pool()
+
+def load_batch_jobs(path):
+    """Read search jobs from a JSON lines file: one {"search_id": ..., "keywords": [...]} per line."""
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            if not job.get('search_id'):
+                raise ValueError(f"{path}:{line_number}: search_id is required")
+            jobs.append({
+                'search_id': str(job['search_id']),
+                'keywords': clean_keyword_list(job.get('keywords') or DEFAULT_KEYWORDS)
+            })
+    return jobs
+
+def reading_searches_for(keywords):
+    """The (site, keyword, grade level, writing) searches scrape_reading_resources runs for a keyword list."""
+    grade_level = get_grade_level(keywords)
+    has_writing_keywords = any('writ' in keyword.lower() for keyword in keywords)
+    reading_sites = get_reading_sites(keywords)
+    searches = []
+    for keyword in keywords:
+        # Skip very general keywords
+        if keyword.lower() in ['reading', 'writing', 'grade', 'school', 'homeschool', 'education']:
+            continue
+        for site in reading_sites:
+            searches.append((site, keyword, grade_level, has_writing_keywords))
+    return searches
+
+async def discover_batch(jobs, deadline):
+    """
+    Run the discovery of many searches at once, fetching every unique (source, query) only once:
+    one crawl over all keywords, one YouTube search per keyword and one search per reading
+    site query. Returns the raw results by source, stopping when the discovery budget runs out.
+    """
+    all_keywords = list(dict.fromkeys(keyword for job in jobs for keyword in job['keywords']))
+    crawl_items = []
+    videos = {}
+    reading = {}
+    
+    youtube_limit = asyncio.Semaphore(YOUTUBE_SEARCH_CONCURRENCY)
+    reading_limit = asyncio.Semaphore(READING_SEARCH_CONCURRENCY)
+    site_limits = {}
+    
+    async def crawl():
+        await crawl_static_sites('batch', all_keywords, emit=lambda order, item: crawl_items.append(item), deadline=deadline)
+    
+    async def youtube_search(keyword):
+        async with youtube_limit:
+            videos[keyword] = await search_youtube_keyword(keyword)
+    
+    async def reading_search(key, site, keyword, grade_level, has_writing_keywords):
+        async with site_limits.setdefault(site['name'], asyncio.Semaphore(READING_SITE_CONCURRENCY)):
+            async with reading_limit:
+                reading[key] = await search_reading_site(site, keyword, grade_level, has_writing_keywords)
+    
+    # The union of every job's fetches, each once
+    reading_queries = {}
+    for job in jobs:
+        interests = detect_interests(job['keywords'])
+        if 'reading' in interests or 'writing' in interests:
+            for site, keyword, grade_level, has_writing_keywords in reading_searches_for(job['keywords']):
+                key = (site['name'], keyword, grade_level, has_writing_keywords)
+                reading_queries.setdefault(key, (site, keyword, grade_level, has_writing_keywords))
+    
+    tasks = [asyncio.ensure_future(crawl())]
+    tasks += [asyncio.ensure_future(youtube_search(keyword)) for keyword in all_keywords]
+    tasks += [asyncio.ensure_future(reading_search(key, *query)) for key, query in reading_queries.items()]
+    print(f"Batch discovery: {len(all_keywords)} unique keywords, {len(reading_queries)} unique reading searches "
+          f"for {len(jobs)} searches")
+    increment('batchFetches', len(tasks))
+    
+    with deadline.stage('discovery'):
+        _, pending = await asyncio.wait(tasks, timeout=deadline.budget('discovery'))
+        if pending:
+            deadline.mark_partial('discovery')
+            print(f"Discovery ran out of time, {len(pending)} fetches were stopped")
+        for task in pending:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"Batch discovery fetch failed: {result}")
+    
+    return crawl_items, videos, reading
+
+def rank_batch_job(job, crawl_items, crawl_titles, videos, reading):
+    """Collect one job's results from the shared discovery, as its own search would have found them, and rank them."""
+    keywords = job['keywords']
+    
+    # Static sites: the crawled links whose title matches one of the job's keywords
+    pool = [crawl_items[index] for index in KeywordFilter(keywords).matching(crawl_titles)]
+    
+    # YouTube: the videos of the job's keywords, in keyword order
+    job_videos = [video for keyword in keywords for video in videos.get(keyword, [])]
+    pool += job_videos[:10]
+    
+    # Reading sites: the job's searches in keyword and site order, unique by URL
+    interests = detect_interests(keywords)
+    if 'reading' in interests or 'writing' in interests:
+        seen_urls = set()
+        job_reading = []
+        for site, keyword, grade_level, has_writing_keywords in reading_searches_for(keywords):
+            for resource in reading.get((site['name'], keyword, grade_level, has_writing_keywords), []):
+                if canonical_url(resource['url']) not in seen_urls:
+                    seen_urls.add(canonical_url(resource['url']))
+                    job_reading.append(resource)
+        pool += job_reading[:10]
+    
+    # Merge duplicates (the first copy wins) before ranking with filter_results
+    duplicates = DuplicateIndex()
+    unique = {}
+    for result in pool:
+        unique.setdefault(duplicates.key(result), dict(result))
+    
+    return standardize_results(filter_results(list(unique.values()), keywords))
+
+async def run_batch(jobs, deadline_seconds=None):
+    """
+    Run many searches as one: discovery and content extraction are shared by all of them and
+    only the ranking is done per search. Each search gets its status file as if run alone.
+    """
+    metrics = start_search_metrics()
+    deadline = SearchDeadline(DEFAULT_DEADLINE_SECONDS if deadline_seconds is None else deadline_seconds)
+    
+    for job in jobs:
+        create_status(job['search_id'], job['keywords'])
+        update_status(job['search_id'], "scraping", "Searching for educational resources together with other profiles...", 20)
+    
+    try:
+        # Step 1: Discover resources for all searches at once
+        crawl_items, videos, reading = await discover_batch(jobs, deadline)
+        
+        # Step 2: Rank them for every search
+        crawl_titles = [item.get('title') or '' for item in crawl_items]
+        ranked = {}
+        with deadline.stage('ranking'):
+            for job in jobs:
+                ranked[job['search_id']] = rank_batch_job(job, crawl_items, crawl_titles, videos, reading)
+                update_status(job['search_id'], "processing", "Extracting content from resources...", 80)
+        
+        # Step 3: Extract each URL once, better ranked URLs first
+        priorities = {}
+        for results in ranked.values():
+            for rank, result in enumerate(results):
+                url = result['url']
+                if url != '#' and not url.startswith('file://'):
+                    priorities[url] = min(rank, priorities.get(url, rank))
+        increment('batchExtractions', len(priorities))
+        increment('extractionsAvoided', sum(len(results) for results in ranked.values()) - len(priorities))
+        
+        contents = {}
+        with deadline.stage('extraction'):
+            if priorities:
+                queue = ExtractionQueue(extract_resource_content)
+                futures = {url: queue.submit(url, priority) for url, priority in priorities.items()}
+                try:
+                    _, pending = await asyncio.wait(futures.values(), timeout=deadline.budget('extraction'))
+                    if pending:
+                        deadline.mark_partial('extraction')
+                        print(f"Extraction ran out of time, {len(pending)} resources were left without content")
+                finally:
+                    queue.cancel()
+                for url, future in futures.items():
+                    if future.done() and not future.cancelled() and future.exception() is None:
+                        contents[url] = future.result() or ""
+        
+        # Step 4: Store every search's results, as run_search does
+        for job in jobs:
+            results = [dict(result, contentText=contents.get(result['url'], "")) for result in ranked[job['search_id']]]
+            indexed_results = index_results(results)
+            if not deadline.partial:
+                store_cached_search(job['keywords'], ranked[job['search_id']])
+                store_cached_content(job['keywords'], indexed_results)
+            finish_status(
+                job['search_id'],
+                "success",
+                "Search completed with partial results (time limit reached)" if deadline.partial else "Search completed successfully!",
+                100,
+                endTime=datetime.now().isoformat(),
+                results=indexed_results,
+                metrics=metrics,
+                batchSize=len(jobs),
+                **deadline.summary()
+            )
+        
+        print(f"Batch completed: {len(jobs)} searches, {len(priorities)} resources extracted once each")
+        return {'searches': len(jobs), 'resources': len(priorities), 'partial': deadline.partial}
+        
+    except Exception as e:
+        print(f"Error during batch search: {e}")
+        for job in jobs:
+            finish_status(job['search_id'], "error", f"An error occurred: {str(e)[:100]}", 0, endTime=datetime.now().isoformat())
+        raise
+
+async def run_batch_once(jobs, deadline_seconds=None):
+    """Run a batch of searches in this process and release the browser afterwards."""
+    try:
+        return await run_batch(jobs, deadline_seconds)
+    finally:
+        await close_browser_pool()
+
+async def run_worker_job(job, send_event):
+    """Run a search job received by the worker, streaming its events to the client if asked to."""
+    keywords = job.get('keywords') or list(DEFAULT_KEYWORDS)
+    return await run_search(job['search_id'], keywords, job.get('deadline'), send_event if job.get('stream') else None)
+
+def parse_args(argv):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Search for educational resources based on profile keywords.",
+        usage="python main.py <search_id> [keywords...]"
+    )
+    parser.add_argument('search_id', nargs='?', help="ID of the search, used to name the status file")
+    parser.add_argument('keywords', nargs='*', help="Profile keywords to search for")
+    parser.add_argument('--worker', action='store_true',
+                        help="Run as a long-lived worker that accepts search jobs over a local socket")
+    parser.add_argument('--refresh-cache', action='store_true',
+                        help="Refresh the search cache entry for the keywords and exit")
+    parser.add_argument('--inline', action='store_true',
+                        help="Run the search in this process even if a worker is running")
+    parser.add_argument('--batch', metavar='JOBS_FILE',
+                        help="Run many searches at once, sharing discovery and extraction; the file has one "
+                             "JSON job per line with a search_id and keywords")
+    parser.add_argument('--stream', action='store_true',
+                        help="Write progress, resources and content to stdout as newline-delimited JSON events")
+    parser.add_argument('--deadline', type=parse_duration, default=None,
+                        help="Time limit for the whole search, e.g. 20s; partial results are returned when it runs out")
+    parser.add_argument('--host', default=worker.DEFAULT_HOST, help="Worker host")
+    parser.add_argument('--port', type=int, default=worker.DEFAULT_PORT, help="Worker port")
+    parser.add_argument('--max-jobs', type=int, default=worker.DEFAULT_MAX_JOBS,
+                        help="Maximum number of searches a worker runs at once")
+    return parser.parse_args(argv)
+
+def main():
+    """Main entry point for the scraper."""
+    global REFRESH_IN_PROCESS
+    args = parse_args(sys.argv[1:])
+    
+    # Worker mode: keep the reactor running and serve search jobs until stopped
+    if args.worker:
+        REFRESH_IN_PROCESS = True
+        run_with_reactor(lambda: worker.serve(run_worker_job, args.host, args.port, args.max_jobs))
+        return
+    
+    # Background refresh of a stale search cache entry (the keywords include the positional)
+    if args.refresh_cache:
+        keywords = [args.search_id, *args.keywords] if args.search_id else args.keywords
+        try:
+            run_with_reactor(lambda: run_refresh_once(keywords))
+        except Exception:
+            sys.exit(1)
+        return
+    
+    # Batch mode: many searches from a jobs file in one run
+    if args.batch:
+        jobs = load_batch_jobs(args.batch)
+        try:
+            run_with_reactor(lambda: run_batch_once(jobs, args.deadline))
+        except Exception:
+            sys.exit(1)
+        return
+    
+    if args.search_id is None:
+        print("Usage: python main.py <search_id> [keywords...]")
+        sys.exit(1)
+    
+    search_id = args.search_id
+    
+    # Streaming mode: stdout carries only the JSON events, so everything else is logged to stderr
+    send_event = None
+    if args.stream:
+        send_event = ndjson_writer(sys.stdout)
+        sys.stdout = sys.stderr
+    
+    # Get keywords from command line arguments
+    keywords = args.keywords
+    
+    # Validate inputs
+    if not search_id:
+        print("Error: Search ID is required")
         sys.exit(1)
+    
+    if not keywords or len(keywords) == 0:
+        print("Warning: No keywords provided. Will use default educational keywords.")
+        keywords = list(DEFAULT_KEYWORDS)
+    
+    # Log the search process
+    print(f"Starting search {search_id} with {len(keywords)} keywords")
+    print(f"Sample keywords: {', '.join(keywords[:5])}" + ("..." if len(keywords) > 5 else ""))
+    
+    # Hand the search to a running worker if there is one, so we skip the startup cost
+    if not args.inline:
+        job = {'search_id': search_id, 'keywords': keywords, 'deadline': args.deadline, 'stream': args.stream}
+        event = worker.submit_job(job, args.host, args.port, on_event=send_event)
+        if event is not None:
+            if send_event:
+                send_event(event)
+            if event['event'] == 'error':
+                print(f"Error during search: {event.get('message')}")
+                sys.exit(1)
+            print(f"Search completed successfully! Found {event.get('resources', 0)} resources.")
+            return
+    
+    # A search answered from the cache doesn't crawl, so it doesn't need the reactor (or Scrapy)
+    run = run_without_reactor if served_from_cache(keywords) else run_with_reactor
+    
+    try:
+        summary = run(lambda: run_search_once(search_id, keywords, args.deadline, send_event))
+    except Exception as e:
+        if send_event:
+            send_event({'event': 'error', 'message': str(e)[:200]})
+        sys.exit(1)
+    
+    if send_event:
+        send_event(dict(summary or {}, event='done'))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main() 
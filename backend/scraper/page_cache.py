@@ -0,0 +1,273 @@
+"""
+HomeScraperEdu Page Cache
+-------------------------
+On-disk page cache shared by every fetcher: EduSpider (through scrapy_page_cache.py), the
+HTTP extraction fast path and the Playwright pages (through the request filter route).
+
+Pages are keyed by normalized URL. Bodies are stored gzipped and content-addressed by their
+SHA-256, so identical pages reached through different URLs are stored once. A SQLite index
+keeps the metadata needed for TTLs, ETag/Last-Modified revalidation and size-bounded LRU
+eviction. Hits, misses and revalidations are counted per cache and per search.
+"""
+
+import os
+import gzip
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from search_metrics import increment
+
+PAGE_CACHE_DIR = os.path.join('data', 'cache', 'pages')
+PAGE_CACHE_TTL = int(os.environ.get('SCRAPER_PAGE_CACHE_TTL', str(6 * 3600)))
+PAGE_CACHE_MAX_BYTES = int(os.environ.get('SCRAPER_PAGE_CACHE_MAX_MB', '512')) * 1024 * 1024
+PAGE_CACHE_ENABLED = os.environ.get('SCRAPER_PAGE_CACHE', '1') != '0'
+
+# The size of the blobs is tracked as pages are stored and evicted, and recounted from the
+# index every so many stores to pick up what other processes stored or evicted
+PAGE_CACHE_RECOUNT_EVERY = 200
+
+# Response headers worth keeping; the rest describe the transfer, not the page
+STORED_HEADERS = ('content-type', 'etag', 'last-modified', 'content-language')
+
+
+def normalize_cache_url(url):
+    """Normalize a URL into a cache key: lowercase scheme and host, no fragment, sorted query."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+class CachedPage:
+    """A page read from the cache."""
+
+    def __init__(self, url, status, headers, body, fetched_at):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.fetched_at = fetched_at
+        self.fresh = self.is_fresh()
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    @property
+    def etag(self):
+        return self.headers.get('etag')
+
+    @property
+    def last_modified(self):
+        return self.headers.get('last-modified')
+
+    def is_fresh(self, ttl=None):
+        return self.age < (PAGE_CACHE_TTL if ttl is None else ttl)
+
+    @property
+    def text(self):
+        """The body decoded with the charset from its Content-Type (UTF-8 by default)."""
+        charset = 'utf-8'
+        content_type = self.headers.get('content-type', '')
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[-1].split(';')[0].strip().strip('"') or charset
+        try:
+            return self.body.decode(charset, errors='replace')
+        except LookupError:
+            return self.body.decode('utf-8', errors='replace')
+
+    def conditional_headers(self):
+        """Request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """Content-addressed, size-bounded LRU page cache."""
+
+    def __init__(self, root=PAGE_CACHE_DIR, max_bytes=PAGE_CACHE_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'revalidated': 0, 'stored': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._db = None
+        self._total_bytes = None
+        self._stores_since_recount = 0
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.join(self.root, 'blobs'), exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(self.root, 'index.sqlite3'),
+                                       timeout=10, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('''CREATE TABLE IF NOT EXISTS pages (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )''')
+            self._db.execute('CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)')
+            self._db.commit()
+        return self._db
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self.root, 'blobs', content_hash[:2], content_hash)
+
+    def _count(self, name, metrics=None):
+        self.stats[name] += 1
+        increment(f"pageCache{name.capitalize()}", metrics=metrics)
+
+    def get(self, url):
+        """Return the cached page for a URL (fresh or not), or None. Not counted in the stats."""
+        key = normalize_cache_url(url)
+
+        with self._lock:
+            db = self._connect()
+            row = db.execute(
+                'SELECT url, content_hash, status, headers, fetched_at FROM pages WHERE url_key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            try:
+                with gzip.open(self._blob_path(row[1]), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                # Blob was evicted by another process; drop the stale index entry
+                db.execute('DELETE FROM pages WHERE url_key = ?', (key,))
+                db.commit()
+                return None
+
+            db.execute('UPDATE pages SET accessed_at = ? WHERE url_key = ?', (time.time(), key))
+            db.commit()
+
+        return CachedPage(row[0], row[2], json.loads(row[3]), body, row[4])
+
+    def lookup(self, url, ttl=None, metrics=None):
+        """
+        Look up a page for a fetch, counting a hit, a stale entry or a miss.
+        A stale page is still returned (with fresh=False) so it can be revalidated.
+        """
+        page = self.get(url)
+        if page is None:
+            self._count('misses', metrics)
+            return None
+
+        page.fresh = page.is_fresh(ttl)
+        self._count('hits' if page.fresh else 'stale', metrics)
+        return page
+
+    def put(self, url, status, headers, body):
+        """Store a fetched page. Only complete, successful responses are cached."""
+        if status != 200 or not body:
+            return
+
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+
+        key = normalize_cache_url(url)
+        content_hash = hashlib.sha256(body).hexdigest()
+        kept_headers = {name.lower(): value for name, value in headers.items() if name.lower() in STORED_HEADERS}
+        blob_path = self._blob_path(content_hash)
+        now = time.time()
+
+        with self._lock:
+            db = self._connect()
+
+            new_blob = not os.path.exists(blob_path)
+            if new_blob:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                temp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with gzip.open(temp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(temp_path, blob_path)
+
+            size = os.path.getsize(blob_path)
+            previous = db.execute('SELECT content_hash, size FROM pages WHERE url_key = ?', (key,)).fetchone()
+            db.execute('''INSERT OR REPLACE INTO pages
+                (url_key, url, content_hash, status, headers, size, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                (key, url, content_hash, status, json.dumps(kept_headers), size, now, now))
+            db.commit()
+
+            if self._total_bytes is not None and new_blob:
+                self._total_bytes += size
+            if previous and previous[0] != content_hash:
+                self._delete_unreferenced_blob(previous[0], previous[1])
+
+            self._count('stored')
+            self._evict()
+
+    def revalidated(self, url, metrics=None):
+        """Mark a cached page as fresh again after the server answered 304 Not Modified."""
+        key = normalize_cache_url(url)
+        now = time.time()
+
+        with self._lock:
+            db = self._connect()
+            db.execute('UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url_key = ?', (now, now, key))
+            db.commit()
+            self._count('revalidated', metrics)
+
+    def _delete_unreferenced_blob(self, content_hash, size):
+        """Remove a blob no page refers to any more, returning whether it was removed."""
+        db = self._connect()
+        if db.execute('SELECT 1 FROM pages WHERE content_hash = ? LIMIT 1', (content_hash,)).fetchone() is not None:
+            return False
+        try:
+            os.remove(self._blob_path(content_hash))
+        except OSError:
+            pass
+        if self._total_bytes is not None:
+            self._total_bytes -= size
+        return True
+
+    def _evict(self):
+        """Drop least recently used pages until the blobs fit into max_bytes."""
+        db = self._connect()
+        self._stores_since_recount += 1
+        if self._total_bytes is None or self._stores_since_recount >= PAGE_CACHE_RECOUNT_EVERY:
+            self._total_bytes = db.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM pages)'
+            ).fetchone()[0]
+            self._stores_since_recount = 0
+
+        while self._total_bytes > self.max_bytes:
+            rows = db.execute('SELECT url_key, content_hash, size FROM pages ORDER BY accessed_at LIMIT 50').fetchall()
+            if not rows:
+                break
+            for url_key, content_hash, size in rows:
+                db.execute('DELETE FROM pages WHERE url_key = ?', (url_key,))
+                self._delete_unreferenced_blob(content_hash, size)
+                self.stats['evicted'] += 1
+                if self._total_bytes <= self.max_bytes:
+                    break
+            db.commit()
+
+
+_page_cache = None
+
+
+def get_page_cache():
+    """Return the process-wide page cache, or None if caching is disabled."""
+    global _page_cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+    if _page_cache is None:
+        _page_cache = PageCache()
+    return _page_cache
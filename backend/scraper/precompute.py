@@ -0,0 +1,352 @@
+"""
+HomeScraperEdu Precompute Scheduler
+-----------------------------------
+Warms the search cache, page cache and extraction data for the searches most likely to come
+in, so interactive searches mostly hit warm data.
+
+The search cache is keyed by a search's whole keyword set, so that is what gets warmed: the
+most popular keyword sets, counted from the keyword lists of past searches in data/searches
+and from a local export of child profiles, whose keywords are built exactly as the search page
+builds them. They run as one batch (see main.run_batch) during an off-peak window, within a
+budget of outgoing requests. Keyword sets whose cache entry is still fresh cost nothing and
+are skipped.
+
+With --watch it keeps running: new or updated profiles in the export are warmed right away,
+and the most popular keyword sets are refreshed once per window.
+
+Usage: python precompute.py [--profiles child_profiles.json] [--top 50] [--budget 500]
+                            [--window 01:00-05:00] [--now] [--watch]
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import glob
+import asyncio
+import hashlib
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+
+import main
+from search_cache import get_cached_search, search_cache_key
+from status_store import STATUS_DIR
+
+PRECOMPUTE_TOP_N = int(os.environ.get('SCRAPER_PRECOMPUTE_TOP_N', '50'))
+PRECOMPUTE_BUDGET = int(os.environ.get('SCRAPER_PRECOMPUTE_BUDGET', '500'))
+PRECOMPUTE_WINDOW = os.environ.get('SCRAPER_PRECOMPUTE_WINDOW', '01:00-05:00')
+PRECOMPUTE_INTERVAL = int(os.environ.get('SCRAPER_PRECOMPUTE_INTERVAL', '300'))
+PRECOMPUTE_STATE_FILE = os.path.join('data', 'cache', 'precompute_state.json')
+
+# Search ids of precompute runs and cache refreshes, which are left out of the search history
+PRECOMPUTE_PREFIX = 'precompute-'
+SKIPPED_PREFIXES = (PRECOMPUTE_PREFIX, 'refresh-')
+
+# Upper bound on the extractions one search adds to a batch
+EXTRACTIONS_PER_SEARCH = 10
+
+# The main interests offered when creating a profile (INTERESTS in CreateChildProfilePage.jsx)
+PROFILE_MAIN_INTERESTS = [
+    'Math', 'Biology', 'Chemistry', 'Physics', 'Earth Science', 'Reading', 'Writing', 'History',
+    'Art', 'Music', 'Coding', 'Sports', 'Nature', 'Geography', 'Languages', 'Social Studies'
+]
+
+
+def profile_keywords(profile):
+    """
+    The keywords the search page sends for a profile: generateSearchKeywords in
+    CurriculumSearchPage.jsx, step for step (main interests, sub-interests, the math
+    extras, custom interests, then the first 20 unique ones).
+    """
+    grade = profile['grade'].lower()
+    all_interests = profile.get('interests') or []
+    keywords = []
+
+    for interest in profile.get('mainInterests') or []:
+        keywords.append(f"{grade} {interest.lower()}")
+        keywords.append(f"{interest.lower()} for {grade}")
+        keywords.append(f"{grade} {interest.lower()} curriculum")
+        keywords.append(f"{grade} {interest.lower()} lessons")
+
+    # Sub-interests are stored as "Main:Sub"
+    for full_sub_interest in profile.get('subInterests') or []:
+        parts = full_sub_interest.split(':')
+        if len(parts) < 2:
+            continue
+        main_interest, sub_interest = parts[0], parts[1]
+        keywords.append(f"{grade} {sub_interest.lower()}")
+        keywords.append(f"{sub_interest.lower()} for {grade}")
+        keywords.append(f"{grade} {main_interest.lower()} {sub_interest.lower()}")
+        keywords.append(f"{sub_interest.lower()} activities for {grade}")
+
+    if 'Math' in all_interests or 'Basic Counting' in all_interests:
+        keywords.extend([f"{grade} math", f"math for {grade}", f"{grade} math curriculum",
+                         f"{grade} math lessons", f"{grade} math worksheets"])
+
+    if 'Basic Counting' in all_interests:
+        keywords.extend([f"{grade} basic counting", f"basic counting for {grade}",
+                         f"basic counting lessons for {grade}"])
+
+    for term in (profile.get('customInterests') or '').split(','):
+        term = term.strip()
+        if term:
+            keywords.append(f"{grade} {term.lower()}")
+            keywords.append(f"{term.lower()} for {grade}")
+            keywords.append(f"{term.lower()} activities for {grade}")
+
+    return list(dict.fromkeys(keywords))[:20]
+
+
+def _parse_list(value):
+    """A list from an export cell: a JSON list, a Postgres array literal or a comma list."""
+    if isinstance(value, list):
+        return [str(item) for item in value]
+    value = (value or '').strip()
+    if value.startswith('['):
+        return [str(item) for item in json.loads(value)]
+    if value.startswith('{') and value.endswith('}'):
+        value = value[1:-1]
+    return [item.strip().strip('"') for item in value.split(',') if item.strip().strip('"')]
+
+
+def load_profile_export(path):
+    """
+    Read child profiles from a CSV, JSON or JSON lines export. Returns dicts with id, grade,
+    interests, mainInterests, subInterests, customInterests and updatedAt.
+
+    Rows from the search page's profile object carry mainInterests, subInterests ("Main:Sub")
+    and customInterests, and give the exact keywords it sends. The child_profile table only
+    stores interests (main interests, sub-interest names and the custom text in one list);
+    for those rows the main interests are recovered by name and the rest cannot be told
+    apart, so only the main interest keywords are warmed.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        elif path.endswith('.jsonl'):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = json.load(f)
+
+    profiles = []
+    for row in rows:
+        grade = (row.get('grade') or '').strip()
+        interests = _parse_list(row.get('interests'))
+        if 'mainInterests' in row:
+            main_interests = _parse_list(row.get('mainInterests'))
+        else:
+            main_interests = [interest for interest in interests if interest in PROFILE_MAIN_INTERESTS]
+        profile = {
+            'id': str(row.get('id') or ''),
+            'grade': grade,
+            'interests': interests or main_interests,
+            'mainInterests': main_interests,
+            'subInterests': _parse_list(row.get('subInterests')),
+            'customInterests': row.get('customInterests') or '',
+            'updatedAt': str(row.get('updatedAt') or row.get('updated_at') or '')
+        }
+        if grade and profile_keywords(profile):
+            profiles.append(profile)
+    return profiles
+
+
+def count_keyword_sets(keyword_lists, counts=None, examples=None):
+    """
+    Count keyword lists by search cache key, so lists that share a cache entry count as one
+    keyword set, keeping the first list seen for each.
+    """
+    counts = Counter() if counts is None else counts
+    examples = {} if examples is None else examples
+    for keywords in keyword_lists:
+        keywords = main.clean_keyword_list(keywords)
+        if keywords:
+            key = search_cache_key(keywords)
+            counts[key] += 1
+            examples.setdefault(key, keywords)
+    return counts, examples
+
+
+def history_keyword_lists(history_dir=STATUS_DIR):
+    """The keyword lists of past searches, as they were sent."""
+    for path in glob.glob(os.path.join(history_dir, '*.json')):
+        name = os.path.basename(path)
+        if name.startswith(SKIPPED_PREFIXES) or name.endswith('_scrapy.json'):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                keywords = json.load(f).get('keywords')
+        except (OSError, ValueError):
+            continue
+        if isinstance(keywords, list):
+            yield keywords
+
+
+def precompute_job(keywords):
+    """A batch job for a keyword set, named after it so reruns reuse the same status file."""
+    digest = hashlib.sha1(json.dumps(sorted(keywords)).encode('utf-8')).hexdigest()[:16]
+    return {'search_id': f'{PRECOMPUTE_PREFIX}{digest}', 'keywords': main.clean_keyword_list(keywords)}
+
+
+def plan_jobs(keyword_sets, budget):
+    """
+    Pick jobs for keyword sets, most important first, until the estimated number of outgoing
+    requests would exceed the budget. Keyword sets with a fresh cache entry are skipped.
+    Fetches shared within the batch (see main.discover_batch) are only counted once.
+    """
+    jobs = []
+    keywords_seen = set()
+    reading_seen = set()
+    used = 1  # The shared crawl
+
+    for keywords in keyword_sets:
+        cached = get_cached_search(main.clean_keyword_list(keywords))
+        if cached is not None and cached[2]:
+            continue
+
+        job = precompute_job(keywords)
+        new_keywords = set(job['keywords']) - keywords_seen
+        new_reading = set()
+        interests = main.detect_interests(job['keywords'])
+        if 'reading' in interests or 'writing' in interests:
+            new_reading = {(site['name'], keyword, grade_level, writing)
+                           for site, keyword, grade_level, writing in main.reading_searches_for(job['keywords'])}
+            new_reading -= reading_seen
+
+        cost = len(new_keywords) + len(new_reading) + EXTRACTIONS_PER_SEARCH
+        if used + cost > budget:
+            break
+
+        used += cost
+        keywords_seen |= new_keywords
+        reading_seen |= new_reading
+        jobs.append(job)
+
+    return jobs, used
+
+
+def parse_window(window):
+    """Parse an 'HH:MM-HH:MM' local time window into (start, end) minutes after midnight."""
+    match = re.match(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$', window)
+    if not match:
+        raise ValueError(f"Invalid window: {window!r}")
+    start_hour, start_minute, end_hour, end_minute = (int(part) for part in match.groups())
+    return start_hour * 60 + start_minute, end_hour * 60 + end_minute
+
+
+def seconds_until_window(window, now=None):
+    """0 inside the window (which may wrap past midnight), otherwise seconds until it opens."""
+    start, end = window
+    now = now or datetime.now()
+    minute = now.hour * 60 + now.minute
+    inside = start <= minute < end if start <= end else (minute >= start or minute < end)
+    if inside:
+        return 0
+
+    opens = now.replace(hour=start // 60, minute=start % 60, second=0, microsecond=0)
+    if opens <= now:
+        opens += timedelta(days=1)
+    return (opens - now).total_seconds()
+
+
+def _load_state():
+    try:
+        with open(PRECOMPUTE_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'profiles': {}, 'lastWindowRun': None}
+
+
+def _save_state(state):
+    os.makedirs(os.path.dirname(PRECOMPUTE_STATE_FILE), exist_ok=True)
+    temp_path = f'{PRECOMPUTE_STATE_FILE}.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(temp_path, PRECOMPUTE_STATE_FILE)
+
+
+def changed_profiles(profiles, state):
+    """Profiles that are new or changed since they were last warmed, recording them in the state."""
+    changed = []
+    for profile in profiles:
+        fingerprint = json.dumps([search_cache_key(profile_keywords(profile)), profile['updatedAt']])
+        key = profile['id'] or fingerprint
+        if state['profiles'].get(key) != fingerprint:
+            state['profiles'][key] = fingerprint
+            changed.append(profile)
+    return changed
+
+
+async def warm(keyword_sets, budget, label):
+    """Plan and run one batch of keyword sets within the budget."""
+    jobs, used = plan_jobs(keyword_sets, budget)
+    if not jobs:
+        print(f"Precompute ({label}): nothing to warm")
+        return 0
+    print(f"Precompute ({label}): warming {len(jobs)} searches, ~{used} requests of {budget}")
+    await main.run_batch(jobs)
+    return used
+
+
+def top_keyword_sets(args):
+    """The top-N keyword sets of past searches and of the profiles in the export."""
+    counts, examples = count_keyword_sets(history_keyword_lists())
+    if args.profiles and os.path.exists(args.profiles):
+        profiles = load_profile_export(args.profiles)
+        count_keyword_sets((profile_keywords(profile) for profile in profiles), counts, examples)
+    return [examples[key] for key, _ in counts.most_common(args.top)]
+
+
+async def run_scheduler(args):
+    window = parse_window(args.window)
+    state = _load_state()
+    profiles_mtime = None
+
+    try:
+        while True:
+            # New or updated profiles are warmed with their exact keyword set right away
+            if args.watch and args.profiles and os.path.exists(args.profiles):
+                mtime = os.path.getmtime(args.profiles)
+                if mtime != profiles_mtime:
+                    profiles_mtime = mtime
+                    changed = changed_profiles(load_profile_export(args.profiles), state)
+                    # On the first pass every profile counts as new; the window run covers them
+                    if changed and state.get('lastWindowRun'):
+                        await warm([profile_keywords(profile) for profile in changed], args.budget, 'profiles')
+                    _save_state(state)
+
+            # The most popular keyword sets, once per off-peak window
+            today = datetime.now().date().isoformat()
+            wait = 0 if args.now else seconds_until_window(window)
+            if wait == 0 and (args.now or state.get('lastWindowRun') != today):
+                await warm(top_keyword_sets(args), args.budget, 'popular searches')
+                state['lastWindowRun'] = today
+                _save_state(state)
+                args.now = False
+
+            if not args.watch:
+                if wait > 0:
+                    print(f"Outside the precompute window {args.window}; nothing run (use --now to run anyway)")
+                return
+
+            await asyncio.sleep(min(args.interval, wait) if wait > 0 else args.interval)
+    finally:
+        await main.close_browser_pool()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Warm caches for the most popular searches.")
+    parser.add_argument('--profiles', help="Export of child profiles (CSV, JSON or JSON lines) with grade, interests and, when available, mainInterests, subInterests and customInterests")
+    parser.add_argument('--top', type=int, default=PRECOMPUTE_TOP_N, help="Number of keyword sets to warm")
+    parser.add_argument('--budget', type=int, default=PRECOMPUTE_BUDGET, help="Maximum outgoing requests per run")
+    parser.add_argument('--window', default=PRECOMPUTE_WINDOW, help="Off-peak window in local time, e.g. 01:00-05:00")
+    parser.add_argument('--now', action='store_true', help="Warm the most popular keyword sets now, even outside the window")
+    parser.add_argument('--watch', action='store_true', help="Keep running, reacting to new or updated profiles")
+    parser.add_argument('--interval', type=int, default=PRECOMPUTE_INTERVAL, help="Seconds between checks in watch mode")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args(sys.argv[1:])
+    main.run_with_reactor(lambda: run_scheduler(arguments))
@@ -0,0 +1,167 @@
+"""
+HomeScraperEdu Ranking Stream
+-----------------------------
+Incremental top-k ranking for discovery. Instead of waiting for every source to finish and
+then ranking everything, sources emit results as they find them and each result is scored
+on arrival into a bounded top-k heap.
+
+Once the top-k is full, its weakest entry scores at least RANKING_MIN_SCORE and it has not
+changed for RANKING_STABLE_SECONDS, further results are unlikely to matter, so the sources
+that are still running can be cancelled. This cuts the tail when one site is slow.
+
+Results are ranked by score and then by their order key, which callers set to the order the
+old collect-then-sort pipeline saw them in (source, then position), so ties break the same way.
+Duplicates are results with the same key: their URL, unless the caller passes another key
+function (e.g. one that also matches other spellings of the URL).
+"""
+
+import os
+import heapq
+import asyncio
+
+RANKING_TOP_K = int(os.environ.get('SCRAPER_RANKING_TOP_K', '10'))
+RANKING_MIN_SCORE = int(os.environ.get('SCRAPER_RANKING_MIN_SCORE', '6'))
+RANKING_STABLE_SECONDS = float(os.environ.get('SCRAPER_RANKING_STABLE_SECONDS', '2'))
+
+
+def _inverted(order):
+    return tuple(-part for part in order)
+
+
+class RankingStream:
+    """Keeps the k best results seen so far, deduplicated by key (the URL by default)."""
+
+    def __init__(self, score, k=None, min_score=None, stable_seconds=None, on_enter=None, on_leave=None, key=None):
+        self.score = score
+        self.key = key or (lambda result: result.get('url'))
+        self.k = k or RANKING_TOP_K
+        self.min_score = RANKING_MIN_SCORE if min_score is None else min_score
+        self.stable_seconds = RANKING_STABLE_SECONDS if stable_seconds is None else stable_seconds
+        # Called with a result when its key enters or drops out of the top-k
+        self.on_enter = on_enter
+        self.on_leave = on_leave
+
+        self._candidates = {}
+        self._top = []
+        self._loop = asyncio.get_event_loop()
+        self._last_change = self._loop.time()
+        self._changed = asyncio.Event()
+
+    def add(self, order, result):
+        """Score a result from a source. `order` is a tuple; lower orders win ties and duplicates."""
+        if not result.get('url'):
+            return
+        key = self.key(result)
+
+        # The first source to find a resource keeps it, as the old URL deduplication did
+        existing = self._candidates.get(key)
+        if existing is not None and existing[1] <= order:
+            return
+
+        score = self.score(result)
+        if score and score > 0:
+            result['relevance_score'] = score
+        self._candidates[key] = (score, order, result)
+
+        if existing is not None and any(entry[2] == key for entry in self._top):
+            # A result in the top-k was replaced by an earlier copy of the same resource
+            self._rebuild(key, existing[2])
+            return
+
+        if not score or score <= 0:
+            return
+
+        entry = (score, _inverted(order), key)
+        dropped = None
+        if len(self._top) < self.k:
+            heapq.heappush(self._top, entry)
+        elif entry > self._top[0]:
+            dropped = heapq.heapreplace(self._top, entry)
+        else:
+            return
+
+        self._mark_changed()
+        if dropped is not None and self.on_leave:
+            self.on_leave(self._candidates[dropped[2]][2])
+        if self.on_enter:
+            self.on_enter(result)
+
+    def _rebuild(self, replaced_key=None, replaced=None):
+        entries = [(score, _inverted(order), key) for key, (score, order, _) in self._candidates.items()
+                   if score and score > 0]
+        previous = {entry[2]: self._candidates[entry[2]][2] for entry in self._top}
+        if replaced is not None:
+            previous[replaced_key] = replaced
+        self._top = heapq.nlargest(self.k, entries)
+        heapq.heapify(self._top)
+        self._mark_changed()
+
+        # A result replaced by a copy under another URL leaves, and the copy enters
+        current = {entry[2]: self._candidates[entry[2]][2] for entry in self._top}
+        changed = {key for key in previous if key in current and previous[key].get('url') != current[key].get('url')}
+        if self.on_leave:
+            for key, result in previous.items():
+                if key not in current or key in changed:
+                    self.on_leave(result)
+        if self.on_enter:
+            for key, result in current.items():
+                if key not in previous or key in changed:
+                    self.on_enter(result)
+
+    def _mark_changed(self):
+        self._last_change = self._loop.time()
+        self._changed.set()
+
+    def results(self):
+        """The current top-k results, best first."""
+        return [self._candidates[key][2] for _, _, key in sorted(self._top, reverse=True)]
+
+    def top_keys(self):
+        """Keys of the current top-k results."""
+        return [entry[2] for entry in self._top]
+
+    def _stable_in(self):
+        """Seconds until the top-k counts as settled, or None if it cannot settle yet."""
+        if len(self._top) < self.k or self._top[0][0] < self.min_score:
+            return None
+        return self.stable_seconds - (self._loop.time() - self._last_change)
+
+    def settled(self):
+        remaining = self._stable_in()
+        return remaining is not None and remaining <= 0
+
+    async def wait_settled(self):
+        """Return once the top-k is full, good enough and unchanged for stable_seconds."""
+        while True:
+            remaining = self._stable_in()
+            if remaining is not None and remaining <= 0:
+                return
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_until_settled(self, *sources):
+        """
+        Run source coroutines concurrently until they all finish or the ranking settles,
+        cancelling whatever is still running. Returns True if the ranking settled first.
+        """
+        tasks = [asyncio.ensure_future(source) for source in sources]
+        waiter = asyncio.ensure_future(self.wait_settled())
+        try:
+            remaining = set(tasks)
+            while remaining:
+                done, _ = await asyncio.wait(remaining | {waiter}, return_when=asyncio.FIRST_COMPLETED)
+                remaining -= done
+                if waiter in done and remaining:
+                    return True
+            return False
+        finally:
+            waiter.cancel()
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(waiter, *tasks, return_exceptions=True)
+            for result in results[1:]:
+                if isinstance(result, Exception):
+                    print(f"Discovery source failed: {result}")
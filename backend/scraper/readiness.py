@@ -0,0 +1,73 @@
+"""
+HomeScraperEdu Page Readiness
+-----------------------------
+Waits for a page's content to settle instead of sleeping a fixed amount of time after
+navigation. A page counts as ready as soon as one of these happens:
+
+- the text of the content area (article/main, or a site-specific selector) stops changing
+- the network goes idle
+- a site-specific "ready" selector appears
+
+Every wait is bounded by a per-page deadline, so slow pages cost at most what the old
+fixed sleeps did, while static pages that are complete on DOMContentLoaded cost almost nothing.
+"""
+
+import os
+import asyncio
+import contextlib
+
+# Default upper bound on how long we wait for a page to settle
+READY_DEADLINE_MS = int(os.environ.get('SCRAPER_READY_DEADLINE_MS', '2000'))
+
+# How often the content text is sampled
+READY_POLL_MS = 150
+
+# Ready once the content text is non-empty and has the same length on two consecutive polls.
+# State is kept on window between polls, which is reset by any new navigation.
+TEXT_SETTLED_JS = """(contentSelector) => {
+    if (document.readyState === 'loading') return false;
+    const root = (contentSelector && document.querySelector(contentSelector)) ||
+                 document.querySelector('article') ||
+                 document.querySelector('main') ||
+                 document.body;
+    const length = root ? root.textContent.length : 0;
+    const state = window.__contentSettle || (window.__contentSettle = { length: -1 });
+    const settled = length > 0 && length === state.length;
+    state.length = length;
+    return settled;
+}"""
+
+
+async def wait_until_ready(page, deadline_ms=None, content_selector=None, ready_selector=None):
+    """
+    Wait until the page content has settled or the deadline passes.
+    Returns the name of the signal that made the page ready ('text', 'network',
+    'selector') or 'deadline' if none did in time.
+    """
+    deadline_ms = deadline_ms or READY_DEADLINE_MS
+
+    checks = {
+        'text': page.wait_for_function(
+            TEXT_SETTLED_JS, arg=content_selector, polling=READY_POLL_MS, timeout=deadline_ms
+        ),
+        'network': page.wait_for_load_state('networkidle', timeout=deadline_ms),
+    }
+    if ready_selector:
+        checks['selector'] = page.wait_for_selector(ready_selector, timeout=deadline_ms)
+
+    tasks = {asyncio.ensure_future(check): name for name, check in checks.items()}
+
+    try:
+        while tasks:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks.pop(task)
+                if not task.cancelled() and task.exception() is None:
+                    return name
+        # Every check timed out or failed
+        return 'deadline'
+    finally:
+        for task in tasks:
+            task.cancel()
+        with contextlib.suppress(Exception):
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,178 @@
+"""
+HomeScraperEdu Request Policy
+-----------------------------
+Request interception for the pages the scraper opens. We only read text, links and a few
+YouTube metadata nodes, so images, fonts, video and ad/analytics scripts are dropped before
+they are downloaded. Each source has its own allow/deny policy: YouTube needs some of its
+own scripts to render results, plain article sites need far less.
+
+Page documents are also served through the shared page cache (page_cache.py), so a page
+fetched by the browser is reused by later searches and revalidated when it goes stale.
+
+Policies can be overridden with a JSON file named by SCRAPER_REQUEST_POLICIES, using the
+same keys as REQUEST_POLICIES below.
+"""
+
+import os
+import json
+import asyncio
+from urllib.parse import urlparse
+
+from page_cache import get_page_cache
+from search_metrics import current_metrics, increment
+
+# Hosts that only ever serve ads, analytics or tracking
+DENY_HOSTS = [
+    'doubleclick.net', 'googlesyndication.com', 'google-analytics.com', 'googletagmanager.com',
+    'googleadservices.com', 'adservice.google.com', 'facebook.net', 'connect.facebook.com',
+    'hotjar.com', 'amazon-adsystem.com', 'scorecardresearch.com', 'quantserve.com',
+    'taboola.com', 'outbrain.com', 'criteo.com', 'adsrvr.org', 'pinterest.com', 'addthis.com',
+    'sharethis.com', 'newrelic.com', 'nr-data.net', 'segment.io', 'optimizely.com', 'clarity.ms'
+]
+
+REQUEST_POLICIES = {
+    # YouTube search and watch pages render with YouTube's own scripts and API calls
+    'youtube': {
+        'block_types': ['image', 'media', 'font', 'stylesheet'],
+        'allow_hosts': ['youtube.com', 'ytimg.com', 'ggpht.com', 'googleapis.com', 'gstatic.com'],
+        'block_third_party': True
+    },
+    # Site search result pages, which sometimes render their results client side
+    'search': {
+        'block_types': ['image', 'media', 'font', 'stylesheet'],
+        'allow_hosts': [],
+        'block_third_party': True
+    },
+    # Article and resource pages: text only, first-party scripts for client-rendered pages
+    'article': {
+        'block_types': ['image', 'media', 'font', 'stylesheet', 'websocket', 'eventsource', 'manifest'],
+        'allow_hosts': [],
+        'block_third_party': True
+    }
+}
+
+# Rough average transfer sizes, used to estimate the bytes saved by blocked requests
+AVERAGE_BYTES = {
+    'image': 40000,
+    'media': 500000,
+    'font': 35000,
+    'stylesheet': 25000,
+    'script': 60000,
+    'document': 50000
+}
+DEFAULT_AVERAGE_BYTES = 10000
+
+
+def load_request_policies():
+    """Return the request policies, with overrides from SCRAPER_REQUEST_POLICIES applied."""
+    policies = {name: dict(policy) for name, policy in REQUEST_POLICIES.items()}
+
+    override_file = os.environ.get('SCRAPER_REQUEST_POLICIES')
+    if override_file and os.path.exists(override_file):
+        with open(override_file, 'r') as f:
+            for name, policy in json.load(f).items():
+                policies.setdefault(name, {}).update(policy)
+
+    return policies
+
+
+def site_domain(host):
+    """Reduce a host name to the site it belongs to (www.sciencekids.co.nz -> sciencekids.co.nz)."""
+    parts = host.lower().split('.')
+    if len(parts) > 2 and len(parts[-1]) == 2 and parts[-2] in ('co', 'com', 'org', 'net', 'ac', 'gov', 'edu'):
+        return '.'.join(parts[-3:])
+    return '.'.join(parts[-2:])
+
+
+def host_matches(host, domains):
+    """Check whether a host is one of the domains or a subdomain of one."""
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+class RequestFilter:
+    """Route handler that aborts requests the policy does not allow and caches page documents."""
+
+    def __init__(self, policy_name, page, metrics=None):
+        self.policy = _policies.get(policy_name) or _policies['article']
+        self.page = page
+        self.cache = get_page_cache()
+        # Route handlers run outside the search's context, so hold on to its counters
+        self.metrics = metrics if metrics is not None else current_metrics()
+
+    def should_block(self, request):
+        """Decide whether a request should be dropped."""
+        # Never block the page itself
+        if request.is_navigation_request() and request.frame == self.page.main_frame:
+            return False
+
+        host = (urlparse(request.url).hostname or '').lower()
+        if not host:
+            return False
+
+        if host_matches(host, DENY_HOSTS):
+            return True
+
+        if request.resource_type in self.policy.get('block_types', []):
+            return True
+
+        if self.policy.get('block_third_party'):
+            page_host = (urlparse(self.page.url).hostname or '').lower()
+            if page_host and site_domain(host) != site_domain(page_host):
+                return not host_matches(host, self.policy.get('allow_hosts', []))
+
+        return False
+
+    async def serve_document(self, route):
+        """
+        Answer a page navigation from the page cache, fetching and storing it when needed.
+        The cache's SQLite and gzip work runs in a thread, off the event loop.
+        """
+        request = route.request
+        cached = await asyncio.to_thread(self.cache.lookup, request.url, metrics=self.metrics)
+
+        if cached is not None and cached.fresh:
+            await route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
+            return
+
+        headers = dict(request.headers)
+        if cached is not None:
+            headers.update(cached.conditional_headers())
+
+        try:
+            # Redirects are left to the browser, so the page ends up at (and is cached under) its final URL
+            response = await route.fetch(headers=headers, max_redirects=0)
+        except Exception:
+            # Let the browser try on its own; errors surface through page.goto
+            await route.continue_()
+            return
+
+        if response.status == 304 and cached is not None:
+            await asyncio.to_thread(self.cache.revalidated, request.url, metrics=self.metrics)
+            await route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
+            return
+
+        if 300 <= response.status < 400:
+            await route.fulfill(response=response)
+            return
+
+        body = await response.body()
+        if response.url == request.url:
+            await asyncio.to_thread(self.cache.put, request.url, response.status, response.headers, body)
+        await route.fulfill(response=response, body=body)
+
+    async def handle(self, route):
+        request = route.request
+        if self.cache is not None and request.method == 'GET' and \
+                request.is_navigation_request() and request.frame == self.page.main_frame:
+            await self.serve_document(route)
+        elif self.should_block(request):
+            increment('blockedRequests', metrics=self.metrics)
+            increment('estimatedBytesSaved',
+                      AVERAGE_BYTES.get(request.resource_type, DEFAULT_AVERAGE_BYTES),
+                      metrics=self.metrics)
+            await route.abort()
+        else:
+            await route.continue_()
+
+
+_policies = load_request_policies()
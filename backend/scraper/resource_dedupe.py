@@ -0,0 +1,199 @@
+"""
+HomeScraperEdu Resource Dedupe
+------------------------------
+Recognizes the same resource found under different URLs, so it is ranked and extracted once.
+
+- canonical_url normalizes a URL into a key: lowercase host without www/m prefixes, no
+  fragment, default port or trailing slash, tracking parameters dropped and the rest sorted,
+  with per-host allowlists of the parameters that matter. YouTube URLs (watch, youtu.be,
+  shorts, embed) all map to one key per video id.
+- DuplicateIndex also merges near-duplicates with different URLs: results on the same host
+  whose title and description have (nearly) the same SimHash and mention the same numbers,
+  such as one lesson reachable under two paths of a site. Lessons of a series ("Lesson 3",
+  "Lesson 4") differ in their numbers and stay apart. Candidates are found with banded
+  lookups instead of comparing against every result.
+"""
+
+import re
+import hashlib
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'ref', 'ref_src', 'referrer',
+    'source', 'spm', 'si', 'pp', 'feature', 'ab_channel', '_ga', '_gl', 'yclid', 'trk', 'share'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'hsa_')
+
+# Hosts where only these parameters identify the page (everything else is dropped)
+HOST_PARAM_ALLOWLIST = {
+    'youtube.com': {'v', 'list'},
+    'pbskids.org': set(),
+    'khanacademy.org': set(),
+    'education.com': {'page'},
+    'teacherspayteachers.com': {'page'},
+}
+
+YOUTUBE_HOSTS = {'youtube.com', 'youtu.be', 'youtube-nocookie.com'}
+YOUTUBE_PATH_ID = re.compile(r'^/(?:shorts|embed|live|v)/([\w-]{11})')
+
+# Near-duplicates differ in at most this many of the 64 SimHash bits. Splitting the hash into
+# NEAR_DUPLICATE_BITS + 1 bands guarantees that two such hashes share at least one band.
+NEAR_DUPLICATE_BITS = 3
+SIMHASH_BANDS = NEAR_DUPLICATE_BITS + 1
+SIMHASH_BAND_WIDTH = 64 // SIMHASH_BANDS
+
+# Shorter texts hash too coarsely to tell resources apart
+MIN_SIMHASH_TOKENS = 6
+
+_TOKEN = re.compile(r'\w+')
+_NUMBER = re.compile(r'\d+')
+
+
+def _host(netloc):
+    host = netloc.rsplit('@', 1)[-1].lower()
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return host
+
+
+def youtube_video_id(url):
+    """Return the video id of a YouTube URL, or None."""
+    parts = urlsplit(url)
+    host = _host(parts.netloc)
+    if host not in YOUTUBE_HOSTS:
+        return None
+    if host == 'youtu.be':
+        video_id = parts.path.strip('/').split('/')[0]
+        return video_id or None
+    match = YOUTUBE_PATH_ID.match(parts.path)
+    if match:
+        return match.group(1)
+    for name, value in parse_qsl(parts.query):
+        if name == 'v' and value:
+            return value
+    return None
+
+
+def canonical_url(url):
+    """Normalize a URL into a key that is the same for every variant of one resource."""
+    if not url:
+        return url
+
+    video_id = youtube_video_id(url)
+    if video_id:
+        return f'youtube:{video_id}'
+
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ('http', 'https'):
+        return url
+
+    host = _host(parts.netloc)
+    path = re.sub(r'/{2,}', '/', parts.path)
+    if path.endswith('/'):
+        path = path.rstrip('/')
+    for suffix in ('/index.html', '/index.htm', '/index.php'):
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+
+    allowed = HOST_PARAM_ALLOWLIST.get(host)
+    params = []
+    for name, value in parse_qsl(parts.query, keep_blank_values=True):
+        lowered = name.lower()
+        if allowed is not None:
+            if lowered in allowed:
+                params.append((name, value))
+        elif lowered not in TRACKING_PARAMS and not lowered.startswith(TRACKING_PREFIXES):
+            params.append((name, value))
+
+    query = urlencode(sorted(params))
+    return f'{host}{path}' + (f'?{query}' if query else '')
+
+
+def _token_hash(token):
+    return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(text):
+    """64-bit SimHash of the words and word pairs of a text, or None if it is too short."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < MIN_SIMHASH_TOKENS:
+        return None
+
+    features = tokens + [f'{first} {second}' for first, second in zip(tokens, tokens[1:])]
+    weights = [0] * 64
+    for feature in features:
+        value = _token_hash(feature)
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    result = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            result |= 1 << bit
+    return result
+
+
+class DuplicateIndex:
+    """Assigns results a key that is shared by duplicates: the same canonical URL or near-identical text."""
+
+    def __init__(self, near_duplicates=True):
+        self.near_duplicates = near_duplicates
+        self.urls = {}
+        self._canonical = {}
+        self._hashes = {}
+        self._numbers = {}
+        self._bands = {}
+
+    def key(self, result):
+        """Return the duplicate key of a result."""
+        url = result.get('url')
+        canonical = canonical_url(url)
+        key = self._canonical.get(canonical)
+
+        if key is None:
+            key = canonical
+            # Videos are told apart by their id alone; similar titles are usually a series
+            if self.near_duplicates and not canonical.startswith('youtube:'):
+                key = self._near_duplicate(result) or canonical
+            self._canonical[canonical] = key
+
+        self.urls.setdefault(key, set()).add(url)
+        return key
+
+    def _near_duplicate(self, result):
+        """
+        Key of an earlier result on the same host with nearly the same text and the same
+        numbers in it, registering this one otherwise.
+        """
+        text = f"{result.get('title', '')} {result.get('description', '')}"
+        value = simhash(text)
+        if value is None:
+            return None
+
+        key = canonical_url(result.get('url'))
+        host = key.split('/', 1)[0].split('?', 1)[0]
+        numbers = _NUMBER.findall(text)
+
+        # Bands are looked up per host, so only results from the same site are compared
+        bands = [(host, band, value >> (band * SIMHASH_BAND_WIDTH) & ((1 << SIMHASH_BAND_WIDTH) - 1))
+                 for band in range(SIMHASH_BANDS)]
+        for band in bands:
+            for candidate in self._bands.get(band, ()):
+                if self._numbers[candidate] == numbers and \
+                        bin(self._hashes[candidate] ^ value).count('1') <= NEAR_DUPLICATE_BITS:
+                    return candidate
+
+        self._hashes[key] = value
+        self._numbers[key] = numbers
+        for band in bands:
+            self._bands.setdefault(band, []).append(key)
+        return None
+
+    def merged_count(self, keys=None):
+        """How many results were merged into others, over all keys or the given ones."""
+        keys = self.urls if keys is None else keys
+        return sum(len(self.urls.get(key, ())) - 1 for key in keys)
@@ -0,0 +1,116 @@
+"""
+HomeScraperEdu Scrapy Page Cache
+--------------------------------
+Scrapy HTTP cache storage and policy backed by the shared page cache (page_cache.py),
+so EduSpider reads and writes the same entries as the HTTP and Playwright fetchers.
+The cache middleware runs in the reactor's thread pool, so the cache's SQLite and gzip work
+stays off the event loop that also drives the browser.
+
+Enable with the settings returned by page_cache_settings().
+"""
+
+import contextvars
+
+from twisted.internet.threads import deferToThread
+from scrapy.downloadermiddlewares.httpcache import HttpCacheMiddleware
+from scrapy.extensions.httpcache import RFC2616Policy
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+
+from page_cache import get_page_cache, PAGE_CACHE_TTL
+
+
+class PageCachePolicy(RFC2616Policy):
+    """
+    Serve cached pages within our own TTL, whatever caching headers the site sends
+    (search pages usually say no-cache). Stale pages are revalidated with
+    If-None-Match/If-Modified-Since and reused when the server answers 304.
+    """
+
+    def should_cache_response(self, response, request):
+        return response.status == 200
+
+    def is_cached_response_fresh(self, cachedresponse, request):
+        age = getattr(cachedresponse, 'page_cache_age', None)
+        if age is not None and age < PAGE_CACHE_TTL:
+            return True
+
+        # Stale: ask the server whether the page changed
+        self._set_conditional_validators(request, cachedresponse)
+        return False
+
+    def is_cached_response_valid(self, cachedresponse, response, request):
+        valid = super().is_cached_response_valid(cachedresponse, response, request)
+        if valid and response.status == 304:
+            get_page_cache().revalidated(request.url)
+        return valid
+
+
+class PageCacheStorage:
+    """Scrapy cache storage reading and writing the shared page cache."""
+
+    def __init__(self, settings):
+        self.cache = get_page_cache()
+
+    def open_spider(self, spider):
+        pass
+
+    def close_spider(self, spider):
+        pass
+
+    def retrieve_response(self, spider, request):
+        """Return the cached response for a request, or None if it is not cached."""
+        if self.cache is None or request.method != 'GET':
+            return None
+
+        page = self.cache.lookup(request.url)
+        if page is None:
+            return None
+
+        headers = Headers(page.headers)
+        respcls = responsetypes.from_args(headers=headers, url=page.url, body=page.body)
+        response = respcls(url=page.url, headers=headers, status=page.status, body=page.body)
+        # Scrapy responses have no field for the cache age, so attach it for the policy
+        response.page_cache_age = page.age
+        return response
+
+    def store_response(self, spider, request, response):
+        """Store a downloaded response in the shared cache."""
+        if self.cache is None or request.method != 'GET':
+            return
+
+        headers = {
+            name.decode('latin-1'): response.headers.get(name).decode('latin-1')
+            for name in response.headers.keys()
+        }
+        self.cache.put(request.url, response.status, headers, response.body)
+
+
+class ThreadedHttpCacheMiddleware(HttpCacheMiddleware):
+    """
+    Scrapy's HTTP cache middleware with its cache lookups and stores (and the policy checks
+    that revalidate entries) run in a thread, with the context of the call carried along as
+    a direct call would see it.
+    """
+
+    def process_request(self, request, spider):
+        return deferToThread(contextvars.copy_context().run, super().process_request, request, spider)
+
+    def process_response(self, request, response, spider):
+        return deferToThread(contextvars.copy_context().run, super().process_response, request, response, spider)
+
+
+def page_cache_settings():
+    """Scrapy settings that route EduSpider's HTTP cache through the shared page cache."""
+    if get_page_cache() is None:
+        return {}
+
+    return {
+        'HTTPCACHE_ENABLED': True,
+        'HTTPCACHE_STORAGE': PageCacheStorage,
+        'HTTPCACHE_POLICY': PageCachePolicy,
+        'DOWNLOADER_MIDDLEWARES': {
+            'scrapy.downloadermiddlewares.httpcache.HttpCacheMiddleware': None,
+            ThreadedHttpCacheMiddleware: 900,
+        },
+    }
@@ -0,0 +1,142 @@
+"""
+HomeScraperEdu Search Cache
+---------------------------
+Caches ranked search results by keyword set, so families with overlapping interests (or a
+parent re-running a search) don't trigger a full scrape. The key is the normalized keyword
+set: case-folded, stripped, deduplicated and order-independent.
+
+Entries younger than SEARCH_CACHE_FRESH_SECONDS are served as they are. Older entries, up to
+SEARCH_CACHE_MAX_STALE_SECONDS, are served while a background refresh replaces them.
+
+Once a search has extracted its results' content, the entry also records each result's
+content blob (contentId, contentLength; see content_store.py), so a cache hit can return the
+stored content instead of extracting every page again.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+SEARCH_CACHE_DIR = os.path.join('data', 'cache', 'searches')
+SEARCH_CACHE_FRESH_SECONDS = int(os.environ.get('SCRAPER_SEARCH_CACHE_FRESH', str(15 * 60)))
+SEARCH_CACHE_MAX_STALE_SECONDS = int(os.environ.get('SCRAPER_SEARCH_CACHE_MAX_STALE', str(24 * 3600)))
+# A refresh that has not finished after this long is assumed to have died
+SEARCH_CACHE_REFRESH_TIMEOUT = 10 * 60
+SEARCH_CACHE_ENABLED = os.environ.get('SCRAPER_SEARCH_CACHE', '1') != '0'
+
+
+def normalize_keyword_set(keywords):
+    """Case-fold, strip and deduplicate keywords into a sorted list."""
+    return sorted({keyword.strip().casefold() for keyword in keywords if keyword and keyword.strip()})
+
+
+def search_cache_key(keywords):
+    """Stable cache key for a keyword set."""
+    normalized = json.dumps(normalize_keyword_set(keywords))
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(SEARCH_CACHE_DIR, f'{key}.json')
+
+
+def get_cached_search(keywords):
+    """
+    Return (results, age_seconds, is_fresh) for a keyword set,
+    or None if there is no entry or it is too old to serve.
+    """
+    if not SEARCH_CACHE_ENABLED:
+        return None
+
+    path = _entry_path(search_cache_key(keywords))
+    try:
+        with open(path, 'r') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    age = time.time() - entry.get('storedAt', 0)
+    if age > SEARCH_CACHE_MAX_STALE_SECONDS:
+        return None
+
+    return entry.get('results', []), age, age <= SEARCH_CACHE_FRESH_SECONDS
+
+
+def store_cached_search(keywords, results):
+    """Store the ranked results for a keyword set."""
+    if not SEARCH_CACHE_ENABLED:
+        return
+
+    os.makedirs(SEARCH_CACHE_DIR, exist_ok=True)
+    _write_entry(_entry_path(search_cache_key(keywords)), {
+        'keywords': normalize_keyword_set(keywords),
+        'storedAt': time.time(),
+        'results': results
+    })
+
+
+def store_cached_content(keywords, results):
+    """
+    Record the content blobs (contentId, contentLength) of extracted results in the cache entry
+    for a keyword set, matched by URL. The entry keeps its age, and is not rewritten if
+    nothing changed.
+    """
+    if not SEARCH_CACHE_ENABLED:
+        return
+
+    path = _entry_path(search_cache_key(keywords))
+    try:
+        with open(path, 'r') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return
+
+    blobs = {result['url']: (result['contentId'], result['contentLength'])
+             for result in results if result.get('contentId')}
+    changed = False
+    for result in entry.get('results', []):
+        blob = blobs.get(result.get('url'))
+        if blob is not None and (result.get('contentId'), result.get('contentLength')) != blob:
+            result['contentId'], result['contentLength'] = blob
+            changed = True
+
+    if changed:
+        _write_entry(path, entry)
+
+
+def _write_entry(path, entry):
+    # Write to a temporary file first so readers never see a partial entry
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(entry, f)
+    os.replace(temp_path, path)
+
+
+def claim_refresh(keywords):
+    """
+    Mark a keyword set as being refreshed. Returns False if another refresh is already
+    running, so concurrent stale hits trigger only one. Abandoned claims expire.
+    """
+    os.makedirs(SEARCH_CACHE_DIR, exist_ok=True)
+    marker = _entry_path(search_cache_key(keywords)) + '.refreshing'
+
+    try:
+        if time.time() - os.path.getmtime(marker) > SEARCH_CACHE_REFRESH_TIMEOUT:
+            os.remove(marker)
+    except OSError:
+        pass
+
+    try:
+        os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+    return True
+
+
+def release_refresh(keywords):
+    """Clear the refresh marker for a keyword set."""
+    try:
+        os.remove(_entry_path(search_cache_key(keywords)) + '.refreshing')
+    except OSError:
+        pass
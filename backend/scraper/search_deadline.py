@@ -0,0 +1,81 @@
+"""
+HomeScraperEdu Search Deadline
+------------------------------
+Search-wide time limit, split into budgets for the stages of a search: discovery, ranking
+and content extraction. Each stage ends at a fixed share of the deadline, so time a stage
+does not use rolls over to the next one. A stage that runs out of budget stops its own work
+and the search returns whatever was gathered by then, marked as partial.
+
+Stage timings are recorded for every search, with or without a deadline.
+"""
+
+import os
+import re
+import time
+import contextlib
+
+# Default deadline in seconds when none is given on the command line (0 = no deadline)
+DEFAULT_DEADLINE_SECONDS = float(os.environ.get('SCRAPER_DEADLINE', '0'))
+
+# Where each stage ends, as a share of the deadline. The rest is kept for writing the results.
+STAGE_ENDS = {
+    'discovery': float(os.environ.get('SCRAPER_DISCOVERY_SHARE', '0.55')),
+    'ranking': float(os.environ.get('SCRAPER_RANKING_SHARE', '0.6')),
+    'extraction': float(os.environ.get('SCRAPER_EXTRACTION_SHARE', '0.95')),
+}
+
+_DURATION = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*$')
+_UNIT_SECONDS = {'ms': 0.001, 's': 1, 'm': 60}
+
+
+def parse_duration(value):
+    """Parse a duration like '20s', '1.5m', '800ms' or '20' (seconds) into seconds."""
+    match = _DURATION.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return float(match.group(1)) * _UNIT_SECONDS[match.group(2) or 's']
+
+
+class SearchDeadline:
+    """Stage budgets and timings for one search. A deadline of None or 0 means no limit."""
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds or None
+        self.started = time.monotonic()
+        self.timings = {}
+        self.partial_stages = []
+
+    def budget(self, stage):
+        """Seconds left for a stage, or None without a deadline. Never negative."""
+        if self.seconds is None:
+            return None
+        stage_end = self.started + self.seconds * STAGE_ENDS[stage]
+        return max(0.0, stage_end - time.monotonic())
+
+    def mark_partial(self, stage):
+        """Record that a stage ran out of budget and stopped early."""
+        if stage not in self.partial_stages:
+            self.partial_stages.append(stage)
+
+    @property
+    def partial(self):
+        return bool(self.partial_stages)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a stage of the search."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.timings[name] = round(self.timings.get(name, 0) + time.monotonic() - start, 3)
+
+    def summary(self):
+        """Fields for the status file."""
+        timings = dict(self.timings, total=round(time.monotonic() - self.started, 3))
+        summary = {'partial': self.partial, 'timings': timings}
+        if self.seconds is not None:
+            summary['deadlineSeconds'] = self.seconds
+        if self.partial_stages:
+            summary['partialStages'] = list(self.partial_stages)
+        return summary
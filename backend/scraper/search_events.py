@@ -0,0 +1,41 @@
+"""
+HomeScraperEdu Search Events
+----------------------------
+Progress events for streaming a search while it runs: stage progress, each resource as it
+enters the top results (and leaves them again), each resource's content as it is extracted,
+and the final ranked results. With `main.py --stream` they are written to stdout as
+newline-delimited JSON; in worker mode they are relayed to the client over the job socket.
+
+Like the search metrics, the event sink lives in a context variable, so concurrent searches
+in a worker each send to their own client. Outside a streaming search, emitting does nothing.
+"""
+
+import json
+import contextvars
+
+_current_sink = contextvars.ContextVar('search_events', default=None)
+
+
+def start_search_events(send):
+    """Send the events of the search running in the current context to send(event), or drop them if None."""
+    _current_sink.set(send)
+
+
+def streaming():
+    """Whether the current search streams its events."""
+    return _current_sink.get() is not None
+
+
+def emit_event(event, **fields):
+    """Send an event of the current search, if it streams them."""
+    send = _current_sink.get()
+    if send is not None:
+        send({'event': event, **fields})
+
+
+def ndjson_writer(stream):
+    """An event sink writing one JSON line per event to a text stream, flushed right away."""
+    def send(event):
+        stream.write(json.dumps(event) + '\n')
+        stream.flush()
+    return send
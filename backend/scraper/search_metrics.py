@@ -0,0 +1,33 @@
+"""
+HomeScraperEdu Search Metrics
+-----------------------------
+Counters for the search that is currently running (requests blocked, bytes saved, ...).
+The counters live in a context variable, so concurrent searches in a worker each get
+their own, and every task started by a search inherits them. They are written to the
+search's status file when it finishes.
+"""
+
+import contextvars
+
+_current_metrics = contextvars.ContextVar('search_metrics', default=None)
+
+
+def start_search_metrics():
+    """Start a fresh set of counters for the search running in the current context."""
+    metrics = {}
+    _current_metrics.set(metrics)
+    return metrics
+
+
+def current_metrics():
+    """Return the counters of the current search, or a throwaway dict outside a search."""
+    metrics = _current_metrics.get()
+    return metrics if metrics is not None else {}
+
+
+def increment(name, amount=1, metrics=None):
+    """Add to a counter of the current search (or of the given counters)."""
+    if metrics is None:
+        metrics = _current_metrics.get()
+    if metrics is not None:
+        metrics[name] = metrics.get(name, 0) + amount
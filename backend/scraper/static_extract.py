@@ -0,0 +1,312 @@
+"""
+HomeScraperEdu Static Extraction
+--------------------------------
+HTTP-only fast path for content extraction. Most educational sites serve their article text
+in the static HTML, so we fetch the page with a pooled HTTP session and run the same
+article/main/headings/lists/paragraphs/definitions extraction as the browser path, in Python.
+
+The browser is only needed when the static result is too thin (pages rendered client side).
+Which path worked is remembered per domain, so later searches go straight to the right one.
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import asyncio
+import threading
+
+from browser_pool import USER_AGENT
+from extraction_queue import url_host
+from page_cache import get_page_cache
+
+# Static results shorter than this are treated as thin and retried in the browser
+MIN_STATIC_CONTENT_LENGTH = int(os.environ.get('SCRAPER_MIN_STATIC_CONTENT', '400'))
+
+HTTP_TIMEOUT = 10
+
+# <meta charset="..."> or <meta http-equiv="Content-Type" content="text/html; charset=...">
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+EXTRACTION_PATHS_FILE = os.path.join('data', 'extraction_paths.json')
+# Per-domain counts halve over this many days, so a site that changes how it renders is re-learned
+EXTRACTION_PATHS_HALF_LIFE = float(os.environ.get('SCRAPER_EXTRACTION_PATHS_HALF_LIFE_DAYS', '7')) * 86400
+# Recorded paths are written out at most this often (in seconds), and when the process exits
+EXTRACTION_PATHS_SAVE_INTERVAL = 30
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Return the shared HTTP session, whose connection pool is reused across requests."""
+    global _session
+    # requests and BeautifulSoup are imported on first use, keeping them out of startup
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=1)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+            _session.headers.update({
+                'User-Agent': USER_AGENT,
+                'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9'
+            })
+        return _session
+
+
+def fetch_html_sync(url):
+    """
+    Fetch a page over HTTP, through the shared page cache.
+    Returns the HTML, or None if it is not an HTML page.
+    """
+    cache = get_page_cache()
+    cached = cache.lookup(url) if cache is not None else None
+    if cached is not None and cached.fresh:
+        return cached_html(cached)
+
+    # Revalidate stale pages instead of downloading them again
+    headers = cached.conditional_headers() if cached is not None else {}
+    response = get_http_session().get(url, timeout=HTTP_TIMEOUT, headers=headers)
+
+    if response.status_code == 304 and cached is not None:
+        cache.revalidated(url)
+        return cached_html(cached)
+
+    if response.status_code != 200:
+        return None
+    if 'html' not in response.headers.get('Content-Type', ''):
+        return None
+
+    if cache is not None:
+        cache.put(url, response.status_code, response.headers, response.content)
+    return decode_html(response.content, response.headers.get('Content-Type', ''))
+
+
+def cached_html(page):
+    """The HTML of a cached page, or None if it is not an HTML page."""
+    content_type = page.headers.get('content-type', '')
+    return decode_html(page.body, content_type) if 'html' in content_type else None
+
+
+def decode_html(body, content_type):
+    """
+    The text of an HTML page. Without a charset in its Content-Type, requests would decode it
+    as ISO-8859-1; like a browser, use the page's <meta> charset instead, then UTF-8 (what
+    most such pages are), and only then an encoding detected from the content.
+    """
+    charsets = []
+    if 'charset=' in content_type.lower():
+        charsets.append(content_type.lower().split('charset=')[-1].split(';')[0].strip().strip('"\''))
+    match = META_CHARSET.search(body[:2048])
+    if match:
+        charsets.append(match.group(1).decode('ascii'))
+
+    for charset in charsets:
+        try:
+            return body.decode(charset, errors='replace')
+        except LookupError:
+            continue
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError:
+        from requests.compat import chardet
+        return body.decode(chardet.detect(body)['encoding'] or 'utf-8', errors='replace')
+
+
+async def fetch_html(url):
+    """Fetch a page over HTTP without blocking the event loop."""
+    return await asyncio.to_thread(fetch_html_sync, url)
+
+
+def clean_text(text):
+    """Collapse whitespace, like cleanText in the browser extraction script."""
+    if not text:
+        return ''
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _inside(element, names):
+    return element.find_parent(names) is not None
+
+
+def extract_text_from_html(html):
+    """
+    Extract meaningful content - article, lists, headings - from static HTML.
+    Mirrors the script run by extract_resource_content in the browser.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Scripts and styles are never visible text
+    for element in soup(['script', 'style', 'noscript', 'template']):
+        element.decompose()
+
+    extracted_content = []
+
+    # Try to find article content first (usually most relevant)
+    for article in soup.find_all('article'):
+        extracted_content.append(clean_text(article.get_text()))
+
+    # Get main content if no articles found
+    if not extracted_content:
+        main_content = soup.find('main')
+        if main_content:
+            extracted_content.append(clean_text(main_content.get_text()))
+
+    # Extract headings, very valuable for educational content structure
+    heading_texts = []
+    for heading in soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+        # Skip very short headings or navigation headings
+        heading_text = clean_text(heading.get_text())
+        if len(heading_text) > 3 and heading_text.lower() not in ['menu', 'navigation', 'search']:
+            heading_texts.append(f"Heading: {heading_text}")
+    if heading_texts:
+        extracted_content.append('\n'.join(heading_texts))
+
+    # Extract lists (often contain educational content like steps or key points)
+    for element in soup.find_all(['ol', 'ul']):
+        # Skip tiny lists or navigation lists
+        if len(element.find_all(recursive=False)) < 2:
+            continue
+        if _inside(element, ['nav', 'header', 'footer']):
+            continue
+
+        list_type = 'Ordered List:' if element.name == 'ol' else 'Unordered List:'
+        items_text = []
+        for item in element.find_all('li'):
+            item_text = clean_text(item.get_text())
+            if item_text:
+                items_text.append(f"- {item_text}")
+
+        if items_text:
+            extracted_content.append(f"{list_type}\n" + '\n'.join(items_text))
+
+    # Look for content in common educational site containers
+    if not extracted_content or len(extracted_content[0]) < 200:
+        content_areas = soup.select('.content, #content, .main-content, #main, .lesson, .resource, .worksheet, .activity, .article')
+        for area in content_areas:
+            paragraph_texts = []
+            for paragraph in area.find_all('p'):
+                paragraph_text = clean_text(paragraph.get_text())
+                if len(paragraph_text) > 30:  # Skip very short paragraphs, likely UI elements
+                    paragraph_texts.append(paragraph_text)
+            if paragraph_texts:
+                extracted_content.append('\n\n'.join(paragraph_texts))
+
+    # If still no specific content found, get important paragraphs
+    if not extracted_content or len(''.join(extracted_content)) < 200:
+        paragraph_texts = []
+        for paragraph in soup.find_all('p'):
+            # Skip paragraphs in navigation, header, footer
+            if _inside(paragraph, ['nav', 'header', 'footer']):
+                continue
+
+            paragraph_text = clean_text(paragraph.get_text())
+            if len(paragraph_text) > 40:  # Only substantial paragraphs
+                paragraph_texts.append(paragraph_text)
+        if paragraph_texts:
+            extracted_content.append('\n\n'.join(paragraph_texts))
+
+    # Add any definitions or key terms (common in educational content)
+    definition_texts = [clean_text(definition.get_text())
+                        for definition in soup.select('dl, .definition, .key-term, .glossary')]
+    if definition_texts:
+        extracted_content.append('Key Terms and Definitions:\n' + '\n'.join(definition_texts))
+
+    # Combine all content, with the same size limit as the browser path
+    return '\n\n'.join(extracted_content)[:15000]
+
+
+async def extract_static_content(url):
+    """Fetch a page over HTTP and extract its content. Returns '' on any failure."""
+    import requests
+
+    try:
+        html = await fetch_html(url)
+    except requests.RequestException as e:
+        print(f"HTTP fetch error for {url}: {e}")
+        return ""
+
+    if not html:
+        return ""
+
+    # Parsing large pages is CPU bound, so keep it off the event loop
+    return await asyncio.to_thread(extract_text_from_html, html)
+
+
+class ExtractionPaths:
+    """
+    Remembers per domain whether plain HTTP or the browser produced usable content.
+    Only the outcome of trying HTTP first is recorded: HTTP when its content was enough,
+    the browser when HTTP was too thin and the browser then did better. The counts decay
+    over time, so a domain that went straight to the browser gets HTTP tried again.
+    """
+
+    def __init__(self, path=EXTRACTION_PATHS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._domains = None
+        self._dirty = False
+        self._saved_at = 0
+
+    def _load(self):
+        if self._domains is None:
+            self._domains = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r') as f:
+                        self._domains = json.load(f)
+                except (OSError, ValueError):
+                    self._domains = {}
+        return self._domains
+
+    def _counts(self, host, now):
+        """The decayed counts for a host. Entries without a timestamp have fully decayed."""
+        entry = self._load().get(host) or {}
+        factor = 0.5 ** (max(now - entry.get('at', 0), 0) / EXTRACTION_PATHS_HALF_LIFE)
+        return {path: entry.get(path, 0) * factor for path in ('http', 'browser')}
+
+    def prefers_http(self, url):
+        """Whether the HTTP path should be tried first for this URL's domain."""
+        with self._lock:
+            counts = self._counts(url_host(url), time.time())
+        # Go straight to the browser once a domain has needed it more often than not
+        return counts['browser'] < 2 or counts['http'] >= counts['browser']
+
+    def record(self, url, path):
+        """Record which path ('http' or 'browser') produced the content for a URL."""
+        now = time.time()
+        with self._lock:
+            host = url_host(url)
+            counts = self._counts(host, now)
+            counts[path] += 1
+            self._domains[host] = {'http': round(counts['http'], 3), 'browser': round(counts['browser'], 3), 'at': now}
+            self._dirty = True
+            if now - self._saved_at >= EXTRACTION_PATHS_SAVE_INTERVAL:
+                self._save()
+
+    def flush(self):
+        """Write out paths recorded since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(self._domains, f)
+        os.replace(temp_path, self.path)
+        self._dirty = False
+        self._saved_at = time.time()
+
+
+extraction_paths = ExtractionPaths()
+atexit.register(extraction_paths.flush)
@@ -0,0 +1,154 @@
+"""
+HomeScraperEdu Status Store
+---------------------------
+Search status files, written so that progress updates are cheap and readers never see a
+half-written file.
+
+- data/searches/{id}.json holds the search itself: written atomically (temp file, then
+  rename) when the search starts and once more with the results when it ends.
+- data/searches/{id}.progress.jsonl is an append-only log with one short JSON line per
+  progress update. An update appends a line instead of re-reading and rewriting the status
+  file, and a reader gets the current progress from the last line without parsing results.
+
+Extra fields sent with progress updates (cache status, ...) are folded into the status file
+when the search ends, so the final file has everything the old read-modify-write one had.
+Files are written compactly, with orjson when it is installed.
+"""
+
+import os
+import json
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+STATUS_DIR = os.path.join('data', 'searches')
+
+# Enough to hold the last few progress lines
+_TAIL_BYTES = 4096
+
+
+def status_path(search_id):
+    return os.path.join(STATUS_DIR, f'{search_id}.json')
+
+
+def progress_path(search_id):
+    return os.path.join(STATUS_DIR, f'{search_id}.progress.jsonl')
+
+
+def _dumps(data):
+    """Serialize to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _write_atomic(path, data):
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(_dumps(data))
+    os.replace(temp_path, path)
+
+
+def create_status(search_id, keywords):
+    """Create the status file for a new search, unless it already exists."""
+    path = status_path(search_id)
+    if os.path.exists(path):
+        return False
+
+    _write_atomic(path, {
+        "id": search_id,
+        "status": "initializing",
+        "message": "Starting search...",
+        "progress": 0,
+        "startTime": datetime.now().isoformat(),
+        "keywords": keywords
+    })
+    return True
+
+
+def append_progress(search_id, status, message, progress, **fields):
+    """Append a progress update. Searches without a status file (e.g. cache refreshes) are not logged."""
+    if not os.path.exists(status_path(search_id)):
+        return False
+
+    update = {'status': status, 'message': message, 'progress': progress, 'time': datetime.now().isoformat()}
+    update.update(fields)
+
+    # One write of one line in append mode, so concurrent readers see whole lines only
+    with open(progress_path(search_id), 'ab') as f:
+        f.write(_dumps(update) + b'\n')
+    return True
+
+
+def read_progress(search_id):
+    """
+    Return the latest progress update of a search ({status, message, progress, ...}),
+    or None if the search does not exist. Only the end of the progress log is read.
+    """
+    try:
+        with open(progress_path(search_id), 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - _TAIL_BYTES))
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        lines = []
+
+    # A line cut off at the start of the tail fails to parse, as does one still being written
+    for line in reversed(lines):
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+
+    # No progress yet: the status file is still the small initial one
+    status = read_status(search_id)
+    if status is None:
+        return None
+    return {key: status[key] for key in ('status', 'message', 'progress') if key in status}
+
+
+def read_progress_log(search_id):
+    """Return every progress update of a search, oldest first."""
+    updates = []
+    try:
+        with open(progress_path(search_id), 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    updates.append(json.loads(line))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return updates
+
+
+def read_status(search_id):
+    """Return the full status file of a search, or None if it does not exist."""
+    try:
+        with open(status_path(search_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def finish_status(search_id, status, message, progress, **fields):
+    """
+    Write the final status file atomically: the initial status, the fields of every progress
+    update and the given fields (results, metrics, ...). A final progress line is appended too.
+    """
+    search_status = read_status(search_id) or {"id": search_id}
+    for update in read_progress_log(search_id):
+        update.pop('time', None)
+        search_status.update(update)
+
+    search_status.update(fields)
+    search_status['status'] = status
+    search_status['message'] = message
+    search_status['progress'] = progress
+    _write_atomic(status_path(search_id), search_status)
+
+    append_progress(search_id, status, message, progress)
+    return search_status
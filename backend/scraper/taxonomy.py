@@ -0,0 +1,150 @@
+"""
+HomeScraperEdu Taxonomy
+-----------------------
+The subject, interest and resource type vocabulary used to classify keywords and scraped
+links, in one place. Each classifier is an ordered list of rules, compiled once into a
+TermMatcher; a rule matches when one of its terms occurs in one of the texts it looks at.
+`classify` returns the first matching rule, like the if/elif chains it replaces, and
+`labels` returns every matching rule, in order.
+
+A rule's terms are either a list, checked against every field, or a dict of lists per
+field. Texts are lowercased before matching; terms are plain lowercase substrings.
+"""
+
+from term_matcher import TermMatcher
+
+
+class Classifier:
+    """Ordered substring rules over one or more text fields."""
+
+    def __init__(self, fields, rules, default=None):
+        self.fields = tuple(fields)
+        self.rules = [label for label, _ in rules]
+        self.default = default
+
+        # For every field, the indexes of the rules each term belongs to
+        self._term_rules = [{} for _ in self.fields]
+        for index, (_, terms) in enumerate(rules):
+            for position, field in enumerate(self.fields):
+                field_terms = terms.get(field, []) if isinstance(terms, dict) else terms
+                for term in field_terms:
+                    self._term_rules[position].setdefault(term, []).append(index)
+
+        self._matcher = TermMatcher(term for term_rules in self._term_rules for term in term_rules)
+
+    def _matched_rules(self, texts):
+        matched = set()
+        for position, text in enumerate(texts):
+            term_rules = self._term_rules[position]
+            for term in self._matcher.find((text or '').lower()):
+                matched.update(term_rules.get(term, ()))
+        return matched
+
+    def classify(self, *texts):
+        """Label of the first rule matching the texts (one per field), or the default."""
+        matched = self._matched_rules(texts)
+        return self.rules[min(matched)] if matched else self.default
+
+    def labels(self, *texts):
+        """Labels of every rule matching the texts, in rule order."""
+        return [self.rules[index] for index in sorted(self._matched_rules(texts))]
+
+    def classify_batch(self, rows):
+        """
+        Classify many rows of texts (one per field) with a single pass of the matcher
+        over all of them. Returns one label per row, as classify would.
+        """
+        segments = [(text or '').lower() for row in rows for text in row]
+        field_count = len(self.fields)
+
+        first_rules = [None] * len(rows)
+        for segment, term in self._matcher.iter_segments(segments):
+            rule_indexes = self._term_rules[segment % field_count].get(term)
+            if rule_indexes:
+                row = segment // field_count
+                first = rule_indexes[0]
+                if first_rules[row] is None or first < first_rules[row]:
+                    first_rules[row] = first
+
+        return [self.rules[index] if index is not None else self.default for index in first_rules]
+
+
+# Subjects of scraped resources, from their URL and title (or a keyword and a title)
+SUBJECT_RULES = [
+    ('art', ['art', 'draw', 'paint', 'craft']),
+    ('music', ['music', 'sing', 'instrument', 'song']),
+    ('reading', ['read', 'book', 'literacy', 'phonics']),
+    ('writing', ['writ', 'essay', 'journal', 'grammar']),
+    ('math', ['math', 'number', 'geometry', 'algebra']),
+    ('science', ['science', 'biology', 'chemistry', 'physics']),
+    ('history', ['history', 'geography', 'civil']),
+    ('coding', ['cod', 'program', 'computer'])
+]
+
+# Resource types of links found by EduSpider
+LINK_TYPE_RULES = [
+    ('video', {'url': ['video', 'youtube'], 'title': ['video']}),
+    ('worksheet', {'url': ['worksheet', 'pdf'], 'title': ['worksheet']}),
+    ('lesson', {'url': ['lesson'], 'title': ['lesson', 'tutorial']}),
+    ('interactive', {'url': ['game', 'interactive'], 'title': ['game']}),
+    ('activity', {'url': ['activity'], 'title': ['activity', 'project']})
+]
+
+# Resource types of results that arrive without one, from the URL alone
+URL_TYPE_RULES = [
+    ('Video', ['youtube.com', 'youtu.be', 'vimeo.com']),
+    ('Worksheet', ['.pdf', 'worksheet', 'printable']),
+    ('Interactive', ['game', 'interactive', 'play']),
+    ('Lesson Plan', ['lesson', 'curriculum', 'plan']),
+    ('Activity', ['activity', 'project', 'experiment'])
+]
+
+# Resource types of reading and writing site results
+READING_TYPE_RULES = [
+    ('worksheet', ['worksheet']),
+    ('lesson', ['lesson'])
+]
+
+# Interests detected in profile keywords, which decide the dynamic scrapers to run
+INTEREST_RULES = [
+    ('art', ['art', 'draw', 'paint', 'craft', 'color', 'design']),
+    ('music', ['music', 'song', 'instrument', 'singing', 'notes', 'melody']),
+    ('reading', ['read', 'book', 'story', 'literature', 'phonics', 'comprehension']),
+    ('writing', ['writ', 'journal', 'essay', 'grammar', 'composition', 'letter']),
+    ('math', ['math', 'number', 'geometry', 'algebra', 'count', 'calculation']),
+    ('science', ['science', 'biology', 'chemistry', 'physics', 'experiment', 'nature']),
+    ('history', ['history', 'past', 'geography', 'civil', 'culture', 'ancient']),
+    ('coding', ['cod', 'program', 'computer science', 'algorithm', 'software'])
+]
+
+# Interests in a profile keyword that pick the subject sites EduSpider crawls
+SPIDER_SITE_RULES = [
+    ('art', ['art', 'draw', 'paint', 'craft']),
+    ('music', ['music', 'sing', 'instrument']),
+    ('reading', ['read', 'book', 'literacy']),
+    ('writing', ['writ', 'journal', 'essay']),
+    ('math', ['math', 'number', 'geometry', 'algebra']),
+    ('science', ['science', 'biology', 'chemistry', 'physics']),
+    ('history', ['history', 'geography', 'civiliz']),
+    ('coding', ['cod', 'program', 'computer science'])
+]
+
+# Interest of a profile keyword that picks its YouTube search query
+YOUTUBE_QUERY_RULES = [
+    ('art', ['art', 'draw', 'craft']),
+    ('music', ['music', 'instrument']),
+    ('reading', ['read', 'book']),
+    ('writing', ['write', 'journal']),
+    ('math', ['math', 'number']),
+    ('science', ['science', 'experiment']),
+    ('history', ['history', 'geography']),
+    ('coding', ['cod', 'program'])
+]
+
+subject_classifier = Classifier(('url', 'title'), SUBJECT_RULES)
+link_type_classifier = Classifier(('url', 'title'), LINK_TYPE_RULES, default='resource')
+url_type_classifier = Classifier(('url',), URL_TYPE_RULES, default='Resource')
+reading_type_classifier = Classifier(('url', 'title'), READING_TYPE_RULES)
+interest_classifier = Classifier(('keyword',), INTEREST_RULES)
+spider_site_classifier = Classifier(('keyword',), SPIDER_SITE_RULES)
+youtube_query_classifier = Classifier(('keyword',), YOUTUBE_QUERY_RULES)
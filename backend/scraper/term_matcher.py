@@ -0,0 +1,135 @@
+"""
+HomeScraperEdu Term Matcher
+---------------------------
+Multi-pattern substring matcher (Aho-Corasick). The patterns are compiled once into an
+automaton, which then finds every pattern occurring in a text in a single pass over it,
+instead of one `term in text` scan per term.
+
+Matching is exact and case sensitive, like `in`: callers lowercase the text themselves.
+The C automaton from pyahocorasick is used when it is installed; otherwise the automaton is
+built and run in pure Python, with the same results.
+"""
+
+from bisect import bisect_right
+from collections import deque
+
+try:
+    import ahocorasick
+except ImportError:  # Falls back to the pure Python automaton
+    ahocorasick = None
+
+
+class TermMatcher:
+    """Finds which of a fixed set of patterns occur in a text."""
+
+    def __init__(self, patterns):
+        self.patterns = []
+        self._match_empty = False
+
+        for pattern in dict.fromkeys(patterns):
+            if pattern == '':
+                # The empty string occurs in every text, just like `'' in text`
+                self._match_empty = True
+            else:
+                self.patterns.append(pattern)
+
+        self._automaton = None
+        if ahocorasick is not None:
+            if self.patterns:
+                self._automaton = ahocorasick.Automaton()
+                for pattern in self.patterns:
+                    self._automaton.add_word(pattern, pattern)
+                self._automaton.make_automaton()
+        else:
+            self._build()
+
+    def _build(self):
+        """Build the trie, its failure links, and from those a transition table per state."""
+        goto = [{}]
+        outputs = [[]]
+        for pattern in self.patterns:
+            state = 0
+            for char in pattern:
+                if char not in goto[state]:
+                    goto[state][char] = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                state = goto[state][char]
+            outputs[state].append(pattern)
+
+        # Breadth first, so a state's failure target is always complete before the state itself
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            delta[state] = dict(delta[fail[state]])
+            delta[state].update(goto[state])
+
+            for char, next_state in goto[state].items():
+                # The failure target is where the longest proper suffix of this state leads
+                fail[next_state] = delta[fail[state]].get(char, 0)
+                # A state also reports every pattern that is a suffix of its own
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+                queue.append(next_state)
+
+        self._delta = delta
+        self._outputs = outputs
+
+    def iter(self, text):
+        """Yield (end, pattern) for every occurrence of a non-empty pattern in text, in order of end."""
+        if ahocorasick is not None:
+            if self._automaton is not None:
+                for last_index, pattern in self._automaton.iter(text):
+                    yield last_index + 1, pattern
+            return
+
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            for pattern in outputs[state]:
+                yield index + 1, pattern
+
+    def iter_segments(self, segments):
+        """
+        Yield (index, pattern) for every occurrence of a non-empty pattern in a list of texts,
+        where index is the text it occurs in, with a single pass over all of them.
+        """
+        # Texts are joined with a character no pattern contains, so no match spans two
+        starts = []
+        offset = 0
+        for segment in segments:
+            starts.append(offset)
+            offset += len(segment) + 1
+
+        for end, pattern in self.iter('\0'.join(segments)):
+            yield bisect_right(starts, end - len(pattern)) - 1, pattern
+
+    def find(self, text):
+        """
+        Return {pattern: end} for every pattern occurring in text, where end is the index
+        just past its first occurrence (so text[end - len(pattern):end] == pattern).
+        """
+        found = {'': 0} if self._match_empty else {}
+
+        if ahocorasick is not None:
+            if self._automaton is not None:
+                for last_index, pattern in self._automaton.iter(text):
+                    if pattern not in found:
+                        found[pattern] = last_index + 1
+            return found
+
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                for pattern in outputs[state]:
+                    if pattern not in found:
+                        found[pattern] = index + 1
+
+        return found
@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# The scraper modules import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# main.py creates its data directories in the working directory when imported
+os.chdir(tempfile.mkdtemp(prefix='scraper-tests-'))
@@ -0,0 +1,55 @@
+"""
+The vectorized scorer (batch_scoring) against the per-result one: the same relevance_score
+for every candidate, and filter_results returning the same top 10 either way, for pools
+below and above BATCH_SCORING_MIN_RESULTS.
+"""
+
+import copy
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+
+import main
+import batch_scoring
+
+from test_scoring_parity import random_keywords, random_result
+
+
+def pools(seed, size, searches):
+    rng = random.Random(seed)
+    for _ in range(searches):
+        keywords = random_keywords(rng)
+        yield keywords, [random_result(rng, index, keywords) for index in range(size)]
+
+
+def ranking(results):
+    return [(result['url'], result['title'], result['relevance_score']) for result in results]
+
+
+@pytest.mark.parametrize('size', [main.BATCH_SCORING_MIN_RESULTS // 2, main.BATCH_SCORING_MIN_RESULTS * 2])
+def test_batch_scores_match_per_result_scores(size):
+    for keywords, results in pools(seed=size, size=size, searches=20):
+        profile = main.build_relevance_profile(keywords)
+        candidates = [result for result in copy.deepcopy(results) if main.prepare_result(result)]
+        matches = [main.match_result(result, profile) for result in candidates]
+        subjects = [result.get('subject', '').lower() for result in candidates]
+
+        scores = batch_scoring.score_matches(matches, subjects, profile, main.RELEVANCE_CATEGORIES,
+                                             main.MUSIC_INSTRUMENTS, main.LESSON_TERMS)
+        assert scores.tolist() == [main.score_result(result, profile) for result in candidates], keywords
+
+
+@pytest.mark.parametrize('size', [main.BATCH_SCORING_MIN_RESULTS // 2, main.BATCH_SCORING_MIN_RESULTS * 2])
+def test_filter_results_same_top_results_on_both_paths(size, monkeypatch):
+    for keywords, results in pools(seed=size + 1, size=size, searches=20):
+        # Every pool goes through the batch scorer, then every pool is scored one result at a time
+        monkeypatch.setattr(main, 'BATCH_SCORING_MIN_RESULTS', 0)
+        batched = main.filter_results(copy.deepcopy(results), keywords)
+        monkeypatch.setattr(main, 'BATCH_SCORING_MIN_RESULTS', len(results) + 1)
+        per_result = main.filter_results(copy.deepcopy(results), keywords)
+
+        assert ranking(batched) == ranking(per_result), keywords
+        assert all(type(result['relevance_score']) is int for result in batched)
@@ -0,0 +1,38 @@
+import json
+
+import static_extract
+from static_extract import ExtractionPaths
+
+
+def test_browser_preference_decays(tmp_path, monkeypatch):
+    now = [1000000.0]
+    monkeypatch.setattr(static_extract.time, 'time', lambda: now[0])
+    paths = ExtractionPaths(str(tmp_path / 'paths.json'))
+
+    for _ in range(3):
+        paths.record('https://www.spa.org/page', 'browser')
+    assert not paths.prefers_http('https://spa.org/other')
+
+    # Two half-lives later the counts are down to 0.75, and HTTP is tried again
+    now[0] += 2 * static_extract.EXTRACTION_PATHS_HALF_LIFE
+    assert paths.prefers_http('https://spa.org/other')
+
+
+def test_writes_are_batched(tmp_path, monkeypatch):
+    now = [1000000.0]
+    monkeypatch.setattr(static_extract.time, 'time', lambda: now[0])
+    path = tmp_path / 'paths.json'
+    paths = ExtractionPaths(str(path))
+
+    paths.record('https://a.org/1', 'http')
+    paths.record('https://b.org/1', 'http')
+    assert set(json.loads(path.read_text())) == {'a.org'}
+
+    now[0] += static_extract.EXTRACTION_PATHS_SAVE_INTERVAL
+    paths.record('https://c.org/1', 'browser')
+    assert set(json.loads(path.read_text())) == {'a.org', 'b.org', 'c.org'}
+
+    paths.record('https://d.org/1', 'http')
+    paths.flush()
+    saved = json.loads(path.read_text())
+    assert saved['d.org']['http'] == 1 and saved['c.org']['browser'] == 1
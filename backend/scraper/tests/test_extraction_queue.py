@@ -0,0 +1,51 @@
+import asyncio
+
+from extraction_queue import ExtractionQueue
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_cancel_before_extractions_start():
+    started = []
+
+    async def extract(url):
+        started.append(url)
+        await asyncio.sleep(1)
+        return url
+
+    async def scenario():
+        queue = ExtractionQueue(extract, concurrency=4, per_host=2)
+        futures = [queue.submit(f'https://site{index % 3}.org/{index}', index) for index in range(10)]
+        # Cancelled in the same step, before any task got to run
+        queue.cancel()
+        await asyncio.sleep(0)
+        return queue, futures
+
+    queue, futures = run(scenario())
+    assert started == []
+    assert all(future.cancelled() for future in futures)
+    assert not queue._tasks
+    assert all(count == 0 for count in queue._running_per_host.values())
+
+
+def test_cancel_while_running_frees_slots():
+    async def extract(url):
+        if url.endswith('/0'):
+            return 'done'
+        await asyncio.sleep(1)
+
+    async def scenario():
+        queue = ExtractionQueue(extract, concurrency=2, per_host=2)
+        futures = [queue.submit(f'https://site.org/{index}', index) for index in range(5)]
+        await futures[0]
+        queue.cancel()
+        await asyncio.sleep(0)
+        return queue, futures
+
+    queue, futures = run(scenario())
+    assert futures[0].result() == 'done'
+    assert all(future.cancelled() for future in futures[1:])
+    assert not queue._tasks
+    assert queue._running_per_host == {'site.org': 0}
@@ -0,0 +1,32 @@
+import os
+import random
+
+from page_cache import PageCache
+
+
+def blob_bytes(cache):
+    root = os.path.join(cache.root, 'blobs')
+    return sum(os.path.getsize(os.path.join(folder, name))
+               for folder, _, names in os.walk(root) for name in names)
+
+
+def indexed_bytes(cache):
+    return cache._connect().execute(
+        'SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM pages)'
+    ).fetchone()[0]
+
+
+def test_running_size_matches_the_index(tmp_path):
+    rng = random.Random(3)
+    cache = PageCache(root=str(tmp_path / 'pages'), max_bytes=20000)
+
+    for index in range(300):
+        # Some URLs are stored again with new content, some pages share a body
+        url = f'https://example.com/page/{rng.randrange(120)}'
+        body = os.urandom(rng.randrange(200, 2000)) if index % 5 else b'shared page'
+        cache.put(url, 200, {'Content-Type': 'text/html'}, body)
+
+        assert cache._total_bytes == indexed_bytes(cache) == blob_bytes(cache)
+        assert cache._total_bytes <= cache.max_bytes
+
+    assert cache.stats['evicted'] > 0
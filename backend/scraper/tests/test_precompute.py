@@ -0,0 +1,42 @@
+import json
+
+import precompute
+
+
+PROFILE = {
+    'grade': '3rd Grade',
+    'mainInterests': ['Math', 'Art'],
+    'subInterests': ['Math:Basic Counting', 'Art:Drawing'],
+    'interests': ['Math', 'Art', 'Basic Counting', 'Drawing', 'dinosaurs, space'],
+    'customInterests': 'dinosaurs, space'
+}
+
+
+def test_profile_keywords_match_the_search_page():
+    # generateSearchKeywords in CurriculumSearchPage.jsx, run on the same profile
+    assert precompute.profile_keywords(PROFILE) == [
+        '3rd grade math', 'math for 3rd grade', '3rd grade math curriculum', '3rd grade math lessons',
+        '3rd grade art', 'art for 3rd grade', '3rd grade art curriculum', '3rd grade art lessons',
+        '3rd grade basic counting', 'basic counting for 3rd grade', '3rd grade math basic counting',
+        'basic counting activities for 3rd grade',
+        '3rd grade drawing', 'drawing for 3rd grade', '3rd grade art drawing', 'drawing activities for 3rd grade',
+        '3rd grade math worksheets', 'basic counting lessons for 3rd grade',
+        '3rd grade dinosaurs', 'dinosaurs for 3rd grade'
+    ]
+
+
+def test_top_keyword_sets_count_whole_sets(tmp_path, monkeypatch):
+    history = tmp_path / 'searches'
+    history.mkdir()
+    for search_id, keywords in [('a', ['5th grade coding', 'coding for 5th grade']),
+                                ('b', ['Coding for 5th grade ', '5th grade coding']),
+                                ('precompute-c', ['4th grade art'])]:
+        (history / f'{search_id}.json').write_text(json.dumps({'keywords': keywords}))
+    monkeypatch.setattr(precompute.history_keyword_lists, '__defaults__', (str(history),))
+
+    profiles = tmp_path / 'profiles.json'
+    profiles.write_text(json.dumps([dict(PROFILE, id='1', updatedAt='')]))
+    args = precompute.parse_args(['--profiles', str(profiles), '--top', '5'])
+
+    keyword_sets = precompute.top_keyword_sets(args)
+    assert keyword_sets == [['5th grade coding', 'coding for 5th grade'], precompute.profile_keywords(PROFILE)]
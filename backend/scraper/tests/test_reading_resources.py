@@ -0,0 +1,26 @@
+import random
+import asyncio
+
+import main
+
+
+def test_emitted_reading_resources_are_the_returned_ones(monkeypatch):
+    rng = random.Random(14)
+    keywords = ['3rd grade reading', 'reading for 3rd grade', '3rd grade writing']
+    assert len(main.reading_searches_for(keywords)) > 2
+
+    async def search_reading_site(site, keyword, grade_level, writing):
+        await asyncio.sleep(rng.random() / 100)
+        # Sites share some pages, so there are duplicates across searches
+        return [{'title': f'Story {number}', 'url': f'https://stories.org/{number}', 'description': ''}
+                for number in rng.sample(range(12), 6)]
+
+    monkeypatch.setattr(main, 'search_reading_site', search_reading_site)
+
+    for _ in range(20):
+        emitted = []
+        returned = asyncio.run(main.scrape_reading_resources(
+            keywords, emit=lambda order, resource: emitted.append(resource['url'])))
+        urls = [resource['url'] for resource in returned]
+        assert len(urls) == len(set(urls)) <= 10
+        assert sorted(emitted) == sorted(urls)
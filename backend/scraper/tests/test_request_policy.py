@@ -0,0 +1,73 @@
+import asyncio
+
+import request_policy
+from page_cache import PageCache
+
+
+class FakeRequest:
+    method = 'GET'
+    headers = {}
+
+    def __init__(self, url):
+        self.url = url
+
+
+class FakeResponse:
+    def __init__(self, url, status, headers, body=b''):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, url, response):
+        self.request = FakeRequest(url)
+        self.response = response
+        self.fetch_options = None
+        self.fulfilled = None
+
+    async def fetch(self, **options):
+        self.fetch_options = options
+        return self.response
+
+    async def fulfill(self, **options):
+        self.fulfilled = options
+
+    async def continue_(self):
+        pass
+
+
+def request_filter(tmp_path):
+    # Only the cache and the counters are needed to serve documents
+    handler = request_policy.RequestFilter.__new__(request_policy.RequestFilter)
+    handler.cache = PageCache(root=str(tmp_path / 'pages'))
+    handler.metrics = {}
+    return handler
+
+
+def test_redirects_reach_the_browser_uncached(tmp_path):
+    handler = request_filter(tmp_path)
+    url = 'http://example.org/lesson'
+    redirect = FakeResponse(url, 301, {'location': 'https://www.example.org/lesson'})
+    route = FakeRoute(url, redirect)
+
+    asyncio.run(handler.serve_document(route))
+
+    assert route.fetch_options['max_redirects'] == 0
+    assert route.fulfilled == {'response': redirect}
+    assert handler.cache.get(url) is None
+
+
+def test_documents_are_cached_under_their_url(tmp_path):
+    handler = request_filter(tmp_path)
+    url = 'https://www.example.org/lesson'
+    route = FakeRoute(url, FakeResponse(url, 200, {'content-type': 'text/html'}, b'<p>Lesson</p>'))
+
+    asyncio.run(handler.serve_document(route))
+
+    assert route.fulfilled['body'] == b'<p>Lesson</p>'
+    assert handler.cache.get(url).body == b'<p>Lesson</p>'
@@ -0,0 +1,48 @@
+from resource_dedupe import DuplicateIndex, canonical_url, simhash, NEAR_DUPLICATE_BITS
+
+
+DESCRIPTION = ('In this lesson students learn adding fractions with like denominators using visual models '
+               'and number lines, then practice with word problems and a short quiz')
+
+
+def lesson(url, number, description=DESCRIPTION):
+    return {'title': f'Fractions Lesson {number}: Adding Fractions', 'url': url, 'description': description}
+
+
+def test_numbered_lessons_survive_dedupe():
+    index = DuplicateIndex()
+    results = [lesson(f'https://www.mathsite.org/fractions/lesson-{number}', number) for number in range(1, 9)]
+
+    # Their texts are close enough to count as near-duplicates by SimHash alone
+    hashes = [simhash(f"{result['title']} {result['description']}") for result in results]
+    assert any(bin(hashes[0] ^ other).count('1') <= NEAR_DUPLICATE_BITS for other in hashes[1:])
+
+    keys = [index.key(result) for result in results]
+    assert len(set(keys)) == len(results)
+    assert index.merged_count() == 0
+
+
+def test_same_lesson_under_two_paths_is_merged():
+    index = DuplicateIndex()
+    first = index.key(lesson('https://mathsite.org/fractions/lesson-3', 3))
+    second = index.key(lesson('https://www.mathsite.org/lessons?id=fractions-3', 3, DESCRIPTION + '.'))
+    assert first == second
+    assert index.merged_count() == 1
+
+
+def test_lookalikes_on_other_sites_stay_apart():
+    index = DuplicateIndex()
+    first = index.key(lesson('https://mathsite.org/fractions/lesson-3', 3))
+    second = index.key(lesson('https://othersite.com/fractions/lesson-3', 3))
+    assert first != second
+
+
+def test_url_variants_share_a_key():
+    index = DuplicateIndex()
+    keys = {index.key({'title': 'Video', 'url': url}) for url in [
+        'https://www.youtube.com/watch?v=abcdefghijk&pp=xyz',
+        'https://youtu.be/abcdefghijk',
+        'https://m.youtube.com/shorts/abcdefghijk',
+    ]}
+    assert keys == {'youtube:abcdefghijk'}
+    assert canonical_url('https://www.site.org/page/?utm_source=x#top') == canonical_url('http://site.org/page')
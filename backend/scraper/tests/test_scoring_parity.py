@@ -0,0 +1,516 @@
+"""
+Parity of filter_results, scored through the compiled term matcher, with the filter_results
+it replaced: the same relevance scores for every result and the same top 10, in order, on a
+seeded random corpus built from the scoring vocabulary.
+"""
+
+import copy
+import random
+
+import pytest
+
+import main
+import term_matcher
+
+
+def baseline_filter_results(results, keywords):
+    """filter_results as it was before the compiled term matcher, kept unchanged as the reference."""
+    filtered = []
+
+    # Identify potential sub-interest keywords (more specific, longer keywords)
+    main_subject_keywords = ['math', 'science', 'reading', 'writing', 'history', 'art', 'music', 'coding', 'sports', 'nature', 'geography', 'languages']
+    grade_keywords = ['preschool', 'kindergarten', '1st grade', '2nd grade', '3rd grade', '4th grade', '5th grade',
+                     '6th grade', '7th grade', '8th grade', '9th grade', '10th grade', '11th grade', '12th grade']
+
+    # Art-specific terminology to boost relevance scoring
+    art_technique_keywords = [
+        'drawing', 'painting', 'watercolor', 'acrylic', 'oil', 'pastels', 'sculpture',
+        'ceramics', 'printmaking', 'collage', 'mixed media', 'color theory', 'perspective',
+        'shading', 'texture', 'composition', 'portrait', 'landscape', 'figure', 'abstract',
+        'art history', 'digital art', 'crafts', 'clay', 'fiber arts', 'weaving', '3d art'
+    ]
+
+    # Music-specific terminology to boost relevance scoring
+    music_terminology_keywords = [
+        'rhythm', 'melody', 'harmony', 'notes', 'scale', 'chord', 'tempo', 'dynamics',
+        'singing', 'song', 'instrument', 'percussion', 'recorder', 'ukulele', 'piano',
+        'guitar', 'orchestra', 'band', 'ensemble', 'composition', 'musical', 'notation',
+        'sheet music', 'music theory', 'pitch', 'tone', 'staff', 'clef', 'time signature',
+        'beat', 'measure', 'vocal', 'performance', 'concert', 'music history', 'composer',
+        'symphony', 'sonata', 'music genre', 'folk music', 'classical music', 'jazz',
+        'digital music', 'recording', 'music production', 'sound', 'audio', 'music technology'
+    ]
+
+    # Reading-specific terminology to boost relevance scoring
+    reading_terminology_keywords = [
+        'phonics', 'phonological awareness', 'letter recognition', 'alphabet', 'sight words',
+        'phonemes', 'fluency', 'decoding', 'blending', 'comprehension', 'vocabulary',
+        'story elements', 'characters', 'setting', 'plot', 'theme', 'fiction', 'nonfiction',
+        'literature', 'genre', 'author study', 'inference', 'prediction', 'summarizing',
+        'reading strategies', 'reading skills', 'chapter book', 'picture book', 'anthology',
+        'reader', 'literacy', 'literary elements', 'literary devices', 'poetry', 'novel',
+        'biography', 'autobiography', 'narrative', 'fairy tale', 'folktale', 'myth', 'legend',
+        'research', 'text features', 'text structure', 'main idea', 'details', 'critical reading',
+        'author\'s purpose', 'author\'s craft', 'literary analysis', 'literature circles',
+        'reading response', 'reading workshop', 'guided reading', 'independent reading',
+        'shared reading', 'fluent reading', 'reading assessment', 'reading level', 'lexile',
+        'textual evidence', 'annotation', 'close reading', 'metacognition', 'context clues',
+        'figurative language', 'rhetoric', 'argumentative text', 'persuasive text', 'digital literacy',
+        'media literacy', 'compare and contrast', 'cause and effect', 'fact and opinion',
+        'american literature', 'world literature', 'british literature', 'classic literature',
+        'contemporary literature', 'literary criticism', 'literary theory', 'comparative literature'
+    ]
+
+    # Writing-specific terminology to boost relevance scoring
+    writing_terminology_keywords = [
+        'handwriting', 'letter formation', 'scribbling', 'name writing', 'sentence writing',
+        'paragraph', 'essay', 'narrative', 'informative', 'opinion', 'persuasive', 'argumentative',
+        'creative writing', 'journal', 'story development', 'revising', 'editing', 'publishing',
+        'grammar', 'spelling', 'vocabulary', 'voice', 'style', 'thesis', 'research paper',
+        'technical writing', 'rhetoric', 'writing process', 'drafting', 'proofreading',
+        'writing workshop', 'author\'s craft', 'sentence structure', 'character development',
+        'plot development', 'setting description', 'dialogue writing', 'memoir', 'journalism',
+        'expository writing', 'descriptive writing', 'poetry writing', 'digital composition',
+        'multimedia presentation', 'academic writing', 'citations', 'bibliography', 'annotation',
+        'college essay', 'analytical writing', 'critical analysis', 'research synthesis',
+        'professional writing', 'writing portfolio', 'publication'
+    ]
+
+    # Sports-specific terminology to boost relevance scoring
+    sports_terminology_keywords = [
+        'movement skills', 'motor skills', 'coordination', 'balance', 'flexibility', 'agility',
+        'ball skills', 'throwing', 'catching', 'kicking', 'running', 'jumping', 'hopping',
+        'team games', 'sportsmanship', 'rules', 'physical activity', 'exercise', 'fitness',
+        'sports equipment', 'gymnastics', 'dance', 'swimming', 'soccer', 'basketball', 'baseball',
+        'volleyball', 'football', 'tennis', 'hockey', 'track and field', 'physical education',
+        'outdoor games', 'movement exploration', 'body awareness', 'spatial awareness', 'rhythm',
+        'movement patterns', 'relay races', 'obstacle courses', 'cooperative games', 'recreational'
+    ]
+
+    # Coding-specific terminology to boost relevance scoring
+    coding_terminology_keywords = [
+        'programming', 'code', 'coding', 'algorithm', 'sequence', 'debugging', 'computational thinking',
+        'block coding', 'scratch', 'python', 'javascript', 'html', 'css', 'web development',
+        'app development', 'game development', 'robotics', 'loops', 'conditionals', 'variables',
+        'functions', 'data structures', 'data types', 'boolean logic', 'control flow', 'syntax',
+        'commands', 'programming language', 'computer science', 'software', 'hardware', 'interface',
+        'database', 'digital storytelling', 'animation', 'unplugged activities', 'binary', 'logic',
+        'decomposition', 'abstraction', 'patterns', 'algorithms', 'logic gates', 'problem-solving',
+        'project planning', 'testing', 'debugging', 'software development', 'cybersecurity',
+        'mobile apps', 'web apps', 'user interface', 'user experience', 'front-end', 'back-end',
+        'full-stack', 'APIs', 'object-oriented', 'functional programming', 'game mechanics'
+    ]
+
+    # Nature-specific terminology to boost relevance scoring
+    nature_terminology_keywords = [
+        'ecosystem', 'habitat', 'environment', 'biodiversity', 'conservation', 'sustainable',
+        'wildlife', 'plants', 'animals', 'botany', 'zoology', 'ecology', 'biomes', 'forest',
+        'ocean', 'marine', 'desert', 'jungle', 'rainforest', 'wetland', 'prairie', 'tundra',
+        'species', 'life cycle', 'food web', 'food chain', 'adaptation', 'evolution', 'natural',
+        'nature', 'outdoors', 'environmental', 'climate', 'weather', 'seasons', 'resources',
+        'earth', 'geology', 'rocks', 'minerals', 'water cycle', 'water conservation', 'energy',
+        'renewable', 'recycling', 'pollution', 'environmental impact', 'stewardship', 'preservation',
+        'sustainability', 'biology', 'carbon', 'footprint', 'deforestation', 'endangered',
+        'extinct', 'organic', 'climate change', 'global warming', 'earth day', 'green living',
+        'earth science', 'environmental science', 'ecology', 'biogeochemical', 'population dynamics'
+    ]
+
+    # Animals-specific terminology to boost relevance scoring
+    animals_terminology_keywords = [
+        'zoology', 'animal', 'wildlife', 'pet', 'mammal', 'bird', 'reptile', 'amphibian', 'fish',
+        'insect', 'invertebrate', 'vertebrate', 'species', 'breed', 'habitat', 'adaptation',
+        'behavior', 'carnivore', 'herbivore', 'omnivore', 'predator', 'prey', 'endangered',
+        'extinct', 'conservation', 'life cycle', 'migration', 'hibernation', 'domesticated',
+        'wild', 'farm animal', 'marine animal', 'zoo', 'aquarium', 'safari', 'ecosystem',
+        'food chain', 'classification', 'taxonomy', 'phylum', 'genus', 'species', 'fauna',
+        'biodiversity', 'evolution', 'natural selection', 'genetics', 'DNA', 'heredity',
+        'anatomy', 'physiology', 'skeletal', 'circulatory', 'digestive', 'reproductive',
+        'respiratory', 'ethology', 'instinct', 'camouflage', 'communication', 'mating',
+        'offspring', 'incubation', 'metamorphosis', 'nesting', 'herd', 'pack', 'pride',
+        'flock', 'school', 'colony', 'hive', 'veterinary', 'animal care', 'animal welfare'
+    ]
+
+    # Space-specific terminology to boost relevance scoring
+    space_terminology_keywords = [
+        'astronomy', 'space', 'planet', 'solar system', 'galaxy', 'universe', 'cosmos',
+        'star', 'constellation', 'moon', 'sun', 'earth', 'mars', 'jupiter', 'saturn',
+        'venus', 'mercury', 'uranus', 'neptune', 'pluto', 'asteroid', 'comet', 'meteor',
+        'orbit', 'gravity', 'telescope', 'observatory', 'satellite', 'spacecraft', 'rocket',
+        'astronaut', 'nasa', 'esa', 'spacex', 'iss', 'international space station',
+        'eclipse', 'lunar', 'solar', 'celestial', 'cosmic', 'nebula', 'supernova', 'black hole',
+        'milky way', 'light year', 'parsec', 'astronomer', 'astrophysics', 'cosmology',
+        'exoplanet', 'extraterrestrial', 'mission', 'launch', 'touchdown', 'rover', 'probe',
+        'hubble', 'james webb', 'observatory', 'space shuttle', 'apollo', 'gemini', 'mercury program',
+        'day/night cycle', 'rotation', 'revolution', 'axis', 'equinox', 'solstice',
+        'astronomical unit', 'big bang', 'dark matter', 'dark energy', 'quasar', 'pulsar',
+        'dwarf planet', 'space exploration', 'space travel', 'interstellar', 'spacewalk',
+        'zero gravity', 'weightlessness', 'astronavigation', 'cosmonauts', 'planetary science'
+    ]
+
+    # Categorize keywords into main subjects and specific topics
+    specific_topic_keywords = []
+    art_related_keywords = []
+    music_related_keywords = []
+    reading_related_keywords = []
+    writing_related_keywords = []
+    sports_related_keywords = []
+    coding_related_keywords = []
+    nature_related_keywords = []
+    animals_related_keywords = []
+    space_related_keywords = []
+
+    for keyword in keywords:
+        is_generic = False
+        # Check if keyword contains just a grade or main subject
+        for grade in grade_keywords:
+            if grade in keyword.lower() and len(keyword.split()) <= 2:
+                is_generic = True
+                break
+
+        for subject in main_subject_keywords:
+            if subject in keyword.lower() and len(keyword.split()) <= 2:
+                is_generic = True
+                break
+
+        if not is_generic and len(keyword.split()) >= 2:
+            specific_topic_keywords.append(keyword)
+
+        # Identify art-specific keywords
+        if 'art' in keyword.lower():
+            art_related_keywords.append(keyword)
+            for technique in art_technique_keywords:
+                if technique in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important art technique keywords
+
+        # Identify music-specific keywords
+        if 'music' in keyword.lower():
+            music_related_keywords.append(keyword)
+            for term in music_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important music terminology keywords
+
+        # Identify reading-specific keywords
+        if 'reading' in keyword.lower():
+            reading_related_keywords.append(keyword)
+            for term in reading_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important reading terminology keywords
+
+        # Identify writing-specific keywords
+        if 'writing' in keyword.lower():
+            writing_related_keywords.append(keyword)
+            for term in writing_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important writing terminology keywords
+
+        # Identify sports-specific keywords
+        if 'sports' in keyword.lower() or 'physical' in keyword.lower() or 'movement' in keyword.lower():
+            sports_related_keywords.append(keyword)
+            for term in sports_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important sports terminology keywords
+
+        # Identify coding-specific keywords
+        if 'coding' in keyword.lower() or 'programming' in keyword.lower() or 'computer science' in keyword.lower():
+            coding_related_keywords.append(keyword)
+            for term in coding_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important coding terminology keywords
+
+        # Identify nature-specific keywords
+        if 'nature' in keyword.lower() or 'environment' in keyword.lower() or 'ecology' in keyword.lower() or 'biology' in keyword.lower() or 'earth' in keyword.lower():
+            nature_related_keywords.append(keyword)
+            for term in nature_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important nature terminology keywords
+
+        # Identify animals-specific keywords
+        if 'animal' in keyword.lower() or 'zoology' in keyword.lower() or 'wildlife' in keyword.lower() or 'pet' in keyword.lower() or 'species' in keyword.lower():
+            animals_related_keywords.append(keyword)
+            for term in animals_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important animals terminology keywords
+
+        # Identify space-specific keywords
+        if 'space' in keyword.lower() or 'astronomy' in keyword.lower() or 'planet' in keyword.lower() or 'solar system' in keyword.lower() or 'universe' in keyword.lower() or 'galaxy' in keyword.lower() or 'star' in keyword.lower() or 'celestial' in keyword.lower():
+            space_related_keywords.append(keyword)
+            for term in space_terminology_keywords:
+                if term in keyword.lower():
+                    specific_topic_keywords.append(keyword)  # Double count important space terminology keywords
+
+    for result in results:
+        # Ensure required fields exist
+        if 'title' not in result or not result['title']:
+            continue
+
+        if 'url' not in result or not result['url']:
+            continue
+
+        # Add default values for required fields if they don't exist
+        if 'description' not in result or not result['description']:
+            result['description'] = f"Educational resource about {result.get('subject', 'various topics')}"
+
+        if 'subject' not in result or not result['subject']:
+            result['subject'] = 'Educational'
+
+        if 'type' not in result or not result['type']:
+            result['type'] = main.determine_resource_type_from_url(result.get('url', ''))
+
+        if 'estimatedTime' not in result:
+            result['estimatedTime'] = main.estimate_completion_time(result)
+
+        # Combine title and description for matching
+        text_to_match = (result['title'] + " " + result['description']).lower()
+
+        # Score based on keyword matches with weighting
+        score = 0
+
+        # Higher score for specific topic matches - these are more important
+        for keyword in specific_topic_keywords:
+            if keyword.lower() in text_to_match:
+                # Specific topic keywords get 3 points
+                score += 3
+
+                # Extra points if it's in the title (more relevant)
+                if keyword.lower() in result['title'].lower():
+                    score += 2
+
+        # Base points for any keyword match
+        for keyword in keywords:
+            if keyword.lower() in text_to_match:
+                score += 1
+
+        # Extra points for art technique matches in art-related results
+        if 'art' in text_to_match or result.get('subject', '').lower() == 'art':
+            for technique in art_technique_keywords:
+                if technique in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of art techniques
+                    if technique in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific art-related keywords
+            for keyword in art_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Extra points for music terminology matches in music-related results
+        if 'music' in text_to_match or result.get('subject', '').lower() == 'music':
+            for term in music_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of music terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific music-related keywords
+            for keyword in music_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+            # Additional scoring for music instrument tutorials and lessons
+            instruments = ['piano', 'guitar', 'violin', 'ukulele', 'recorder', 'drums', 'flute', 'percussion']
+            for instrument in instruments:
+                if instrument in text_to_match and ('learn' in text_to_match or 'lesson' in text_to_match or 'tutorial' in text_to_match):
+                    score += 3
+
+        # Extra points for reading terminology matches in reading-related results
+        if 'reading' in text_to_match or result.get('subject', '').lower() == 'reading':
+            for term in reading_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of reading terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific reading-related keywords
+            for keyword in reading_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Extra points for writing terminology matches in writing-related results
+        if 'writing' in text_to_match or result.get('subject', '').lower() == 'writing':
+            for term in writing_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of writing terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific writing-related keywords
+            for keyword in writing_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Extra points for sports terminology matches in sports-related results
+        if 'sports' in text_to_match or 'physical education' in text_to_match or result.get('subject', '').lower() == 'sports':
+            for term in sports_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of sports terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific sports-related keywords
+            for keyword in sports_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Extra points for coding terminology matches in coding-related results
+        if 'coding' in text_to_match or 'programming' in text_to_match or 'computer science' in text_to_match or result.get('subject', '').lower() == 'coding':
+            for term in coding_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of coding terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific coding-related keywords
+            for keyword in coding_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Extra points for nature terminology matches in nature-related results
+        if 'nature' in text_to_match or 'environment' in text_to_match or 'ecology' in text_to_match or result.get('subject', '').lower() == 'nature':
+            for term in nature_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of nature terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific nature-related keywords
+            for keyword in nature_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Extra points for animals terminology matches in animals-related results
+        if 'animal' in text_to_match or 'wildlife' in text_to_match or 'zoology' in text_to_match or 'pet' in text_to_match or result.get('subject', '').lower() == 'animals':
+            for term in animals_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of animals terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific animals-related keywords
+            for keyword in animals_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Extra points for space terminology matches in space-related results
+        if 'space' in text_to_match or 'astronomy' in text_to_match or 'planet' in text_to_match or 'solar system' in text_to_match or 'universe' in text_to_match or result.get('subject', '').lower() == 'space':
+            for term in space_terminology_keywords:
+                if term in text_to_match:
+                    score += 2
+
+                    # Even more points for title matches of space terminology
+                    if term in result['title'].lower():
+                        score += 1
+
+            # Boost resources that match specific space-related keywords
+            for keyword in space_related_keywords:
+                if keyword.lower() in text_to_match:
+                    score += 1
+
+        # Add result if it has a score greater than 0
+        if score > 0:
+            result['relevance_score'] = score
+            filtered.append(result)
+
+    # Sort by relevance
+    return sorted(filtered, key=lambda x: x['relevance_score'], reverse=True)[:10]
+
+
+GRADES = ['preschool', 'kindergarten', '1st grade', '3rd grade', '5th grade', '8th grade', '11th grade']
+SUBJECTS = ['math', 'science', 'reading', 'writing', 'history', 'art', 'music', 'coding', 'sports', 'nature',
+            'animals', 'space', 'geography', 'languages', 'physical education', 'computer science']
+FILLER = ['for', 'kids', 'lesson', 'learn', 'tutorial', 'fun', 'the', 'worksheet', 'activity', 'video', 'about',
+          'Star', 'Planet', 'PET', 'earth', 'Art', "author's", 'İstanbul', 'straße', 'environment', 'movement']
+VOCABULARY = sorted(set(
+    SUBJECTS + FILLER + main.ART_TECHNIQUE_KEYWORDS + main.MUSIC_TERMINOLOGY_KEYWORDS
+    + main.READING_TERMINOLOGY_KEYWORDS + main.WRITING_TERMINOLOGY_KEYWORDS + main.SPORTS_TERMINOLOGY_KEYWORDS
+    + main.CODING_TERMINOLOGY_KEYWORDS + main.NATURE_TERMINOLOGY_KEYWORDS + main.ANIMALS_TERMINOLOGY_KEYWORDS
+    + main.SPACE_TERMINOLOGY_KEYWORDS + main.MUSIC_INSTRUMENTS
+))
+
+
+def random_keywords(rng):
+    grade = rng.choice(GRADES)
+    keywords = []
+    for _ in range(rng.randint(1, 8)):
+        topic = rng.choice(VOCABULARY)
+        keywords.append(rng.choice([
+            f"{grade} {topic}", f"{topic} for {grade}", topic, f"{grade} {rng.choice(SUBJECTS)} {topic}",
+            f"{topic} {rng.choice(VOCABULARY)}".title(),
+        ]))
+    return keywords
+
+
+def random_result(rng, index, keywords):
+    def text(low, high):
+        words = [rng.choice(VOCABULARY) for _ in range(rng.randint(low, high))]
+        if keywords and rng.random() < 0.5:
+            words.insert(rng.randint(0, len(words)), rng.choice(keywords))
+        return ' '.join(word.title() if rng.random() < 0.2 else word for word in words)
+
+    result = {'title': text(0, 6), 'url': rng.choice([f'https://example.org/{index}', '', f'https://www.youtube.com/watch?v={index}'])}
+    if rng.random() < 0.8:
+        result['description'] = text(0, 15)
+    if rng.random() < 0.7:
+        result['subject'] = rng.choice(SUBJECTS + ['Art', 'Music', '', 'Educational'])
+    if rng.random() < 0.5:
+        result['type'] = rng.choice(['video', 'worksheet', 'lesson'])
+    return result
+
+
+def corpus(seed, searches=300, results=40):
+    rng = random.Random(seed)
+    for _ in range(searches):
+        keywords = random_keywords(rng)
+        yield keywords, [random_result(rng, index, keywords) for index in range(results)]
+
+
+def ranking(results):
+    return [(result['url'], result['title'], result['relevance_score']) for result in results]
+
+
+def test_top_results_match_baseline():
+    for keywords, results in corpus(seed=11):
+        expected = baseline_filter_results(copy.deepcopy(results), keywords)
+        assert ranking(main.filter_results(copy.deepcopy(results), keywords)) == ranking(expected), keywords
+
+
+def test_every_score_matches_baseline():
+    for keywords, results in corpus(seed=12, searches=100, results=20):
+        profile = main.build_relevance_profile(keywords)
+        for result in results:
+            expected = baseline_filter_results([copy.deepcopy(result)], keywords)
+            candidate = copy.deepcopy(result)
+            if not main.prepare_result(candidate):
+                assert expected == []
+                continue
+            score = main.score_result(candidate, profile)
+            assert (expected[0]['relevance_score'] if expected else 0) == score, (keywords, result)
+
+
+def test_pure_python_matcher_matches_compiled(monkeypatch):
+    """Without pyahocorasick the pure Python automaton is used; it must find the same matches."""
+    if term_matcher.ahocorasick is None:
+        pytest.skip("pyahocorasick is not installed, so the tests above already ran the pure Python automaton")
+
+    texts = [(result['title'] + ' ' + result.get('description', '')).lower()
+             for _, results in corpus(seed=13, searches=50) for result in results]
+    expected = [main.RELEVANCE_MATCHER.find(text) for text in texts]
+
+    monkeypatch.setattr(term_matcher, 'ahocorasick', None)
+    fallback = term_matcher.TermMatcher(main.RELEVANCE_MATCHER.patterns)
+    assert [fallback.find(text) for text in texts] == expected
@@ -0,0 +1,24 @@
+import pytest
+
+from static_extract import decode_html
+
+
+def test_pages_without_a_charset_are_read_as_utf8():
+    body = '<p>Café naïve — fractions</p>'.encode('utf-8')
+    assert decode_html(body, 'text/html') == '<p>Café naïve — fractions</p>'
+
+
+def test_declared_charset_is_used():
+    body = '<p>Café</p>'.encode('cp1252')
+    assert decode_html(body, 'text/html; charset=windows-1252') == '<p>Café</p>'
+
+
+def test_meta_charset_is_used_without_a_header_charset():
+    text = '<html><head><meta charset="windows-1252"></head><body><p>Les élèves à l’école</p></body></html>'
+    assert decode_html(text.encode('cp1252'), 'text/html') == text
+
+
+def test_other_encodings_fall_back_to_detection():
+    pytest.importorskip('requests')
+    text = decode_html('<p>Café naïve</p>'.encode('cp1252'), 'text/html')
+    assert text.startswith('<p>Caf') and text.endswith('</p>') and '\ufffd' not in text
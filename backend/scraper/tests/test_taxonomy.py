@@ -0,0 +1,201 @@
+"""
+The rule-table classifiers in taxonomy.py against frozen copies of the if/elif chains they
+replaced, on a fixture corpus of (url, title) pairs and keywords: classify, labels and
+classify_batch must all give the answers the old chains gave.
+"""
+
+import random
+
+from taxonomy import (Classifier, SUBJECT_RULES, subject_classifier, link_type_classifier, url_type_classifier,
+                      reading_type_classifier, interest_classifier, spider_site_classifier, youtube_query_classifier)
+
+
+def baseline_subject(url, title):
+    url_lower = url.lower()
+    title_lower = title.lower()
+
+    if any(term in url_lower or term in title_lower for term in ['art', 'draw', 'paint', 'craft']):
+        return 'art'
+    elif any(term in url_lower or term in title_lower for term in ['music', 'sing', 'instrument', 'song']):
+        return 'music'
+    elif any(term in url_lower or term in title_lower for term in ['read', 'book', 'literacy', 'phonics']):
+        return 'reading'
+    elif any(term in url_lower or term in title_lower for term in ['writ', 'essay', 'journal', 'grammar']):
+        return 'writing'
+    elif any(term in url_lower or term in title_lower for term in ['math', 'number', 'geometry', 'algebra']):
+        return 'math'
+    elif any(term in url_lower or term in title_lower for term in ['science', 'biology', 'chemistry', 'physics']):
+        return 'science'
+    elif any(term in url_lower or term in title_lower for term in ['history', 'geography', 'civil']):
+        return 'history'
+    elif any(term in url_lower or term in title_lower for term in ['cod', 'program', 'computer']):
+        return 'coding'
+    return None
+
+
+def baseline_link_type(url, title):
+    url_lower = url.lower()
+    title_lower = title.lower()
+
+    if 'video' in url_lower or 'video' in title_lower or 'youtube' in url_lower:
+        return 'video'
+    elif 'worksheet' in url_lower or 'worksheet' in title_lower or 'pdf' in url_lower:
+        return 'worksheet'
+    elif 'lesson' in url_lower or 'lesson' in title_lower or 'tutorial' in title_lower:
+        return 'lesson'
+    elif 'game' in url_lower or 'game' in title_lower or 'interactive' in url_lower:
+        return 'interactive'
+    elif 'activity' in url_lower or 'activity' in title_lower or 'project' in title_lower:
+        return 'activity'
+    return 'resource'
+
+
+def baseline_url_type(url):
+    url_lower = url.lower()
+
+    if 'youtube.com' in url_lower or 'youtu.be' in url_lower or 'vimeo.com' in url_lower:
+        return 'Video'
+    elif '.pdf' in url_lower or 'worksheet' in url_lower or 'printable' in url_lower:
+        return 'Worksheet'
+    elif 'game' in url_lower or 'interactive' in url_lower or 'play' in url_lower:
+        return 'Interactive'
+    elif 'lesson' in url_lower or 'curriculum' in url_lower or 'plan' in url_lower:
+        return 'Lesson Plan'
+    elif 'activity' in url_lower or 'project' in url_lower or 'experiment' in url_lower:
+        return 'Activity'
+    return 'Resource'
+
+
+def baseline_reading_type(url, title):
+    if 'worksheet' in url.lower() or 'worksheet' in title.lower():
+        return 'worksheet'
+    elif 'lesson' in url.lower() or 'lesson' in title.lower():
+        return 'lesson'
+    return None
+
+
+def baseline_interests(keyword):
+    interest_categories = {
+        'art': ['art', 'draw', 'paint', 'craft', 'color', 'design'],
+        'music': ['music', 'song', 'instrument', 'singing', 'notes', 'melody'],
+        'reading': ['read', 'book', 'story', 'literature', 'phonics', 'comprehension'],
+        'writing': ['writ', 'journal', 'essay', 'grammar', 'composition', 'letter'],
+        'math': ['math', 'number', 'geometry', 'algebra', 'count', 'calculation'],
+        'science': ['science', 'biology', 'chemistry', 'physics', 'experiment', 'nature'],
+        'history': ['history', 'past', 'geography', 'civil', 'culture', 'ancient'],
+        'coding': ['cod', 'program', 'computer science', 'algorithm', 'software']
+    }
+    keyword_lower = keyword.lower()
+    return [interest for interest, terms in interest_categories.items() if any(term in keyword_lower for term in terms)]
+
+
+def baseline_spider_sites(keyword):
+    keyword_lower = keyword.lower()
+    sites = []
+    if 'art' in keyword_lower or 'draw' in keyword_lower or 'paint' in keyword_lower or 'craft' in keyword_lower:
+        sites.append('art')
+    if 'music' in keyword_lower or 'sing' in keyword_lower or 'instrument' in keyword_lower:
+        sites.append('music')
+    if 'read' in keyword_lower or 'book' in keyword_lower or 'literacy' in keyword_lower:
+        sites.append('reading')
+    if 'writ' in keyword_lower or 'journal' in keyword_lower or 'essay' in keyword_lower:
+        sites.append('writing')
+    if 'math' in keyword_lower or 'number' in keyword_lower or 'geometry' in keyword_lower or 'algebra' in keyword_lower:
+        sites.append('math')
+    if 'science' in keyword_lower or 'biology' in keyword_lower or 'chemistry' in keyword_lower or 'physics' in keyword_lower:
+        sites.append('science')
+    if 'history' in keyword_lower or 'geography' in keyword_lower or 'civiliz' in keyword_lower:
+        sites.append('history')
+    if 'cod' in keyword_lower or 'program' in keyword_lower or 'computer science' in keyword_lower:
+        sites.append('coding')
+    return sites
+
+
+def baseline_youtube_query(keyword):
+    keyword_lower = keyword.lower()
+    if 'art' in keyword_lower or 'draw' in keyword_lower or 'craft' in keyword_lower:
+        return 'art'
+    elif 'music' in keyword_lower or 'instrument' in keyword_lower:
+        return 'music'
+    elif 'read' in keyword_lower or 'book' in keyword_lower:
+        return 'reading'
+    elif 'write' in keyword_lower or 'journal' in keyword_lower:
+        return 'writing'
+    elif 'math' in keyword_lower or 'number' in keyword_lower:
+        return 'math'
+    elif 'science' in keyword_lower or 'experiment' in keyword_lower:
+        return 'science'
+    elif 'history' in keyword_lower or 'geography' in keyword_lower:
+        return 'history'
+    elif 'cod' in keyword_lower or 'program' in keyword_lower:
+        return 'coding'
+    return None
+
+
+WORDS = [
+    'art', 'Drawing', 'paint', 'crafts', 'music', 'singing', 'instrument', 'songs', 'reading', 'Books', 'literacy',
+    'phonics', 'writing', 'essay', 'journal', 'grammar', 'math', 'numbers', 'geometry', 'algebra', 'science',
+    'biology', 'chemistry', 'physics', 'history', 'geography', 'civilization', 'civil', 'coding', 'programming',
+    'computer', 'computer science', 'color', 'design', 'story', 'literature', 'comprehension', 'composition',
+    'letter', 'count', 'calculation', 'experiment', 'nature', 'past', 'culture', 'ancient', 'algorithm', 'software',
+    'melody', 'notes', 'video', 'worksheet', 'pdf', 'lesson', 'tutorial', 'game', 'interactive', 'activity',
+    'project', 'printable', 'play', 'plan', 'curriculum', 'start', 'party', 'code', 'write', 'kids', 'grade',
+    'fun', 'the', 'for', 'and', 'İstanbul', 'SPORTS', 'planet', 'animals'
+]
+URL_PARTS = [
+    'https://www.youtube.com/watch?v=abc', 'https://youtu.be/abc', 'https://vimeo.com/123',
+    'https://www.education.com/worksheet/', 'https://example.org/files/sheet.pdf', 'https://pbskids.org/games/',
+    'https://www.khanacademy.org/math/', 'https://example.org/lesson-plans/', 'https://example.org/',
+    'https://www.readworks.org/article/', 'https://code.org/', 'https://example.org/interactive/'
+]
+
+
+def corpus(seed=13, size=5000):
+    rng = random.Random(seed)
+    for _ in range(size):
+        url = rng.choice(URL_PARTS) + '-'.join(rng.choice(WORDS).lower() for _ in range(rng.randint(0, 3)))
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 6)))
+        yield url, title
+
+
+def keywords(seed=14, size=3000):
+    rng = random.Random(seed)
+    for _ in range(size):
+        yield ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def test_pair_classifiers_match_baseline():
+    pairs = list(corpus())
+    for classifier, baseline in [(subject_classifier, baseline_subject), (link_type_classifier, baseline_link_type),
+                                 (reading_type_classifier, baseline_reading_type)]:
+        expected = [baseline(url, title) for url, title in pairs]
+        assert [classifier.classify(url, title) for url, title in pairs] == expected
+        assert classifier.classify_batch(pairs) == expected
+
+
+def test_url_classifier_matches_baseline():
+    urls = [url for url, _ in corpus()]
+    expected = [baseline_url_type(url) for url in urls]
+    assert [url_type_classifier.classify(url) for url in urls] == expected
+    assert url_type_classifier.classify_batch([(url,) for url in urls]) == expected
+
+
+def test_keyword_classifiers_match_baseline():
+    for keyword in keywords():
+        assert interest_classifier.labels(keyword) == baseline_interests(keyword), keyword
+        assert spider_site_classifier.labels(keyword) == baseline_spider_sites(keyword), keyword
+        assert youtube_query_classifier.classify(keyword) == baseline_youtube_query(keyword), keyword
+
+
+def test_subject_from_keyword_and_title_matches_baseline():
+    rng = random.Random(15)
+    rows = [(keyword, title) for keyword, (_, title) in zip(keywords(), corpus()) if rng.random() < 0.5]
+    expected = [baseline_subject(keyword, title) for keyword, title in rows]
+    assert subject_classifier.classify_batch(rows) == expected
+
+
+def test_classify_batch_handles_empty_rows_and_texts():
+    classifier = Classifier(('url', 'title'), SUBJECT_RULES, default='educational')
+    assert classifier.classify_batch([]) == []
+    assert classifier.classify_batch([('', ''), (None, 'Art'), ('https://x.org/math', None)]) == \
+        ['educational', 'art', 'math']
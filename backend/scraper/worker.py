@@ -0,0 +1,102 @@
+"""
+HomeScraperEdu Scraper Worker
+-----------------------------
+Long-lived worker mode for main.py. Instead of starting a new Python process (and a new
+Twisted reactor and browser) for every search, one worker process accepts search jobs over
+a local socket and runs several of them at once on a shared event loop.
+
+Protocol: the client sends one JSON line describing the job, the worker answers with JSON
+lines. The last line always has an "event" of either "done" or "error". Jobs with "stream"
+set get the search's progress events as they happen, before the last line.
+"""
+
+import os
+import json
+import socket
+import asyncio
+
+DEFAULT_HOST = os.environ.get('SCRAPER_WORKER_HOST', '127.0.0.1')
+DEFAULT_PORT = int(os.environ.get('SCRAPER_WORKER_PORT', '8765'))
+DEFAULT_MAX_JOBS = int(os.environ.get('SCRAPER_WORKER_MAX_JOBS', '4'))
+
+
+async def serve(run_job, host=DEFAULT_HOST, port=DEFAULT_PORT, max_jobs=DEFAULT_MAX_JOBS):
+    """
+    Accept search jobs until the process is stopped, running at most max_jobs at once.
+    run_job(job, send_event) runs one job; send_event(event) sends an event to its client.
+    """
+    job_slots = asyncio.Semaphore(max_jobs)
+
+    async def send_event(writer, event):
+        writer.write((json.dumps(event) + '\n').encode('utf-8'))
+        await writer.drain()
+
+    def event_sender(writer):
+        # Events are sent from inside the search, which can't wait for the client to drain
+        def send(event):
+            if not writer.is_closing():
+                writer.write((json.dumps(event) + '\n').encode('utf-8'))
+        return send
+
+    async def handle_connection(reader, writer):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+
+            try:
+                job = json.loads(line)
+            except ValueError:
+                await send_event(writer, {'event': 'error', 'message': 'Invalid job payload'})
+                return
+
+            if not job.get('search_id'):
+                await send_event(writer, {'event': 'error', 'message': 'Search ID is required'})
+                return
+
+            async with job_slots:
+                print(f"Worker starting search {job['search_id']}")
+                try:
+                    summary = await run_job(job, event_sender(writer))
+                    await send_event(writer, dict(summary or {}, event='done'))
+                except Exception as e:
+                    print(f"Worker search {job['search_id']} failed: {e}")
+                    await send_event(writer, {'event': 'error', 'message': str(e)[:200]})
+        except ConnectionError:
+            # Client went away; the search itself has already been recorded in its status file
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle_connection, host, port)
+    print(f"Scraper worker listening on {host}:{port} (max {max_jobs} concurrent searches)")
+
+    async with server:
+        await server.serve_forever()
+
+
+def submit_job(job, host=DEFAULT_HOST, port=DEFAULT_PORT, on_event=None):
+    """
+    Send a job to a running worker and wait for it to finish.
+    Returns the final event, or None if no worker is listening.
+    """
+    try:
+        sock = socket.create_connection((host, port), timeout=1)
+    except OSError:
+        return None
+
+    # The search itself can take a while, so only the connect is bounded
+    sock.settimeout(None)
+
+    with sock, sock.makefile('rwb') as stream:
+        stream.write((json.dumps(job) + '\n').encode('utf-8'))
+        stream.flush()
+
+        for line in stream:
+            event = json.loads(line)
+            if event.get('event') in ('done', 'error'):
+                return event
+            if on_event:
+                on_event(event)
+
+    return {'event': 'error', 'message': 'Worker closed the connection before the search finished'}
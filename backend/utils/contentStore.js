@@ -0,0 +1,34 @@
+import fs from "fs";
+import path from "path";
+import zlib from "zlib";
+import { promisify } from "util";
+
+const gunzip = promisify(zlib.gunzip);
+
+// Extracted resource content, stored by the scraper as gzip blobs keyed by a SHA-1 of the URL
+const CONTENT_DIR = path.join(process.cwd(), "data/content");
+
+const CONTENT_ID_PATTERN = /^[0-9a-f]{40}$/;
+
+export const isContentId = (contentId) => typeof contentId === "string" && CONTENT_ID_PATTERN.test(contentId);
+
+/**
+ * Load the content text stored for a resource
+ * @param {string} contentId - The resource's contentId from the search results
+ * @returns {Promise<string|null>} - The content text, or null if there is none
+ */
+export const loadContent = async (contentId) => {
+  if (!isContentId(contentId)) {
+    return null;
+  }
+  
+  try {
+    const blob = await fs.promises.readFile(path.join(CONTENT_DIR, `${contentId}.txt.gz`));
+    return (await gunzip(blob)).toString("utf8");
+  } catch (error) {
+    if (error.code !== "ENOENT") {
+      console.error(`Error loading content ${contentId}:`, error);
+    }
+    return null;
+  }
+};
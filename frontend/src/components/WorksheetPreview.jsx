@@ -56,6 +56,19 @@ const WorksheetPreview = ({
     
     try {
       setIsFetchingContent(true);
+      
+      // Search results reference content the search already extracted; load that first
+      if (resource.contentId) {
+        const contentText = await worksheetService.fetchStoredContent(resource.contentId).catch(() => null);
+        if (contentText) {
+          setSelectedResource(prevResource => (
+            prevResource && prevResource.url === resource.url ? { ...prevResource, contentText } : prevResource
+          ));
+          return;
+        }
+      }
+      
+      // Not stored (or not a search result): extract it from the page
       const response = await worksheetService.fetchResourceContent(resource.url);
       
       if (response.success) {
@@ -139,14 +152,19 @@ const WorksheetPreview = ({
     setIsGenerating(true);
     
     try {
-      // Ensure contentText is available (or default to description)
+      // A resource with a contentId is sent as is; the server loads its stored content
+      const resourceForServer = selectedResource.contentText || selectedResource.contentId
+        ? selectedResource
+        : { ...selectedResource, contentText: selectedResource.description };
+      
+      // Client-side generation needs the text itself (or defaults to the description)
       const resourceWithContent = {
         ...selectedResource,
         contentText: selectedResource.contentText || selectedResource.description
       };
       
       // Use the worksheet service instead of direct fetch
-      worksheetService.generateWorksheet(resourceWithContent, childName, grade, worksheetType)
+      worksheetService.generateWorksheet(resourceForServer, childName, grade, worksheetType)
         .then(data => {
           if (data.success) {
             // Generate PDF from the returned worksheet data
@@ -6,7 +6,7 @@
 
 /**
  * Generate a worksheet via the API
- * @param {Object} resource - The resource object including contentText
+ * @param {Object} resource - The resource object including contentText or the contentId of its stored content
  * @param {string} childName - Child's name
  * @param {string} grade - Grade level
  * @param {string} worksheetType - Type of worksheet
@@ -64,6 +64,36 @@ export const fetchResourceContent = async (url) => {
   }
 };
 
+/**
+ * Load the stored content of a search result
+ * @param {string} contentId - The contentId of the search result
+ * @returns {Promise} - Promise resolving to the content text, or null if it is not stored
+ */
+export const fetchStoredContent = async (contentId) => {
+  try {
+    const response = await fetch(`/api/curriculum-search/content/${encodeURIComponent(contentId)}`, {
+      method: 'GET',
+      headers: {
+        'Content-Type': 'application/json',
+      }
+    });
+    
+    if (response.status === 404) {
+      return null;
+    }
+    
+    if (!response.ok) {
+      throw new Error(`API error: ${response.status}`);
+    }
+    
+    const data = await response.json();
+    return data.contentText;
+  } catch (error) {
+    console.error('Error loading stored content:', error);
+    throw error;
+  }
+};
+
 /**
  * Get available worksheet types for a subject and grade
  * @param {string} subject - The subject
@@ -123,6 +153,7 @@ export const generateAnswerKey = async (resource, worksheetType) => {
 export default {
   generateWorksheet,
   fetchResourceContent,
+  fetchStoredContent,
   getWorksheetTypes,
   generateAnswerKey
 }; 
\ No newline at end of file